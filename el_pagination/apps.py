@@ -0,0 +1,17 @@
+"""Django EL Pagination application configuration."""
+
+from django.apps import AppConfig
+from django.core import checks
+
+from el_pagination import paginators, settings
+from el_pagination.checks import check_page_templates
+
+
+class ElPaginationConfig(AppConfig):
+    name = 'el_pagination'
+    verbose_name = 'EL Pagination'
+
+    def ready(self):
+        checks.register(check_page_templates, checks.Tags.templates)
+        if settings.SEEK_MAP:
+            paginators.track_changes()
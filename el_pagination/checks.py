@@ -0,0 +1,33 @@
+"""System checks of the Django EL Pagination application."""
+
+from django.core import checks
+from django.template import TemplateDoesNotExist, loader
+from django.urls import get_resolver
+
+from el_pagination import decorators
+
+
+def check_page_templates(app_configs=None, **kwargs):
+    """Check that the page templates of the decorated views exist."""
+    # Import the views, so that their decorators register the templates.
+    try:
+        # pylint: disable-next=pointless-statement
+        get_resolver().url_patterns
+    except Exception:  # pylint: disable=broad-except
+        # Invalid URL configurations are reported by the checks of Django.
+        pass
+    errors = []
+    for template in sorted(decorators.registered_templates):
+        try:
+            loader.get_template(template)
+        except TemplateDoesNotExist:
+            errors.append(
+                checks.Error(
+                    f'The page template {template!r} does not exist.',
+                    hint='Check the templates passed to page_template or '
+                    'page_templates.',
+                    obj=template,
+                    id='el_pagination.E001',
+                )
+            )
+    return errors
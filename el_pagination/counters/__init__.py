@@ -0,0 +1,5 @@
+"""Numbers of objects of listings, maintained in a table.
+
+Add ``'el_pagination.counters'`` to ``INSTALLED_APPS`` to use them, and
+register the listings using *el_pagination.counters.listings.register*.
+"""
@@ -0,0 +1,9 @@
+"""Django EL Pagination counters application."""
+
+from django.apps import AppConfig
+
+
+class CountersConfig(AppConfig):
+    name = 'el_pagination.counters'
+    label = 'el_pagination_counters'
+    verbose_name = 'EL Pagination counters'
@@ -0,0 +1,264 @@
+"""Registration of the listings counted, and signal handlers counting them.
+
+A listing is made of the objects of a model matching some field values,
+possibly grouped by a field, e.g. the published entries of each category::
+
+    from el_pagination.counters import listings
+
+    listings.register(
+        'entries', Entry, field='category', filters={'published': True}
+    )
+
+The number of objects of a group can then be retrieved without counting
+them, and passed to the *paginate* tag as the count source, e.g.::
+
+    entries_count = functools.partial(
+        listings.get_count, 'entries', category.pk
+    )
+
+Counts are updated when objects are saved or deleted, and when the related
+objects of a many-to-many *field* change. Changes not sending signals, such
+as *QuerySet.update* or *bulk_create*, are not counted: in this case use
+*rebuild_counts*.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Func, Q, Subquery
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from el_pagination.counters.models import ListingCount
+
+# The name of the instance attribute holding the state of its listings.
+STATE_ATTRIBUTE = '_el_pagination_counters'
+
+# Registered listings, by name.
+_listings = {}
+
+
+class Listing:
+    """The objects of *model* matching *filters*, grouped by *field*.
+
+    The *filters* map field names to the values the objects must have,
+    and are compared to the attributes of the saved instances.
+    """
+
+    def __init__(self, name, model, field=None, filters=None):
+        self.name = name
+        self.model = model
+        self.field = None if field is None else model._meta.get_field(field)
+        self.filters = filters or {}
+
+    @property
+    def many_to_many(self):
+        return self.field is not None and self.field.many_to_many
+
+    def get_field_names(self):
+        """Return the names of the fields needed to check an instance."""
+        names = list(self.filters)
+        if self.field is not None and not self.many_to_many:
+            names.append(self.field.attname)
+        return names
+
+    def get_key(self, value=None):
+        """Return the key of the count of the group *value*."""
+        return self.name if self.field is None else f'{self.name}:{value}'
+
+    def matches(self, instance):
+        """Return True if *instance* is part of the listing."""
+        return all(
+            getattr(instance, name) == value for name, value in self.filters.items()
+        )
+
+    def get_values(self, instance):
+        """Return the groups *instance* is part of."""
+        if self.field is None:
+            return [None]
+        if self.many_to_many:
+            if instance.pk is None:
+                return []
+            related = getattr(instance, self.field.name)
+            return list(related.values_list('pk', flat=True))
+        value = getattr(instance, self.field.attname)
+        return [] if value is None else [value]
+
+    def get_queryset(self):
+        """Return the objects of the listing."""
+        return self.model._default_manager.filter(**self.filters)
+
+
+def register(name, model, field=None, filters=None):
+    """Count the objects of *model* as the listing *name*.
+
+    If *field* is given, the objects are counted for each value of the
+    field (or related object, for many-to-many fields).
+    """
+    _listings[name] = listing = Listing(name, model, field=field, filters=filters)
+    uid = f'el_pagination_counters:{model._meta.label}'
+    pre_save.connect(_saving, sender=model, dispatch_uid=uid)
+    post_save.connect(_saved, sender=model, dispatch_uid=uid)
+    pre_delete.connect(_deleting, sender=model, dispatch_uid=uid)
+    post_delete.connect(_deleted, sender=model, dispatch_uid=uid)
+    if listing.many_to_many:
+        through = listing.field.remote_field.through
+        m2m_changed.connect(_related_changed, sender=through, dispatch_uid=uid)
+
+
+def unregister(name):
+    """Stop counting the objects of the listing *name*."""
+    _listings.pop(name, None)
+
+
+def get_count(name, value=None):
+    """Return the number of objects of the listing *name*, or of its group
+    *value*.
+
+    The objects are counted, and the count is stored, the first time.
+    """
+    listing = _listings[name]
+    key = listing.get_key(value)
+    counts = ListingCount.objects.filter(key=key)
+    count = counts.values_list('count', flat=True).first()
+    if count is None:
+        # The row is stored before counting, so that objects saved in the
+        # meantime update it, and is then set from the count in a single
+        # query, overwriting these updates.
+        _, created = ListingCount.objects.get_or_create(key=key)
+        if created:
+            queryset = listing.get_queryset()
+            if listing.field is not None:
+                queryset = queryset.filter(**{listing.field.name: value})
+            queryset = queryset.order_by().annotate(
+                el_pagination_count=Func('pk', function='COUNT')
+            )
+            counts.update(count=Subquery(queryset.values('el_pagination_count')))
+        count = counts.values_list('count', flat=True).first()
+    return count
+
+
+def rebuild_counts(name):
+    """Count again the objects of the listing *name*, in all groups."""
+    listing = _listings[name]
+    queryset = listing.get_queryset()
+    if listing.field is None:
+        counts = {listing.get_key(): queryset.count()}
+    else:
+        groups = (
+            queryset.filter(**{f'{listing.field.name}__isnull': False})
+            .values_list(listing.field.name)
+            .annotate(count=Count('pk'))
+            .order_by()
+        )
+        counts = {listing.get_key(value): count for value, count in groups}
+    with transaction.atomic():
+        ListingCount.objects.filter(
+            Q(key=name) | Q(key__startswith=f'{name}:')
+        ).delete()
+        ListingCount.objects.bulk_create(
+            ListingCount(key=key, count=count) for key, count in counts.items()
+        )
+
+
+def _get_listings(model):
+    return [listing for listing in _listings.values() if listing.model is model]
+
+
+def _update(listing, values, delta):
+    """Add *delta* to the counts of the groups *values* of *listing*.
+
+    Counts not stored yet are left alone: they are computed when needed.
+    """
+    for value in values:
+        ListingCount.objects.filter(key=listing.get_key(value)).update(
+            count=F('count') + delta
+        )
+
+
+def _load_state(sender, instance, related=False):
+    """Store the listings *instance* is part of, as currently saved.
+
+    The values of the many-to-many fields are only retrieved if *related*.
+    """
+    listings = _get_listings(sender)
+    names = {name for listing in listings for name in listing.get_field_names()}
+    queryset = sender._base_manager.filter(pk=instance.pk)
+    saved = (queryset.only(*names) if names else queryset.only('pk')).first()
+    state = {}
+    if saved is not None:
+        for listing in listings:
+            if listing.many_to_many:
+                values = listing.get_values(instance) if related else None
+            else:
+                values = listing.get_values(saved)
+            state[listing.name] = (listing.matches(saved), values)
+    instance.__dict__[STATE_ATTRIBUTE] = state
+
+
+def _saving(sender, instance, raw=False, **kwargs):
+    # Only the objects already saved are part of some listings.
+    if not raw and not instance._state.adding and instance.pk is not None:
+        _load_state(sender, instance)
+
+
+def _saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    state = instance.__dict__.pop(STATE_ATTRIBUTE, {})
+    for listing in _get_listings(sender):
+        was_matching, old_values = state.get(listing.name, (False, []))
+        matches = listing.matches(instance)
+        if listing.many_to_many:
+            # Related objects are counted when added, see *_related_changed*.
+            if not created and matches != was_matching:
+                _update(listing, listing.get_values(instance), 1 if matches else -1)
+            continue
+        old_values = old_values if was_matching else []
+        values = listing.get_values(instance) if matches else []
+        _update(listing, [value for value in old_values if value not in values], -1)
+        _update(listing, [value for value in values if value not in old_values], 1)
+
+
+def _deleting(sender, instance, **kwargs):
+    # Related objects must be retrieved before they are unlinked.
+    _load_state(sender, instance, related=True)
+
+
+def _deleted(sender, instance, **kwargs):
+    state = instance.__dict__.pop(STATE_ATTRIBUTE, {})
+    for listing in _get_listings(sender):
+        was_matching, values = state.get(listing.name, (False, []))
+        if was_matching:
+            _update(listing, values or [], -1)
+
+
+def _related_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    for listing in _listings.values():
+        if not listing.many_to_many or listing.field.remote_field.through is not sender:
+            continue
+        key = f'{STATE_ATTRIBUTE}:{listing.name}'
+        if not reverse:
+            # The related objects of a counted object changed.
+            if not listing.matches(instance):
+                continue
+            if action == 'pre_clear':
+                instance.__dict__[key] = listing.get_values(instance)
+            elif action == 'post_clear':
+                _update(listing, instance.__dict__.pop(key, []), -1)
+            elif action in ('post_add', 'post_remove'):
+                _update(listing, pk_set, 1 if action == 'post_add' else -1)
+            continue
+        # The counted objects related to an object changed.
+        queryset = listing.get_queryset()
+        if action == 'pre_clear':
+            lookup = {listing.field.name: instance.pk}
+            instance.__dict__[key] = queryset.filter(**lookup).count()
+        elif action == 'post_clear':
+            _update(listing, [instance.pk], -instance.__dict__.pop(key, 0))
+        elif action in ('post_add', 'post_remove'):
+            count = queryset.filter(pk__in=pk_set).count()
+            _update(listing, [instance.pk], count if action == 'post_add' else -count)
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-19 19:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingCount',
+            fields=[
+                (
+                    'key',
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ('count', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,13 @@
+"""Models storing the number of objects of listings."""
+
+from django.db import models
+
+
+class ListingCount(models.Model):
+    """The number of objects of a listing, or of one of its groups."""
+
+    key = models.CharField(max_length=255, primary_key=True)
+    count = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.key}: {self.count}'
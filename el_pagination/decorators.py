@@ -1,11 +1,20 @@
 """View decorators for Ajax powered pagination."""
 
 from functools import wraps
+from types import MappingProxyType
 
+from django.http import JsonResponse
+from django.template import loader
+
+from el_pagination import utils
 from el_pagination.settings import PAGE_LABEL, TEMPLATE_VARNAME
 
 QS_KEY = "querystring_key"
 
+# The names of the page templates of the decorated views, checked by
+# *el_pagination.checks.check_page_templates*.
+registered_templates = set()
+
 
 def page_template(template, key=PAGE_LABEL):
     """Return a view dynamically switching template if the request is Ajax.
@@ -18,6 +27,7 @@ def page_template(template, key=PAGE_LABEL):
     The name of the page template is given as *page_template* in the
     extra context.
     """
+    registered_templates.add(template)
 
     def decorator(view):
         @wraps(view)
@@ -27,24 +37,27 @@ def page_template(template, key=PAGE_LABEL):
             extra_context = kwargs.setdefault("extra_context", {})
             extra_context["page_template"] = template
             # Switch the template when the request is Ajax.
-            querystring_key = request.GET.get(
-                QS_KEY, request.POST.get(QS_KEY, PAGE_LABEL)
-            )
-            if (
-                request.headers.get("x-requested-with") == "XMLHttpRequest"
-                and querystring_key == key
-            ):
+            state = utils.get_pagination_state(request)
+            querystring_key = state.get(QS_KEY, PAGE_LABEL)
+            if utils.is_fragment_request(request) and querystring_key == key:
                 kwargs[TEMPLATE_VARNAME] = template
-            return view(request, *args, **kwargs)
+            return utils.patch_fragment_vary_headers(view(request, *args, **kwargs))
 
         return decorated
 
     return decorator
 
 
-def _get_template(querystring_key, mapping):
-    """Return the template corresponding to the given ``querystring_key``."""
+def _get_template_index(mapping):
+    """Return a ``(index, default)`` pair for the given template *mapping*.
+
+    The *index* is a read-only dict mapping each *querystring_key* to its
+    template, while *default* is the template registered with a None key
+    (if any). When the same key is given more than once, the first template
+    wins.
+    """
     default = None
+    index = {}
     try:
         template_and_keys = mapping.items()
     except AttributeError:
@@ -53,9 +66,37 @@ def _get_template(querystring_key, mapping):
         if key is None:
             key = PAGE_LABEL
             default = template
-        if key == querystring_key:
-            return template
-    return default
+        index.setdefault(key, template)
+    return MappingProxyType(index), default
+
+
+def _render_fragments(view, request, args, kwargs, templates):
+    """Render the page templates of several paginations in one response.
+
+    *templates* is a sequence of ``(querystring_key, template)`` pairs.
+    Return a JSON response mapping each querystring key to its rendered
+    fragment.
+
+    If the view returns a *TemplateResponse*, the view is called only once
+    and its context is used to render all the fragments. Otherwise the view
+    is called once per fragment. In both cases querysets are lazy, so each
+    fragment only evaluates the queryset it paginates.
+    """
+    extra_context = kwargs["extra_context"]
+    fragments = {}
+    context = None
+    for querystring_key, template in templates:
+        extra_context["page_template"] = template
+        if context is None:
+            kwargs[TEMPLATE_VARNAME] = template
+            response = view(request, *args, **kwargs)
+            if getattr(response, "context_data", None) is None:
+                fragments[querystring_key] = response.content.decode(response.charset)
+                continue
+            context = dict(response.context_data)
+        context["page_template"] = template
+        fragments[querystring_key] = loader.render_to_string(template, context, request)
+    return JsonResponse(fragments)
 
 
 def page_templates(mapping):
@@ -74,7 +115,19 @@ def page_templates(mapping):
     When the value of the dict is None then the default *querystring_key*
     (defined in settings) is used. You can use this decorator instead of
     chaining multiple *page_template* calls.
+
+    The mapping is indexed once, when the view is decorated.
+
+    Several paginations can be fetched with a single Ajax request by passing
+    the *querystring_key* parameter multiple times, e.g.::
+
+        /?querystring_key=entries-page&entries-page=3&querystring_key=items-page
+
+    In this case the view returns a JSON object mapping each requested
+    *querystring_key* to its rendered page template. Unknown keys are ignored.
     """
+    index, default = _get_template_index(mapping)
+    registered_templates.update(index.values())
 
     def decorator(view):
         @wraps(view)
@@ -82,16 +135,60 @@ def page_templates(mapping):
             # Trust the developer: he wrote ``context.update(extra_context)``
             # in his view.
             extra_context = kwargs.setdefault("extra_context", {})
-            querystring_key = request.GET.get(
-                QS_KEY, request.POST.get(QS_KEY, PAGE_LABEL)
-            )
-            template = _get_template(querystring_key, mapping)
+            querystring_keys = utils.get_pagination_state(request).getlist(QS_KEY)
+            is_fragment = utils.is_fragment_request(request)
+            if is_fragment and len(querystring_keys) > 1:
+                templates = {
+                    key: index[key] for key in querystring_keys if key in index
+                }
+                response = _render_fragments(
+                    view, request, args, kwargs, templates.items()
+                )
+                return utils.patch_fragment_vary_headers(response)
+            querystring_key = querystring_keys[-1] if querystring_keys else PAGE_LABEL
+            template = index.get(querystring_key, default)
             extra_context["page_template"] = template
             # Switch the template when the request is Ajax.
-            if request.headers.get("x-requested-with") == "XMLHttpRequest" and template:
+            if is_fragment and template:
                 kwargs[TEMPLATE_VARNAME] = template
-            return view(request, *args, **kwargs)
+            return utils.patch_fragment_vary_headers(view(request, *args, **kwargs))
 
         return decorated
 
     return decorator
+
+
+def page_link_header(view):
+    """Add a ``Link`` header pointing to the next pages to the view responses.
+
+    Decorate a view rendering one or more paginations, e.g.::
+
+        @page_link_header
+        def myview(request):
+            ...
+
+    Each pagination having a next page adds a ``<url>; rel="next"`` link to
+    the header, so that clients and proxies can discover the next page
+    without parsing the response body. If the view returns a
+    *TemplateResponse*, the header is added once the response is rendered.
+    """
+
+    def add_header(response, request):
+        links = [f'<{path}>; rel="next"' for path in utils.get_next_page_paths(request)]
+        if links:
+            if response.has_header("Link"):
+                links.insert(0, response["Link"])
+            response["Link"] = ", ".join(links)
+
+    @wraps(view)
+    def decorated(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if getattr(response, "is_rendered", True):
+            add_header(response, request)
+        else:
+            response.add_post_render_callback(
+                lambda response: add_header(response, request)
+            )
+        return response
+
+    return decorated
@@ -0,0 +1,5 @@
+"""Sort keys of the first object of each page of listings, stored in a table.
+
+Add ``'el_pagination.indexes'`` to ``INSTALLED_APPS`` to use them, and
+store the keys using the ``el_pagination_index`` management command.
+"""
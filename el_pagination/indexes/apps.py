@@ -0,0 +1,16 @@
+"""Django EL Pagination indexes application."""
+
+from django.apps import AppConfig
+
+
+class IndexesConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'el_pagination.indexes'
+    label = 'el_pagination_indexes'
+    verbose_name = 'EL Pagination indexes'
+
+    def ready(self):
+        # pylint: disable-next=import-outside-toplevel
+        from el_pagination.indexes.boundaries import track_changes
+
+        track_changes()
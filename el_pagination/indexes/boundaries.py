@@ -0,0 +1,161 @@
+"""Storage of the page boundaries of listings.
+
+The sort key of every *step*-th object of a queryset is stored by
+*index_seek_map*, usually via the ``el_pagination_index`` management
+command. The default paginator then retrieves the nearest boundary before a
+page using *get_boundary*, and filters the objects by sort key instead of
+using a large ``OFFSET``.
+
+Boundaries are stored by rank, i.e. by the number of objects having a lower
+sort key, so that objects added with a higher sort key than the indexed ones
+(e.g. new rows of an ``order_by('-pk')`` listing, shown first) do not move
+them. Before a boundary is used, the index is checked against the current
+number of objects; other changes of the indexed models mark the index as
+stale (see *track_changes*).
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from el_pagination import loaders, settings
+from el_pagination.indexes.models import SeekBoundary, SeekIndex
+from el_pagination.paginators import get_fingerprint, get_seek_field
+
+# How many boundaries are inserted with a single query.
+BATCH_SIZE = 1000
+
+
+def _get_high(index, field):
+    """Return the highest sort key of *index*, converted by *field*."""
+    return None if index.high is None else field.to_python(index.high)
+
+
+def is_valid(index, queryset, count):
+    """Return True if the boundaries of *index* hold for *queryset*, which
+    returns *count* objects.
+
+    This is the case if the index is not stale, and all the objects added
+    since it was built have a higher sort key than the indexed ones.
+    """
+    if index.stale:
+        return False
+    field = queryset.model._meta.get_field(index.field)
+    high = _get_high(index, field)
+    if high is None:
+        return index.count == count
+    added = queryset.filter(**{f'{field.attname}__gt': high}).count()
+    return index.count + added == count
+
+
+def get_boundary(queryset, fingerprint, count, position):
+    """Return the *(position, value)* pair of the nearest boundary stored at
+    or before the 0-based *position*, for *queryset* returning *count*
+    objects, or None.
+
+    The *fingerprint* of *queryset* is passed by the caller.
+    """
+    field, descending = get_seek_field(queryset)
+    index = SeekIndex.objects.filter(pk=fingerprint).first()
+    if index is None or not is_valid(index, queryset, count):
+        return None
+    if descending:
+        # Ranks are counted from the end of descending queries.
+        boundaries = index.boundaries.filter(rank__gte=count - 1 - position)
+        boundary = boundaries.order_by('rank').values_list('rank', 'value').first()
+    else:
+        boundaries = index.boundaries.filter(rank__lte=position)
+        boundary = boundaries.order_by('-rank').values_list('rank', 'value').first()
+    if boundary is None:
+        return None
+    rank, value = boundary
+    return count - 1 - rank if descending else rank, field.to_python(value)
+
+
+def index_seek_map(queryset, step, incremental=False):
+    """Store the sort key of every *step*-th object of *queryset*, so that
+    the default paginator can jump to any page.
+
+    If *incremental* is True, and the stored index is still valid, only the
+    objects added with a higher sort key than the indexed ones are scanned.
+    Return the number of boundaries stored.
+    """
+    seek_field = get_seek_field(queryset)
+    fingerprint = get_fingerprint(queryset)
+    if seek_field is None or fingerprint is None:
+        raise ValueError(
+            'Only querysets ordered by a single unique field can be indexed.'
+        )
+    field = seek_field[0]
+    objects = queryset.order_by(field.attname)
+    start, high = 0, None
+    index = SeekIndex.objects.filter(pk=fingerprint).first()
+    if (
+        incremental
+        and index is not None
+        and index.step == step
+        and is_valid(index, queryset, queryset.count())
+    ):
+        start, high = index.count, _get_high(index, field)
+        if high is not None:
+            objects = objects.filter(**{f'{field.attname}__gt': high})
+    boundaries = []
+    count = start
+    keys = objects.values_list(field.attname, flat=True).iterator()
+    for rank, key in enumerate(keys, start):
+        if rank and not rank % step:
+            boundaries.append(SeekBoundary(rank=rank, value=key))
+        count, high = rank + 1, key
+    with transaction.atomic():
+        index, _ = SeekIndex.objects.update_or_create(
+            pk=fingerprint,
+            defaults={
+                'model': queryset.model._meta.label,
+                'field': field.attname,
+                'count': count,
+                'step': step,
+                'high': high,
+                'stale': False,
+            },
+        )
+        if not start:
+            index.boundaries.all().delete()
+        for boundary in boundaries:
+            boundary.index = index
+        SeekBoundary.objects.bulk_create(boundaries, batch_size=BATCH_SIZE)
+    return index.boundaries.count()
+
+
+def _changed(sender, instance, signal, created=False, update_fields=None, **kwargs):
+    """Mark as stale the indexes of *sender* whose boundaries may have moved.
+
+    Objects created or deleted with a higher sort key than the indexed ones
+    are accounted for by *is_valid*, as are updates not changing the sort
+    key (e.g. the primary key).
+    """
+    stale = []
+    indexes = SeekIndex.objects.filter(model=sender._meta.label, stale=False)
+    for index in indexes:
+        field = sender._meta.get_field(index.field)
+        if signal is post_save and not created:
+            if field.primary_key or (
+                update_fields is not None and field.name not in update_fields
+            ):
+                continue
+        else:
+            value, high = getattr(instance, field.attname), _get_high(index, field)
+            if value is not None and high is not None and value > high:
+                continue
+        stale.append(index.pk)
+    if stale:
+        SeekIndex.objects.filter(pk__in=stale).update(stale=True)
+
+
+def track_changes():
+    """Mark the indexes as stale when the objects of the models of
+    ``settings.SEEK_INDEXES`` change.
+    """
+    for path in settings.SEEK_INDEXES.values():
+        model = loaders.load_object(path)().model
+        uid = f'el_pagination_indexes:{model._meta.label}'
+        post_save.connect(_changed, sender=model, dispatch_uid=uid)
+        post_delete.connect(_changed, sender=model, dispatch_uid=uid)
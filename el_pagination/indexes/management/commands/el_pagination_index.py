@@ -0,0 +1,49 @@
+"""Store the page boundaries of the configured listings."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from el_pagination import loaders, settings
+from el_pagination.indexes.boundaries import index_seek_map
+
+
+class Command(BaseCommand):
+    help = (
+        'Store the sort key of the first object of every page of the '
+        'listings defined in EL_PAGINATION_SEEK_INDEXES.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help='The listings to index (by default all of them).',
+        )
+        parser.add_argument(
+            '--step',
+            type=int,
+            default=settings.PER_PAGE,
+            help='The number of objects between two boundaries.',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only scan the objects added after the last indexed one.',
+        )
+
+    def handle(self, *args, **options):
+        names = options['names'] or sorted(settings.SEEK_INDEXES)
+        if options['step'] < 1:
+            raise CommandError('The step must be a positive number.')
+        for name in names:
+            try:
+                path = settings.SEEK_INDEXES[name]
+            except KeyError as exc:
+                raise CommandError(f'Unknown listing {name!r}.') from exc
+            queryset = loaders.load_object(path)()
+            try:
+                number = index_seek_map(
+                    queryset, options['step'], incremental=options['incremental']
+                )
+            except ValueError as exc:
+                raise CommandError(f'{name}: {exc}') from exc
+            self.stdout.write(f'{name}: {number} boundaries stored.')
@@ -0,0 +1,77 @@
+# Generated by Django 5.1.15 on 2026-10-19 19:25
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='SeekIndex',
+            fields=[
+                (
+                    'fingerprint',
+                    models.CharField(max_length=32, primary_key=True, serialize=False),
+                ),
+                ('model', models.CharField(max_length=255)),
+                ('field', models.CharField(max_length=255)),
+                ('count', models.BigIntegerField()),
+                ('step', models.PositiveIntegerField()),
+                (
+                    'high',
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                    ),
+                ),
+                ('stale', models.BooleanField(default=False)),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['model'], name='el_pagination_index_model')
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='SeekBoundary',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                ('rank', models.BigIntegerField()),
+                (
+                    'value',
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                (
+                    'index',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='boundaries',
+                        to='el_pagination_indexes.seekindex',
+                    ),
+                ),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(
+                        fields=('index', 'rank'), name='el_pagination_boundary_unique'
+                    )
+                ],
+            },
+        ),
+    ]
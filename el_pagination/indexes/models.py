@@ -0,0 +1,50 @@
+"""Models storing the page boundaries of listings."""
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class SeekIndex(models.Model):
+    """The page boundaries of a query, valid for *count* objects.
+
+    The *high* value is the highest sort key indexed: objects with a higher
+    key can be added without invalidating the boundaries. The index is
+    *stale* once other objects of the *model* are changed.
+    """
+
+    fingerprint = models.CharField(max_length=32, primary_key=True)
+    model = models.CharField(max_length=255)
+    field = models.CharField(max_length=255)
+    count = models.BigIntegerField()
+    step = models.PositiveIntegerField()
+    high = models.JSONField(encoder=DjangoJSONEncoder, null=True)
+    stale = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [models.Index(fields=['model'], name='el_pagination_index_model')]
+
+    def __str__(self):
+        return f'{self.fingerprint}: {self.count}'
+
+
+class SeekBoundary(models.Model):
+    """The sort key of the object at *rank* in the indexed query, i.e.
+    having *rank* objects with a lower sort key, whatever the order of the
+    query.
+    """
+
+    index = models.ForeignKey(
+        SeekIndex, on_delete=models.CASCADE, related_name='boundaries'
+    )
+    rank = models.BigIntegerField()
+    value = models.JSONField(encoder=DjangoJSONEncoder)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['index', 'rank'], name='el_pagination_boundary_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.index_id}: {self.rank}'
@@ -19,10 +19,15 @@ class ELPage:
           (usually the page number as string);
         - *self.url*: the url of the page (strting with "?");
         - *self.path*: the path of the page;
+        - *self.fragment_path*: the path of the page template, as requested
+          via Ajax when ``settings.FRAGMENTS_BY_URL`` is True;
 
-        - *self.is_current*: return True if page is the current page displayed;
+        - *self.is_current*: return True if page is the current page displayed
+          (or one of the current pages, if a range of pages is displayed);
         - *self.is_first*: return True if page is the first page;
-        - *self.is_last*:  return True if page is the last page.
+        - *self.is_last*:  return True if page is the last page;
+        - *self.prefetch*: return True if the browser should be hinted to
+          prefetch the page (see ``settings.PREFETCH_HINTS``).
     """
 
     def __init__(
@@ -36,6 +41,7 @@ class ELPage:
         default_number=1,
         override_path=None,
         context=None,
+        current_first_number=None,
     ):
         self._request = request
         self.number = number
@@ -44,11 +50,21 @@ class ELPage:
         self.context = context or {}
         self.context['request'] = request
 
-        self.is_current = number == current_number
+        if current_first_number is None:
+            current_first_number = current_number
+        self.is_current = current_first_number <= number <= current_number
         self.is_first = number == 1
         self.is_last = number == total_number
+        # Only the *next* link is hinted, not the page with the same number,
+        # and only if its page template has its own URL.
+        self.prefetch = bool(
+            settings.PREFETCH_HINTS
+            and settings.FRAGMENTS_BY_URL
+            and label
+            and number == current_number + 1
+        )
         if settings.USE_NEXT_PREVIOUS_LINKS:
-            self.is_previous = label and number == current_number - 1
+            self.is_previous = label and number == current_first_number - 1
             self.is_next = label and number == current_number + 1
 
         self.url = utils.get_querystring_for_page(
@@ -56,6 +72,10 @@ class ELPage:
         )
         path = iri_to_uri(override_path or request.path)
         self.path = f"{path}{self.url}"
+        separator = '&' if self.url else '?'
+        self.fragment_path = (
+            f"{self.path}{separator}querystring_key={self.querystring_key}"
+        )
 
     def render_link(self):
         """Render the page as a link."""
@@ -119,6 +139,7 @@ class PageList:
             default_number=self._default_number,
             override_path=self._override_path,
             context=self.context,
+            current_first_number=getattr(self._page, 'first_number', None),
         )
 
     def __getitem__(self, value):
@@ -1,11 +1,245 @@
 """Customized Django paginators."""
 
+import hashlib
+import time
+import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import partial
 from math import ceil
 
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
 from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Count, IntegerField, QuerySet, Window
+from django.db.models.query import ModelIterable, ValuesIterable
+from django.db.models.signals import post_delete, post_save
+from django.utils.functional import cached_property
 
+from el_pagination import settings
 
-class CustomPage(Page):
+# Worker threads counting objects (see *DefaultPaginator*).
+_executor = None
+
+
+def _get_executor():
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        _executor = ThreadPoolExecutor(thread_name_prefix='el_pagination')
+    return _executor
+
+
+def _count(queryset):
+    """Return the number of objects in *queryset*, from a worker thread."""
+    # Worker threads keep their database connections between counts, as
+    # long as ``CONN_MAX_AGE`` allows it, like request handlers do.
+    close_old_connections()
+    try:
+        return queryset.count()
+    finally:
+        close_old_connections()
+
+
+def _refresh_count(queryset, cache_key, timeout, stale_timeout):
+    """Count the objects in *queryset* and cache the result, from a worker
+    thread, then release the lock taken by *get_cached_count*.
+    """
+    cache = caches[settings.CACHE]
+    try:
+        count = _count(queryset)
+        cache.set(cache_key, (count, time.time() + timeout), timeout + stale_timeout)
+    finally:
+        cache.delete(f'{cache_key}:lock')
+
+
+def get_cached_count(queryset, timeout, stale_timeout=None):
+    """Return the number of objects in *queryset*, cached for *timeout*
+    seconds.
+
+    Once expired, the count is still returned for *stale_timeout* seconds
+    (by default ``settings.COUNT_STALE_TIMEOUT``), while it is refreshed in
+    a worker thread. A lock is taken in the cache, so that only one process
+    counts the objects of the same query at a time.
+
+    If the count is not cached at all, the process taking the lock counts
+    the objects, while the others wait for its result up to
+    ``settings.COUNT_LOCK_WAIT`` seconds, and then count the objects
+    without caching the result.
+    """
+    if stale_timeout is None:
+        stale_timeout = settings.COUNT_STALE_TIMEOUT
+    fingerprint = get_fingerprint(queryset)
+    if fingerprint is None:
+        return queryset.count()
+    cache = caches[settings.CACHE]
+    cache_key = f'el_pagination:count:{queryset.db}:{fingerprint}'
+    lock_key = f'{cache_key}:lock'
+    lock_timeout = stale_timeout or timeout
+    cached = cache.get(cache_key)
+    if cached is None:
+        if cache.add(lock_key, True, lock_timeout):
+            try:
+                count = queryset.count()
+                cache.set(
+                    cache_key, (count, time.time() + timeout), timeout + stale_timeout
+                )
+            finally:
+                cache.delete(lock_key)
+            return count
+        # Another process is counting the objects.
+        deadline = time.monotonic() + settings.COUNT_LOCK_WAIT
+        while cached is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            cached = cache.get(cache_key)
+        if cached is None:
+            return queryset.count()
+    count, expires = cached
+    if expires <= time.time() and cache.add(lock_key, True, lock_timeout):
+        _get_executor().submit(
+            _refresh_count, queryset, cache_key, timeout, stale_timeout
+        )
+    return count
+
+
+def get_seek_field(queryset):
+    """Return the *(field, descending)* pair *queryset* is sorted by,
+    or None if the objects cannot be filtered by sort key.
+    """
+    if not isinstance(queryset, QuerySet):
+        return None
+    query = queryset.query
+    # pylint: disable-next=protected-access
+    if queryset._iterable_class is not ModelIterable or (
+        query.distinct or query.combinator or query.is_sliced
+    ):
+        return None
+    ordering = query.order_by
+    if not ordering and query.default_ordering:
+        ordering = query.get_meta().ordering
+    if len(ordering) != 1 or not isinstance(ordering[0], str):
+        return None
+    name = ordering[0].lstrip('-')
+    opts = query.get_meta()
+    try:
+        field = opts.pk if name == 'pk' else opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+    # NULL values would be dropped by the filters on the sort key.
+    if not (field.concrete and field.unique) or field.is_relation or field.null:
+        return None
+    return field, ordering[0].startswith('-')
+
+
+def get_fingerprint(queryset):
+    """Return a hash of the SQL query of *queryset*, or None if the query
+    cannot be fingerprinted.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return hashlib.md5(f'{sql} {params!r}'.encode()).hexdigest()
+
+
+def _get_generation_key(model):
+    return f'el_pagination:generation:{model._meta.concrete_model._meta.label}'
+
+
+def get_generation(model):
+    """Return a token identifying the current version of the objects of
+    *model*, changed when one of them is saved or deleted (see
+    *track_changes*).
+    """
+    cache = caches[settings.CACHE]
+    key = _get_generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        generation = cache.get(key)
+    return generation
+
+
+def _changed(sender, using=None, **kwargs):
+    cache = caches[settings.CACHE]
+    for model in [sender, *sender._meta.get_parent_list()]:
+        key = _get_generation_key(model)
+        cache.delete(key)
+        # Requests run before the commit could record data not including
+        # the change under the new generation.
+        transaction.on_commit(partial(cache.delete, key), using=using)
+
+
+def track_changes():
+    """Change the generation of the objects of a model every time one of
+    them is saved or deleted.
+    """
+    post_save.connect(_changed, dispatch_uid='el_pagination:generation')
+    post_delete.connect(_changed, dispatch_uid='el_pagination:generation')
+
+
+def get_snapshot(queryset, token=None, timeout=None, max_size=None):
+    """Return the *(token, pks)* pair of a snapshot of the primary keys of
+    *queryset*, in order.
+
+    The snapshot identified by *token* is used if it is still in the cache,
+    otherwise the primary keys are retrieved and stored in the cache for
+    *timeout* seconds, under a new token.
+    Integer primary keys are stored as a compact array of 64-bit integers.
+
+    If the query returns more than *max_size* objects, no snapshot is
+    stored and *(None, None)* is returned. This is remembered for *timeout*
+    seconds, so that the primary keys are not retrieved again.
+    """
+    fingerprint = get_fingerprint(queryset)
+    if fingerprint is None:
+        return None, ()
+    cache = caches[settings.CACHE]
+    key = f'el_pagination:snapshot:{fingerprint}'
+    if token:
+        data = cache.get(f'{key}:{token}')
+        if isinstance(data, bytes):
+            return token, array('q', data)
+        if data is not None:
+            return token, data
+    # This marks queries returning too many objects.
+    if cache.get(f'{key}:large'):
+        return None, None
+    pks = queryset.values_list('pk', flat=True)
+    if max_size is not None:
+        pks = list(pks[: max_size + 1])
+        if len(pks) > max_size:
+            cache.set(f'{key}:large', True, timeout)
+            return None, None
+    if isinstance(queryset.model._meta.pk, IntegerField):
+        pks = array('q', pks)
+        data = pks.tobytes()
+    else:
+        pks = data = tuple(pks)
+    token = uuid.uuid4().hex
+    cache.set(f'{key}:{token}', data, timeout)
+    return token, pks
+
+
+class BasePage(Page):
+    """A page possibly spanning several consecutive pages.
+
+    The page includes the objects from page *first_number* to page *number*.
+    """
+
+    def __init__(self, object_list, number, paginator, first_number=None):
+        super().__init__(object_list, number, paginator)
+        self.first_number = number if first_number is None else first_number
+
+    def has_previous(self):
+        return self.first_number > 1
+
+    def previous_page_number(self):
+        return self.paginator.validate_number(self.first_number - 1)
+
+
+class CustomPage(BasePage):
     """Handle different number of items on the first page."""
 
     def start_index(self):
@@ -14,9 +248,9 @@ class CustomPage(Page):
         # Special case, return zero if no items.
         if paginator.count == 0:
             return 0
-        if self.number == 1:
+        if self.first_number == 1:
             return 1
-        return (self.number - 2) * paginator.per_page + paginator.first_page + 1
+        return (self.first_number - 2) * paginator.per_page + paginator.first_page + 1
 
     def end_index(self):
         """Return the 1-based index of the last item on this page."""
@@ -31,8 +265,28 @@ class BasePaginator(Paginator):
     """A base paginator class subclassed by the other real paginators.
 
     Handle different number of items on the first page.
+
+    Paginators used by the *paginate* tag (see ``settings.PAGINATOR_CLASS``)
+    do not need to subclass this class, but they must:
+
+        - accept the *object_list* and *per_page* arguments, and the
+          *first_page* and *orphans* keyword arguments;
+        - implement *page(number)*, raising *EmptyPage* or
+          *PageNotAnInteger* if the page is not valid, and optionally
+          *page_span(first_number, last_number)*, used when a range of pages
+          is requested (otherwise, or if *page* is overridden in a subclass,
+          only the last page of the range is retrieved);
+        - expose the *per_page* attribute and the *num_pages* property, and
+          the *count* and *page_range* properties if the total number of
+          objects is displayed, or negative page numbers are used.
+
+    The pages returned must implement the *django.core.paginator.Page*
+    interface, and may expose the *first_number* of a range of pages.
     """
 
+    # Allow paginator classes to be passed to templates as context variables.
+    do_not_call_in_templates = True
+
     def __init__(self, object_list, per_page, **kwargs):
         self._num_pages = None
         if 'first_page' in kwargs:
@@ -44,20 +298,280 @@ class BasePaginator(Paginator):
     def get_current_per_page(self, number):
         return self.first_page if number == 1 else self.per_page
 
+    def get_bottom(self, number):
+        """Return the 0-based index of the first object on page *number*."""
+        if number == 1:
+            return 0
+        return (number - 2) * self.per_page + self.first_page
+
+    def validate_span(self, first_number, last_number):
+        """Validate the given range of page numbers."""
+        first_number = self.validate_number(first_number)
+        last_number = self.validate_number(last_number)
+        if first_number > last_number:
+            raise EmptyPage('That page range is empty')
+        return first_number, last_number
+
 
 class DefaultPaginator(BasePaginator):
-    """The default paginator used by this application."""
+    """The default paginator used by this application.
+
+    Querysets can be paginated in two other ways, retrieving the objects
+    of the page before knowing whether the page exists. The objects are
+    discarded if the number of objects shows that the page does not exist.
+
+    - If *window_count* is True (by default ``settings.WINDOW_COUNT``), the
+      number of objects is retrieved along with the objects of the page,
+      annotating them with a ``COUNT(*) OVER ()`` window function, so that
+      a single query is run. This requires a database supporting window
+      functions, and querysets of model instances or dicts not using
+      *distinct*: other querysets are paginated as usual.
+    - If *concurrent_count* is True (by default ``settings.CONCURRENT_COUNT``),
+      querysets are counted in a worker thread while the objects of the page
+      are retrieved, so that the two queries run at the same time.
+      Note that the worker thread uses another database connection, and so
+      it does not see changes not yet committed by the current transaction,
+      e.g. the transaction of the request if ``ATOMIC_REQUESTS`` is True.
+
+    Otherwise, if *seek_map* is True (by default ``settings.SEEK_MAP``), the
+    sort key of the first object of each page served is stored in the cache
+    for ``settings.SEEK_MAP_TIMEOUT`` seconds. Later requests for that page,
+    or the pages following it, then filter the objects by sort key instead
+    of using a large ``OFFSET``. This is only done for querysets of model
+    instances ordered by a single unique, not nullable field, e.g.
+    ``order_by('-pk')``. The recorded keys are bound to the number of objects
+    and to the generation of the model (see *get_generation*), so that they
+    are not used anymore once objects of the model are saved or deleted.
+    Changes are tracked by all the processes only if ``settings.SEEK_MAP``
+    is True. Changes not sending signals, e.g. ``QuerySet.update()``, are
+    only detected once the recorded keys expire. The keys of all the pages
+    can also be stored in advance in a table, using the
+    ``el_pagination_index`` management command of the *el_pagination.indexes*
+    application: they are only used while the index matches the number of
+    objects (see *el_pagination.indexes.boundaries.is_valid*).
+
+    The number of objects can be retrieved from another source, passed as
+    *count*: a lighter queryset (e.g. without the annotations and the joins
+    only needed to display the objects), a number, or a callable returning
+    one of them. In this case, the objects are not counted using a window
+    function.
+
+    If *count_database* is given (by default ``settings.COUNT_DATABASE``),
+    querysets are counted using that database alias, e.g. a read replica,
+    while the objects of the page are still retrieved from their own
+    database. The number of objects may then lag behind the objects.
+
+    If *count_timeout* is given (by default ``settings.COUNT_TIMEOUT``),
+    the number of objects of querysets is cached for that many seconds, and
+    refreshed in the background once expired (see *get_cached_count*).
+    """
+
+    # The name of the annotation holding the number of objects.
+    window_count_alias = 'el_pagination_count'
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        *args,
+        concurrent_count=None,
+        window_count=None,
+        seek_map=None,
+        count=None,
+        count_database=None,
+        count_timeout=None,
+        **kwargs,
+    ):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        if concurrent_count is None:
+            concurrent_count = settings.CONCURRENT_COUNT
+        if window_count is None:
+            window_count = settings.WINDOW_COUNT
+        if seek_map is None:
+            seek_map = settings.SEEK_MAP
+        self.concurrent_count = concurrent_count
+        self.window_count = window_count
+        self.seek_map = seek_map
+        if seek_map:
+            track_changes()
+        if count_database is None:
+            count_database = settings.COUNT_DATABASE
+        if count_timeout is None:
+            count_timeout = settings.COUNT_TIMEOUT
+        self.count_source = count
+        self.count_database = count_database
+        self.count_timeout = count_timeout
+
+    def _get_count_queryset(self):
+        """Return the queryset counted to get the number of objects, if any."""
+        queryset = self.object_list if self.count_source is None else self.count_source
+        if not isinstance(queryset, QuerySet):
+            return None
+        if self.count_database:
+            queryset = queryset.using(self.count_database)
+        return queryset
+
+    @cached_property
+    def count(self):
+        """Return the number of objects, using the count source if given."""
+        queryset = self._get_count_queryset()
+        if queryset is not None:
+            if self.count_timeout:
+                return get_cached_count(queryset, self.count_timeout)
+            return queryset.count()
+        source = self.count_source
+        if source is None:
+            return super().count
+        if callable(source):
+            source = source()
+        if isinstance(source, QuerySet) and self.count_database:
+            source = source.using(self.count_database)
+        return source if isinstance(source, int) else source.count()
 
     def page(self, number):
-        number = self.validate_number(number)
-        if number == 1:
-            bottom = 0
+        return self.page_span(number, number)
+
+    def page_span(self, first_number, last_number):
+        if (
+            'count' not in self.__dict__
+            and isinstance(self.object_list, QuerySet)
+            and (self.count_source is None or isinstance(self.count_source, QuerySet))
+            and not self.count_timeout
+        ):
+            try:
+                first, last = int(first_number), int(last_number)
+            except (TypeError, ValueError):
+                pass
+            else:
+                if 1 <= first <= last:
+                    if (
+                        self.window_count
+                        and self.count_source is None
+                        and not self.count_database
+                        and self._supports_window_count()
+                    ):
+                        return self._window_page_span(first, last)
+                    if self.concurrent_count:
+                        return self._concurrent_page_span(first, last)
+        first_number, number = self.validate_span(first_number, last_number)
+        bottom = self.get_bottom(first_number)
+        top = self.get_bottom(number) + self.get_current_per_page(number)
+        if top + self.orphans >= self.count:
+            top = self.count
+        seek_field = get_seek_field(self.object_list) if self.seek_map else None
+        if seek_field is None:
+            objects = self.object_list[bottom:top]
         else:
-            bottom = (number - 2) * self.per_page + self.first_page
-        top = bottom + self.get_current_per_page(number)
+            objects = self._seek(seek_field, bottom, top)
+        return CustomPage(objects, number, self, first_number=first_number)
+
+    def _seek(self, seek_field, bottom, top):
+        """Return the objects from index *bottom* to *top*, filtering them
+        by the nearest sort key recorded before *bottom*, if any.
+
+        The first object of the next page is retrieved too, so that its sort
+        key is recorded for the next request.
+        """
+        fingerprint = get_fingerprint(self.object_list)
+        if fingerprint is None:
+            return self.object_list[bottom:top]
+        cache = caches[settings.CACHE]
+        generation = get_generation(self.object_list.model)
+        cache_key = f'el_pagination:seek:{fingerprint}:{self.count}:{generation}'
+        boundaries = cache.get(cache_key, {})
+        known = dict(boundaries)
+        offset = max((i for i in known if i <= bottom), default=0)
+        # Look for a nearer boundary in the stored index, if any.
+        indexed = settings.SEEK_INDEXES and apps.is_installed('el_pagination.indexes')
+        if indexed and offset < bottom:
+            # pylint: disable-next=import-outside-toplevel
+            from el_pagination.indexes.boundaries import get_boundary
+
+            boundary = get_boundary(self.object_list, fingerprint, self.count, bottom)
+            if boundary is not None and boundary[0] > offset:
+                offset = boundary[0]
+                known[offset] = boundary[1]
+        field, descending = seek_field
+        queryset = self.object_list
+        if offset:
+            lookup = f'{field.attname}__{"lte" if descending else "gte"}'
+            queryset = queryset.filter(**{lookup: known[offset]})
+        objects = list(queryset[bottom - offset : top - offset + 1])
+        updated = False
+        for index, obj in ((bottom, objects[:1]), (top, objects[top - bottom :])):
+            if index and obj and index not in known:
+                boundaries[index] = getattr(obj[0], field.attname)
+                updated = True
+        if updated:
+            cache.set(cache_key, boundaries, settings.SEEK_MAP_TIMEOUT)
+        return objects[: top - bottom]
+
+    def _get_speculative_slice(self, first_number, last_number):
+        """Return the *(bottom, top)* indexes of the objects to retrieve
+        before knowing the number of objects.
+
+        Orphans are retrieved too, in case this is the last page.
+        """
+        bottom = self.get_bottom(first_number)
+        top = self.get_bottom(last_number) + self.get_current_per_page(last_number)
+        return bottom, top + self.orphans
+
+    def _speculative_page(self, objects, first_number, last_number):
+        """Return the page of the given *objects*, retrieved before knowing
+        the number of objects.
+        """
+        # The objects are discarded if the pages do not exist.
+        first_number, number = self.validate_span(first_number, last_number)
+        bottom = self.get_bottom(first_number)
+        top = self.get_bottom(number) + self.get_current_per_page(number)
         if top + self.orphans >= self.count:
             top = self.count
-        return CustomPage(self.object_list[bottom:top], number, self)
+        return CustomPage(
+            objects[: top - bottom], number, self, first_number=first_number
+        )
+
+    def _concurrent_page_span(self, first_number, last_number):
+        """Return the pages from *first_number* to *last_number*, counting
+        the objects in a worker thread while the objects are retrieved.
+        """
+        future = _get_executor().submit(_count, self._get_count_queryset())
+        bottom, top = self._get_speculative_slice(first_number, last_number)
+        try:
+            objects = list(self.object_list[bottom:top])
+        except BaseException:
+            # The count is discarded, even if it failed too.
+            wait([future])
+            raise
+        self.__dict__['count'] = future.result()
+        return self._speculative_page(objects, first_number, last_number)
+
+    def _supports_window_count(self):
+        """Return True if the objects can be counted using a window function."""
+        queryset = self.object_list
+        query = queryset.query
+        return (
+            connections[queryset.db].features.supports_over_clause
+            # pylint: disable-next=protected-access
+            and queryset._iterable_class in (ModelIterable, ValuesIterable)
+            and not (query.distinct or query.combinator or query.is_sliced)
+        )
+
+    def _window_page_span(self, first_number, last_number):
+        """Return the pages from *first_number* to *last_number*, retrieving
+        the objects and their number with a single query.
+        """
+        alias = self.window_count_alias
+        queryset = self.object_list.annotate(**{alias: Window(Count('*'))})
+        bottom, top = self._get_speculative_slice(first_number, last_number)
+        objects = list(queryset[bottom:top])
+        if objects:
+            for obj in objects:
+                count = (obj if isinstance(obj, dict) else vars(obj)).pop(alias)
+        else:
+            # The pages are out of range, or there are no objects at all.
+            count = self.object_list.count()
+        self.__dict__['count'] = count
+        return self._speculative_page(objects, first_number, last_number)
 
     def _get_num_pages(self):
         if self._num_pages is None:
@@ -74,15 +588,97 @@ class DefaultPaginator(BasePaginator):
     num_pages = property(_get_num_pages)
 
 
-class LazyPaginatorCustomPage(Page):
+class SnapshotPaginator(DefaultPaginator):
+    """Paginate a snapshot of the primary keys of a queryset.
+
+    The ordered primary keys are retrieved once and stored in the cache
+    (see *get_snapshot*): each page is then retrieved by primary key,
+    without sorting the objects again, and the pages are consistent even if
+    objects are added or removed in the meantime.
+    Objects deleted, or not matching the queryset anymore, are skipped.
+    Other sequences, querysets of dicts or tuples, sliced querysets, and
+    querysets of more than *snapshot_max_size* objects (by default
+    ``settings.SNAPSHOT_MAX_SIZE``), are paginated as with *DefaultPaginator*.
+
+    The *snapshot* token of the primary keys used is available as an
+    attribute once the objects are counted, and can be passed back to
+    paginate the same snapshot. A new snapshot is taken if no token is
+    given. The snapshot is kept in the cache for
+    *snapshot_timeout* seconds (by default ``settings.SNAPSHOT_TIMEOUT``).
+    """
+
+    def __init__(
+        self,
+        object_list,
+        per_page,
+        *args,
+        snapshot=None,
+        snapshot_timeout=None,
+        snapshot_max_size=None,
+        **kwargs,
+    ):
+        kwargs.update(concurrent_count=False, window_count=False, seek_map=False)
+        super().__init__(object_list, per_page, *args, **kwargs)
+        if snapshot_timeout is None:
+            snapshot_timeout = settings.SNAPSHOT_TIMEOUT
+        if snapshot_max_size is None:
+            snapshot_max_size = settings.SNAPSHOT_MAX_SIZE
+        self.snapshot = snapshot
+        self.snapshot_timeout = snapshot_timeout
+        self.snapshot_max_size = snapshot_max_size
+
+    @cached_property
+    def pks(self):
+        """The ordered primary keys of the objects, or None if there are too
+        many of them, or if the objects are not a queryset of model instances
+        that can be filtered."""
+        queryset = self.object_list
+        if (
+            not isinstance(queryset, QuerySet)
+            or queryset._iterable_class is not ModelIterable
+            or queryset.query.is_sliced
+        ):
+            return None
+        self.snapshot, pks = get_snapshot(
+            self.object_list,
+            self.snapshot,
+            self.snapshot_timeout,
+            self.snapshot_max_size,
+        )
+        return pks
+
+    @cached_property
+    def count(self):
+        if self.pks is None:
+            return super().count
+        return len(self.pks)
+
+    def page_span(self, first_number, last_number):
+        if self.pks is None:
+            return super().page_span(first_number, last_number)
+        first_number, number = self.validate_span(first_number, last_number)
+        bottom = self.get_bottom(first_number)
+        top = self.get_bottom(number) + self.get_current_per_page(number)
+        if top + self.orphans >= self.count:
+            top = self.count
+        pks = self.pks[bottom:top]
+        objects = {}
+        if pks:
+            queryset = self.object_list.order_by().filter(pk__in=list(pks))
+            objects = {obj.pk: obj for obj in queryset}
+        objects = [objects[pk] for pk in pks if pk in objects]
+        return CustomPage(objects, number, self, first_number=first_number)
+
+
+class LazyPaginatorCustomPage(BasePage):
     """Handle different number of items on the first page."""
 
     def start_index(self):
         """Return the 1-based index of the first item on this page."""
         paginator = self.paginator
-        if self.number == 1:
+        if self.first_number == 1:
             return 1
-        return (self.number - 2) * paginator.per_page + paginator.first_page + 1
+        return (self.first_number - 2) * paginator.per_page + paginator.first_page + 1
 
     def end_index(self):
         """Return the 1-based index of the last item on this page."""
@@ -103,13 +699,13 @@ class LazyPaginator(BasePaginator):
         return number
 
     def page(self, number):
-        number = self.validate_number(number)
-        current_per_page = self.get_current_per_page(number)
-        if number == 1:
-            bottom = 0
-        else:
-            bottom = (number - 2) * self.per_page + self.first_page
-        top = bottom + current_per_page
+        return self.page_span(number, number)
+
+    def page_span(self, first_number, last_number):
+        first_number, number = self.validate_span(first_number, last_number)
+        bottom = self.get_bottom(first_number)
+        top = self.get_bottom(number) + self.get_current_per_page(number)
+        current_per_page = top - bottom
         # Retrieve more objects to check if there is a next page.
         objects = list(self.object_list[bottom : top + self.orphans + 1])
         objects_count = len(objects)
@@ -118,12 +714,12 @@ class LazyPaginator(BasePaginator):
             self._num_pages = number + 1
             # In any case,  return only objects for this page.
             objects = objects[:current_per_page]
-        elif (number != 1) and (objects_count <= self.orphans):
+        elif (first_number != 1) and (objects_count <= self.orphans):
             raise EmptyPage('That page contains no results')
         else:
             # This is the last page.
             self._num_pages = number
-        return LazyPaginatorCustomPage(objects, number, self)
+        return LazyPaginatorCustomPage(objects, number, self, first_number=first_number)
 
     def _get_count(self):
         raise NotImplementedError
@@ -0,0 +1,129 @@
+"""Concurrent evaluation of the paginations of a page."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connections
+
+from el_pagination import settings, utils
+from el_pagination.paginators import LazyPaginator, SnapshotPaginator
+
+
+class PaginationPlan:
+    """Evaluate several paginations concurrently, before rendering.
+
+    Usage::
+
+        plan = PaginationPlan(request)
+        plan.add(entries, per_page=10, querystring_key='entries-page')
+        plan.add(articles, querystring_key='articles-page', lazy=True)
+        plan.execute()
+
+    Each pagination is evaluated in a worker thread, using its own database
+    connections, so that the time spent is the one of the slowest
+    pagination rather than the sum of all of them. The *paginate* and
+    *lazy_paginate* template tags then use the evaluated pages, provided
+    that they paginate the same objects using the same arguments.
+
+    Since the worker threads use their own connections, they do not see the
+    changes not committed yet, e.g. when *ATOMIC_REQUESTS* is enabled.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self._paginations = []
+
+    def add(
+        self,
+        objects,
+        per_page=None,
+        first_page=None,
+        querystring_key=None,
+        default_number=1,
+        lazy=False,
+        paginator_class=None,
+        count=None,
+        count_database=None,
+    ):
+        """Register the pagination of *objects*.
+
+        The arguments match the ones of the *paginate* template tag, and
+        *lazy* must be True if the objects are paginated by *lazy_paginate*.
+        The *paginator_class* must match the ``with paginator`` argument
+        of the tag, if any, and *count* and *count_database* its ``count``
+        argument.
+        """
+        if paginator_class is None and lazy:
+            paginator_class = LazyPaginator
+        per_page = per_page or settings.PER_PAGE
+        self._paginations.append(
+            {
+                'objects': objects,
+                'paginator_class': utils.get_paginator_class(paginator_class),
+                'per_page': per_page,
+                'first_page': first_page or per_page,
+                'querystring_key': querystring_key or settings.PAGE_LABEL,
+                'default_number': default_number,
+                'count': count,
+                'count_database': count_database,
+            }
+        )
+
+    def _evaluate(self, pagination):
+        """Return the page of the given *pagination*, with its objects."""
+        try:
+            kwargs = {
+                'first_page': pagination['first_page'],
+                'orphans': settings.ORPHANS,
+            }
+            for name in ('count', 'count_database'):
+                if pagination[name] is not None:
+                    kwargs[name] = pagination[name]
+            if issubclass(pagination['paginator_class'], SnapshotPaginator):
+                kwargs['snapshot'] = utils.get_snapshot_token(
+                    self.request, pagination['querystring_key']
+                )
+            paginator = pagination['paginator_class'](
+                pagination['objects'], pagination['per_page'], **kwargs
+            )
+            page, default_number = utils.get_page_from_request(
+                self.request,
+                paginator,
+                pagination['querystring_key'],
+                default_number=pagination['default_number'],
+            )
+            page.object_list = list(page.object_list)
+            return page, default_number
+        finally:
+            # Database connections are opened for each worker thread.
+            connections.close_all()
+
+    def execute(self, max_workers=None):
+        """Evaluate all the registered paginations, each one in a thread.
+
+        Errors raised while evaluating a pagination, e.g. a 404 if the page
+        is out of range, are propagated.
+        """
+        if not self._paginations:
+            return
+        state = utils.get_pagination_state(self.request)
+        # Parse the request data once, before starting the threads.
+        for pagination in self._paginations:
+            state.get_numbers(pagination['querystring_key'])
+        max_workers = max_workers or len(self._paginations)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._evaluate, pagination)
+                for pagination in self._paginations
+            ]
+            for pagination, future in zip(self._paginations, futures):
+                # The count arguments do not change the page retrieved.
+                kwargs = {
+                    k: v
+                    for k, v in pagination.items()
+                    if k not in ('count', 'count_database')
+                }
+                key = utils.get_prepared_page_key(**kwargs)
+                state.prepared_pages[key] = (pagination['objects'],) + tuple(
+                    future.result()
+                )
+        self._paginations = []
@@ -56,3 +56,76 @@ TEMPLATE_VARNAME = getattr(settings, 'EL_PAGINATION_TEMPLATE_VARNAME', 'template
 
 # If page out of range, throw a 404 exception
 PAGE_OUT_OF_RANGE_404 = getattr(settings, 'EL_PAGINATION_PAGE_OUT_OF_RANGE_404', False)
+
+# Maximum number of pages that can be requested at once using a page range
+# in the querystring (e.g. ``?page=3-7``).
+MAX_PAGE_SPAN = getattr(settings, 'EL_PAGINATION_MAX_PAGE_SPAN', 20)
+
+# Set to True to add a ``<link rel="prefetch">`` tag pointing to the page
+# template of the next page to the Digg-style *next* link and to the
+# *show_more* link, so that the browser can fetch it during idle time. Only
+# used if *FRAGMENTS_BY_URL* is True, so that the hinted URL is the one
+# requested via Ajax.
+PREFETCH_HINTS = getattr(settings, 'EL_PAGINATION_PREFETCH_HINTS', False)
+
+# Set to True to switch to the page template when the *querystring_key*
+# parameter is in the querystring, ignoring the ``X-Requested-With`` header.
+# This way the full page and the page template have different URLs, and
+# both can be cached by proxies and CDNs not supporting ``Vary`` headers.
+FRAGMENTS_BY_URL = getattr(settings, 'EL_PAGINATION_FRAGMENTS_BY_URL', False)
+
+# Set to True to count the objects of a queryset in a worker thread, while
+# the objects of the page are retrieved, instead of running the two queries
+# one after the other.
+CONCURRENT_COUNT = getattr(settings, 'EL_PAGINATION_CONCURRENT_COUNT', False)
+
+# Set to True to retrieve the number of objects of a queryset along with the
+# objects of the page, using a ``COUNT(*) OVER ()`` window function.
+WINDOW_COUNT = getattr(settings, 'EL_PAGINATION_WINDOW_COUNT', False)
+
+# The alias of the cache used to store pagination data.
+CACHE = getattr(settings, 'EL_PAGINATION_CACHE', 'default')
+
+# Set to True to record, in the cache, the sort key of the first object of
+# each page served, so that later requests for that page, or the pages
+# following it, use a ``WHERE key >= boundary`` query instead of a large
+# ``OFFSET``.
+SEEK_MAP = getattr(settings, 'EL_PAGINATION_SEEK_MAP', False)
+
+# How many seconds the sort keys recorded when *SEEK_MAP* is True are kept
+# in the cache.
+SEEK_MAP_TIMEOUT = getattr(settings, 'EL_PAGINATION_SEEK_MAP_TIMEOUT', 300)
+
+# A dict mapping listing names to dotted paths of callables returning the
+# querysets indexed by the ``el_pagination_index`` management command of the
+# ``el_pagination.indexes`` application. The stored page boundaries are only
+# looked up by the paginator if this is not empty.
+SEEK_INDEXES = getattr(settings, 'EL_PAGINATION_SEEK_INDEXES', {})
+
+# How many seconds the snapshots of the primary keys paginated by the
+# ``snapshot_paginate`` tag are kept in the cache.
+SNAPSHOT_TIMEOUT = getattr(settings, 'EL_PAGINATION_SNAPSHOT_TIMEOUT', 300)
+
+# The maximum number of primary keys stored in a snapshot. Larger querysets
+# are paginated by the ``snapshot_paginate`` tag as by the ``paginate`` one.
+SNAPSHOT_MAX_SIZE = getattr(settings, 'EL_PAGINATION_SNAPSHOT_MAX_SIZE', 10000)
+
+# The paginator class used by the ``paginate`` tag, or its dotted path.
+# If None, *el_pagination.paginators.DefaultPaginator* is used.
+PAGINATOR_CLASS = getattr(settings, 'EL_PAGINATION_PAGINATOR_CLASS', None)
+
+# The alias of the database used to count the objects of querysets, e.g. a
+# read replica. If None, querysets are counted in their own database.
+COUNT_DATABASE = getattr(settings, 'EL_PAGINATION_COUNT_DATABASE', None)
+
+# How many seconds the number of objects of querysets is cached. If None,
+# querysets are counted on each request.
+COUNT_TIMEOUT = getattr(settings, 'EL_PAGINATION_COUNT_TIMEOUT', None)
+
+# How many seconds an expired count is still used, while it is refreshed
+# in a background thread.
+COUNT_STALE_TIMEOUT = getattr(settings, 'EL_PAGINATION_COUNT_STALE_TIMEOUT', 600)
+
+# How many seconds to wait for a count not cached yet, while another process
+# computes it, before counting the objects anyway.
+COUNT_LOCK_WAIT = getattr(settings, 'EL_PAGINATION_COUNT_LOCK_WAIT', 1)
@@ -0,0 +1,830 @@
+/*
+ * Django EL Pagination, dependency-free version.
+ *
+ * This ES module provides the same features and options as the jQuery
+ * plugin in el-pagination.js, using fetch and native event delegation, e.g.:
+ *
+ *     import endlessPaginate from './el-pagination.esm.js';
+ *     endlessPaginate(document.body, {paginateOnScroll: true});
+ */
+
+const defaults = {
+    // Twitter-style pagination container selector.
+    containerSelector: '.endless_container',
+    // Twitter-style pagination loading selector.
+    loadingSelector: '.endless_loading',
+    // Twitter-style pagination link selector.
+    moreSelector: 'a.endless_more',
+    // Twitter-style pagination content wrapper selector.
+    contentSelector: null,
+    // Twitter-style pagination previous page container selector.
+    previousContainerSelector: '.endless_previous_container',
+    // Twitter-style pagination previous page link selector.
+    previousSelector: 'a.endless_previous',
+    // Digg-style pagination page template selector.
+    pageSelector: '.endless_page_template',
+    // Digg-style pagination link selector.
+    pagesSelector: 'a.endless_page_link',
+    // Callback called when the user clicks to get another page.
+    onClick: function() {},
+    // Callback called when the new page is correctly displayed.
+    onCompleted: function() {},
+    // Set this to true to use the paginate-on-scroll feature.
+    paginateOnScroll: false,
+    // If paginate-on-scroll is on, this margin will be used.
+    paginateOnScrollMargin: 1,
+    // If paginate-on-scroll is on, it is possible to define chunks.
+    paginateOnScrollChunkSize: 0,
+    // Set this to true to detect the end of the page watching the
+    // Twitter-style container with an IntersectionObserver.
+    // Browsers not supporting it use the scroll handler instead.
+    paginateOnScrollObserver: false,
+    // The IntersectionObserver root margin. If null, the bottom
+    // margin is set to paginateOnScrollMargin pixels.
+    paginateOnScrollRootMargin: null,
+    // Minimum delay (in milliseconds) between scroll checks.
+    paginateOnScrollThrottle: 100,
+    // Set this to true to prefetch the next page when the browser
+    // is idle, so that it is displayed without waiting for the
+    // network. Digg-style links are prefetched only if their
+    // rel attribute contains "next".
+    prefetch: false,
+    // Maximum number of fragments kept in memory when prefetch is on.
+    prefetchCacheSize: 10,
+    // Set this to true to detach Twitter-style pages scrolled far
+    // out of view, replacing them with placeholders of the same
+    // height. Pages are restored when they get close to the viewport.
+    virtualize: false,
+    // Distance (in pixels) from the viewport beyond which pages
+    // are detached.
+    virtualizeMargin: 2000,
+    // If set, new pages are inserted in chunks, spending at most
+    // this number of milliseconds per animation frame.
+    insertBudget: 0,
+    // Set this to true to load again the Twitter-style pages, and
+    // to restore the scroll position, when the user comes back to
+    // the page using the browser history.
+    restorePages: false,
+    // Maximum number of pages restored with a single request.
+    // It must not exceed EL_PAGINATION_MAX_PAGE_SPAN.
+    maxPageSpan: 20,
+    // Set this to true to combine the requests for pages of different
+    // paginations sent at the same time (e.g. when pages are restored or
+    // prefetched) in a single request. The view must be decorated with
+    // page_templates.
+    batchRequests: false
+};
+
+const requestIdle = window.requestIdleCallback || function(callback) {
+    return setTimeout(callback, 1);
+};
+
+const getContext = function(link) {
+    return {
+        key: link.dataset.elQuerystringKey.split(' ')[0],
+        url: link.getAttribute('href')
+    };
+};
+
+const getCacheKey = function(context) {
+    return context.key + ' ' + context.url;
+};
+
+const escapeRegExp = function(text) {
+    return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+};
+
+// Return the [first, last] page numbers requested by the context,
+// or null if its URL does not include a page number.
+const getPageSpan = function(context) {
+    const match = new RegExp(
+        '[?&]' + escapeRegExp(context.key) + '=(\\d+)(?:-(\\d+))?(?:&|#|$)'
+    ).exec(context.url);
+    if (!match) {
+        return null;
+    }
+    return [parseInt(match[1], 10), parseInt(match[2] || match[1], 10)];
+};
+
+// Return the URL requesting the pages from first to last.
+const setPageSpan = function(url, key, first, last) {
+    const value = last > first ? first + '-' + last : first;
+    return url.replace(
+        new RegExp('([?&]' + escapeRegExp(key) + '=)\\d+(-\\d+)?'), '$1' + value);
+};
+
+// Store the given data in the current browser history entry.
+const updateHistory = function(data) {
+    window.history.replaceState(Object.assign({}, window.history.state, data), '');
+};
+
+const throttle = function(func, wait) {
+    let timeout = null,
+        previous = 0;
+    return function() {
+        const now = Date.now(),
+            remaining = wait - (now - previous);
+        if (remaining <= 0) {
+            clearTimeout(timeout);
+            timeout = null;
+            previous = now;
+            func();
+        } else if (!timeout) {
+            // Make sure the last scroll position is always checked.
+            timeout = setTimeout(function() {
+                timeout = null;
+                previous = Date.now();
+                func();
+            }, remaining);
+        }
+    };
+};
+
+// Same as jQuery's ":visible".
+const isVisible = function(node) {
+    return Boolean(node && (
+        node.offsetWidth || node.offsetHeight || node.getClientRects().length));
+};
+
+// Call func(), which inserts content before the anchor node, keeping
+// the anchor at the same position in the viewport.
+const keepAnchor = function(anchor, func) {
+    if (!anchor) {
+        func();
+        return;
+    }
+    const top = anchor.getBoundingClientRect().top;
+    func();
+    window.scrollBy(0, anchor.getBoundingClientRect().top - top);
+};
+
+const matches = function(node, selector) {
+    return node.nodeType === Node.ELEMENT_NODE && node.matches(selector);
+};
+
+const getDocumentTop = function(node) {
+    return node.getBoundingClientRect().top + window.scrollY;
+};
+
+// Parse the given HTML and return the resulting nodes.
+const parseFragment = function(html) {
+    const template = document.createElement('template');
+    template.innerHTML = html;
+    return Array.from(template.content.childNodes);
+};
+
+// Return the HTML of the given nodes, removing them from the document.
+const serializeNodes = function(nodes) {
+    const template = document.createElement('template');
+    template.content.append(...nodes);
+    return template.innerHTML;
+};
+
+// Scripts inserted using innerHTML are not executed: replace them with
+// new script elements, as jQuery does.
+const runScripts = function(nodes) {
+    nodes.forEach(function(node) {
+        if (node.nodeType !== Node.ELEMENT_NODE) {
+            return;
+        }
+        const scripts = node.matches('script') ? [node] : node.querySelectorAll('script');
+        scripts.forEach(function(script) {
+            const copy = document.createElement('script');
+            Array.from(script.attributes).forEach(function(attribute) {
+                copy.setAttribute(attribute.name, attribute.value);
+            });
+            copy.textContent = script.textContent;
+            script.replaceWith(copy);
+        });
+    });
+};
+
+// Insert the nodes calling insert() with chunks of them, within budget
+// milliseconds per animation frame (or all at once if budget is 0).
+// Insertion stops if isActive() returns false. Call done() when all the
+// nodes are inserted.
+const insertNodes = function(nodes, budget, insert, isActive, done) {
+    if (!budget) {
+        insert(nodes);
+        done();
+        return;
+    }
+    let index = 0;
+    const step = function() {
+        if (!isActive()) {
+            return;
+        }
+        const start = performance.now();
+        while (index < nodes.length && performance.now() - start < budget) {
+            insert(nodes.slice(index, index + 1));
+            index += 1;
+        }
+        if (index < nodes.length) {
+            window.requestAnimationFrame(step);
+        } else {
+            done();
+        }
+    };
+    step();
+};
+
+// Return a promise resolved with the response to the given URL, as text,
+// or as JSON if json is true.
+const fetchUrl = function(url, signal, json) {
+    return fetch(url, {
+        credentials: 'same-origin',
+        headers: {'X-Requested-With': 'XMLHttpRequest'},
+        signal: signal
+    }).then(function(response) {
+        if (!response.ok) {
+            throw new Error(response.status + ' ' + response.statusText);
+        }
+        return json ? response.json() : response.text();
+    });
+};
+
+// Requests waiting to be sent when batchRequests is on.
+let batch = [];
+
+// Send the given batched requests for the same URL origin and path, using
+// the page_templates batch protocol if there are several of them.
+const sendBatch = function(items) {
+    const url = new URL(items[0].url),
+        keys = items.map(function(item) {
+            return item.key;
+        });
+    url.search = '';
+    // Each pagination uses the page number of its own URL.
+    items.forEach(function(item) {
+        item.url.searchParams.forEach(function(value, name) {
+            if (!url.searchParams.has(name) || name === item.key) {
+                url.searchParams.set(name, value);
+            }
+        });
+    });
+    keys.forEach(function(key) {
+        url.searchParams.append('querystring_key', key);
+    });
+    const controller = new AbortController(),
+        json = items.length > 1;
+    // The shared request is aborted if no one needs it.
+    items.forEach(function(item) {
+        item.signal.addEventListener('abort', function() {
+            if (items.every(function(other) {
+                return other.signal.aborted;
+            })) {
+                controller.abort();
+            }
+        });
+    });
+    fetchUrl(url, controller.signal, json).then(function(data) {
+        items.forEach(function(item) {
+            if (!json) {
+                item.resolve(data);
+            } else if (typeof data[item.key] === 'string') {
+                item.resolve(data[item.key]);
+            } else {
+                item.reject(new Error('Missing fragment ' + item.key));
+            }
+        });
+    }, function(error) {
+        items.forEach(function(item) {
+            item.reject(error);
+        });
+    });
+};
+
+// Send the requests waiting in the batch, combining the ones for
+// different paginations of the same path.
+const flushBatch = function() {
+    const groups = [];
+    batch.forEach(function(item) {
+        if (item.signal.aborted) {
+            return;
+        }
+        const path = item.url.origin + item.url.pathname;
+        let group = groups.find(function(candidate) {
+            return candidate.path === path && !candidate.items.some(function(other) {
+                return other.key === item.key;
+            });
+        });
+        if (!group) {
+            group = {path: path, items: []};
+            groups.push(group);
+        }
+        group.items.push(item);
+    });
+    batch = [];
+    groups.forEach(function(group) {
+        sendBatch(group.items);
+    });
+};
+
+// Return a promise resolved with the fragment of the given context,
+// requested with the others queued in the same event loop turn.
+const queueRequest = function(context, signal) {
+    return new Promise(function(resolve, reject) {
+        signal.addEventListener('abort', function() {
+            reject(new DOMException('The request was aborted.', 'AbortError'));
+        });
+        if (!batch.length) {
+            setTimeout(flushBatch, 0);
+        }
+        batch.push({
+            key: context.key,
+            url: new URL(context.url, document.baseURI),
+            signal: signal,
+            resolve: resolve,
+            reject: reject
+        });
+    });
+};
+
+export function endlessPaginate(element, options) {
+    const root = element || document.body,
+        settings = Object.assign({}, defaults, options);
+
+    // Requests sent while prefetch is on, from the least recently used.
+    const cache = new Map(),
+        // Requests in progress.
+        pending = new Map();
+
+    let loadedPages = 1,
+        observer = null;
+    // Pages loaded when virtualization is on.
+    const pages = [];
+    // URLs of the pages being restored.
+    const restoring = [];
+
+    // Return a request object whose promise is resolved with the fragment
+    // of the given context. Requests for the same fragment are shared
+    // while in progress.
+    const getFragment = function(context) {
+        const cacheKey = getCacheKey(context);
+        let request = cache.get(cacheKey);
+        if (request) {
+            cache.delete(cacheKey);
+            cache.set(cacheKey, request);
+            return request;
+        }
+        request = pending.get(cacheKey);
+        if (request) {
+            return request;
+        }
+        const controller = new AbortController();
+        request = {cacheKey: cacheKey, controller: controller, done: false};
+        let promise;
+        if (settings.batchRequests) {
+            promise = queueRequest(context, controller.signal);
+        } else {
+            const url = new URL(context.url, document.baseURI);
+            url.searchParams.append('querystring_key', context.key);
+            promise = fetchUrl(url, controller.signal, false);
+        }
+        request.promise = promise.finally(function() {
+            request.done = true;
+            pending.delete(cacheKey);
+        });
+        pending.set(cacheKey, request);
+        if (settings.prefetch) {
+            cache.set(cacheKey, request);
+            if (cache.size > settings.prefetchCacheSize) {
+                cache.delete(cache.keys().next().value);
+            }
+            // Do not keep failed requests.
+            request.promise.catch(function() {
+                if (cache.get(cacheKey) === request) {
+                    cache.delete(cacheKey);
+                }
+            });
+        }
+        return request;
+    };
+
+    // Abort a superseded request, unless its response is kept in cache.
+    const cancel = function(request) {
+        if (request && !request.done && cache.get(request.cacheKey) !== request) {
+            request.controller.abort();
+        }
+    };
+
+    // Watch the current Twitter-style containers, if the
+    // IntersectionObserver is used. Observing a container again
+    // also checks its visibility right away.
+    const observeContainers = function() {
+        if (observer) {
+            observer.disconnect();
+            root.querySelectorAll(settings.containerSelector).forEach(function(container) {
+                observer.observe(container);
+            });
+        }
+    };
+
+    // Remove the pages far from the viewport and restore the ones
+    // getting close to it. All the positions are read before the DOM is
+    // changed, so that the layout is only computed once: placeholders have
+    // the height of the pages they replace, and so the positions do not
+    // change in the meantime.
+    const virtualizePages = function() {
+        const scrollY = window.scrollY,
+            top = scrollY - settings.virtualizeMargin,
+            bottom = scrollY + window.innerHeight + settings.virtualizeMargin,
+            changes = [];
+        pages.forEach(function(page) {
+            if (page.placeholder) {
+                const offset = getDocumentTop(page.placeholder);
+                if (offset + page.placeholder.offsetHeight >= top && offset <= bottom) {
+                    changes.push({page: page});
+                }
+                return;
+            }
+            const elements = page.nodes.filter(function(node) {
+                return node.nodeType === Node.ELEMENT_NODE;
+            });
+            if (!elements.length) {
+                return;
+            }
+            const first = elements[0],
+                last = elements[elements.length - 1],
+                pageTop = getDocumentTop(first),
+                pageBottom = last.getBoundingClientRect().bottom + scrollY;
+            if (pageBottom < top || pageTop > bottom) {
+                changes.push({
+                    page: page,
+                    tagName: first.tagName,
+                    height: pageBottom - pageTop
+                });
+            }
+        });
+        changes.forEach(function(change) {
+            const page = change.page;
+            if (page.placeholder) {
+                // Scripts are not run again.
+                page.nodes = parseFragment(page.html);
+                page.html = null;
+                page.placeholder.replaceWith(...page.nodes);
+                page.placeholder = null;
+                return;
+            }
+            // Use the same tag name so that table rows and list
+            // items can be replaced too.
+            page.placeholder = document.createElement(change.tagName);
+            page.placeholder.className = 'endless_placeholder';
+            page.placeholder.style.height = change.height + 'px';
+            page.nodes[0].before(page.placeholder);
+            // Detached pages are kept as HTML, which takes far less memory
+            // than DOM nodes.
+            page.html = serializeNodes(page.nodes);
+            page.nodes = null;
+        });
+    };
+
+    if (settings.virtualize) {
+        const onChange = throttle(virtualizePages, settings.paginateOnScrollThrottle);
+        window.addEventListener('scroll', onChange, {passive: true});
+        window.addEventListener('resize', onChange);
+    }
+
+    // Scroll back to the position saved in the browser history once
+    // all the pages are restored.
+    const restorePosition = function(url) {
+        const index = restoring.indexOf(url);
+        if (index !== -1) {
+            restoring.splice(index, 1);
+            const position = window.history.state.elPaginationScroll;
+            if (!restoring.length && position !== undefined) {
+                window.scrollTo(0, position);
+            }
+        }
+    };
+
+    // Load again, with a single request for each pagination, the
+    // pages displayed before leaving the page.
+    const restorePages = function() {
+        const saved = (window.history.state || {}).elPaginationPages || {},
+            links = [];
+        if ('scrollRestoration' in window.history) {
+            window.history.scrollRestoration = 'manual';
+        }
+        window.addEventListener('pagehide', function() {
+            updateHistory({elPaginationScroll: window.scrollY});
+        });
+        root.querySelectorAll(settings.moreSelector).forEach(function(link) {
+            const context = getContext(link),
+                span = getPageSpan(context);
+            let last = saved[context.key];
+            if (span && last >= span[0]) {
+                last = Math.min(last, span[0] + settings.maxPageSpan - 1);
+                link.setAttribute('href', setPageSpan(context.url, context.key, span[0], last));
+                restoring.push(link.getAttribute('href'));
+                links.push(link);
+            }
+        });
+        links.forEach(function(link) {
+            link.click();
+        });
+    };
+
+    // Fetch the next pages in advance, if prefetch is on.
+    const prefetchNext = function() {
+        if (settings.prefetch) {
+            requestIdle(function() {
+                const links = Array.from(root.querySelectorAll(settings.moreSelector)).concat(
+                    Array.from(root.querySelectorAll(settings.pagesSelector)).filter(function(link) {
+                        return link.relList.contains('next');
+                    }));
+                links.forEach(function(link) {
+                    getFragment(getContext(link));
+                });
+            });
+        }
+    };
+
+    // Twitter-style pagination.
+    const onMoreClick = function(link) {
+        const contentWrapper = settings.contentSelector ?
+                root.querySelector(settings.contentSelector) : null,
+            container = link.closest(settings.containerSelector),
+            loading = container.querySelector(settings.loadingSelector);
+        // Avoid multiple Ajax calls.
+        if (isVisible(loading) || container.elRequest) {
+            return;
+        }
+        link.style.display = 'none';
+        if (loading) {
+            loading.style.display = '';
+        }
+        const context = getContext(link);
+        // Fire onClick callback.
+        if (settings.onClick.apply(link, [context]) === false) {
+            return;
+        }
+        // Send the Ajax request.
+        const request = getFragment(context);
+        container.elRequest = request;
+        request.promise.then(function(fragment) {
+            container.elRequest = null;
+            // Increase the number of loaded pages.
+            const span = getPageSpan(context);
+            loadedPages += span ? span[1] - span[0] + 1 : 1;
+
+            const nodes = parseFragment(fragment);
+            if (settings.virtualize) {
+                // Keep track of the page nodes, but not of the
+                // container of the next page.
+                pages.push({
+                    nodes: nodes.filter(function(node) {
+                        return !matches(node, settings.containerSelector);
+                    }),
+                    html: null,
+                    placeholder: null
+                });
+            }
+
+            const insert = function(chunk) {
+                if (!contentWrapper) {
+                    container.before(...chunk);
+                } else {
+                    contentWrapper.append(...chunk);
+                }
+                runScripts(chunk);
+            };
+            const isActive = function() {
+                return true;
+            };
+            insertNodes(nodes, settings.insertBudget, insert, isActive, function() {
+                if (!contentWrapper) {
+                    // Replace pagination container (the default behavior)
+                    container.remove();
+                } else {
+                    // Increment link
+                    const nextPage = 'page=' + (loadedPages + 1);
+                    link.setAttribute('href', link.getAttribute('href').replace(/page=\d+(-\d+)?/, nextPage));
+                    link.style.display = '';
+                    if (loading) {
+                        loading.style.display = 'none';
+                    }
+                }
+                observeContainers();
+                prefetchNext();
+                if (settings.virtualize) {
+                    virtualizePages();
+                }
+                if (settings.restorePages && span) {
+                    const savedPages = Object.assign(
+                        {}, (window.history.state || {}).elPaginationPages);
+                    savedPages[context.key] = span[1];
+                    updateHistory({elPaginationPages: savedPages});
+                    restorePosition(context.url);
+                }
+
+                // Fire onCompleted callback.
+                settings.onCompleted.apply(link, [context, fragment.trim()]);
+            });
+        }, function(error) {
+            container.elRequest = null;
+            // Remove the container left if any
+            if (error.name !== 'AbortError') {
+                container.remove();
+            }
+        });
+    };
+
+    // Twitter-style pagination, loading the previous page.
+    const onPreviousClick = function(link) {
+        const contentWrapper = settings.contentSelector ?
+                root.querySelector(settings.contentSelector) : null,
+            container = link.closest(settings.previousContainerSelector),
+            loading = container.querySelector(settings.loadingSelector);
+        // Avoid multiple Ajax calls.
+        if (isVisible(loading) || container.elRequest) {
+            return;
+        }
+        link.style.display = 'none';
+        if (loading) {
+            loading.style.display = '';
+        }
+        const context = getContext(link);
+        // Fire onClick callback.
+        if (settings.onClick.apply(link, [context]) === false) {
+            return;
+        }
+        // Send the Ajax request.
+        const request = getFragment(context);
+        container.elRequest = request;
+        request.promise.then(function(fragment) {
+            container.elRequest = null;
+            // The link to the next page is already displayed.
+            const nodes = parseFragment(fragment).filter(function(node) {
+                return !matches(node, settings.containerSelector);
+            });
+            if (settings.virtualize) {
+                pages.unshift({
+                    nodes: nodes.filter(function(node) {
+                        return !matches(node, settings.previousContainerSelector);
+                    }),
+                    html: null,
+                    placeholder: null
+                });
+            }
+
+            // New content is inserted before the first displayed
+            // element, which is kept still in the viewport.
+            const anchor = contentWrapper ?
+                contentWrapper.firstElementChild : container.nextElementSibling;
+            const insert = function(chunk) {
+                keepAnchor(anchor, function() {
+                    if (!contentWrapper) {
+                        container.before(...chunk);
+                    } else if (anchor) {
+                        anchor.before(...chunk);
+                    } else {
+                        contentWrapper.append(...chunk);
+                    }
+                });
+                runScripts(chunk);
+            };
+            const isActive = function() {
+                return true;
+            };
+            insertNodes(nodes, settings.insertBudget, insert, isActive, function() {
+                const span = getPageSpan(context);
+                if (contentWrapper && span && span[0] > 1) {
+                    // Decrement link
+                    link.setAttribute('href', setPageSpan(
+                        context.url, context.key, span[0] - 1, span[0] - 1));
+                    link.style.display = '';
+                    if (loading) {
+                        loading.style.display = 'none';
+                    }
+                } else {
+                    // Replace pagination container (the default behavior)
+                    keepAnchor(anchor, function() {
+                        container.remove();
+                    });
+                }
+                if (settings.virtualize) {
+                    virtualizePages();
+                }
+
+                // Fire onCompleted callback.
+                settings.onCompleted.apply(link, [context, fragment.trim()]);
+            });
+        }, function(error) {
+            container.elRequest = null;
+            // Remove the container left if any
+            if (error.name !== 'AbortError') {
+                container.remove();
+            }
+        });
+    };
+
+    // Digg-style pagination.
+    const onPageClick = function(link) {
+        const context = getContext(link),
+            pageTemplate = link.closest(settings.pageSelector),
+            current = pageTemplate.elRequest;
+        // Ignore clicks on a page that is already being loaded.
+        if (current && current.cacheKey === getCacheKey(context)) {
+            return;
+        }
+        // Fire onClick callback.
+        if (settings.onClick.apply(link, [context]) === false) {
+            return;
+        }
+        // Cancel the request for the previously clicked page.
+        cancel(current);
+        // Send the Ajax request.
+        const request = getFragment(context);
+        pageTemplate.elRequest = request;
+        request.promise.then(function(fragment) {
+            // Discard responses of superseded requests.
+            if (pageTemplate.elRequest !== request) {
+                return;
+            }
+            pageTemplate.elRequest = null;
+            const insert = function(chunk) {
+                pageTemplate.append(...chunk);
+                runScripts(chunk);
+            };
+            // Stop inserting if another page is requested.
+            const isActive = function() {
+                return !pageTemplate.elRequest && pageTemplate.elInserting === request;
+            };
+            pageTemplate.elInserting = request;
+            pageTemplate.replaceChildren();
+            insertNodes(parseFragment(fragment), settings.insertBudget, insert, isActive, function() {
+                prefetchNext();
+                // Fire onCompleted callback.
+                settings.onCompleted.apply(link, [context, fragment.trim()]);
+            });
+        }, function() {
+            if (pageTemplate.elRequest === request) {
+                pageTemplate.elRequest = null;
+            }
+        });
+    };
+
+    root.addEventListener('click', function(event) {
+        const more = event.target.closest(settings.moreSelector),
+            previous = event.target.closest(settings.previousSelector),
+            page = event.target.closest(settings.pagesSelector);
+        if (more && root.contains(more)) {
+            onMoreClick(more);
+        } else if (previous && root.contains(previous)) {
+            onPreviousClick(previous);
+        } else if (page && root.contains(page)) {
+            onPageClick(page);
+        } else {
+            return;
+        }
+        event.preventDefault();
+        event.stopPropagation();
+    });
+
+    // On scroll pagination.
+    if (settings.paginateOnScroll) {
+        const paginateOnScroll = function() {
+            // Do not paginate on scroll if chunks are used and
+            // the current chunk is complete.
+            const chunkSize = settings.paginateOnScrollChunkSize;
+            root.querySelectorAll(settings.moreSelector).forEach(function(link) {
+                if (!chunkSize || loadedPages % chunkSize) {
+                    link.click();
+                } else {
+                    link.classList.add('endless_chunk_complete');
+                }
+            });
+        };
+        if (settings.paginateOnScrollObserver && 'IntersectionObserver' in window) {
+            let rootMargin = settings.paginateOnScrollRootMargin;
+            if (rootMargin === null) {
+                rootMargin = '0px 0px ' + settings.paginateOnScrollMargin + 'px 0px';
+            }
+            observer = new IntersectionObserver(function(entries) {
+                entries.forEach(function(entry) {
+                    if (entry.isIntersecting) {
+                        paginateOnScroll();
+                    }
+                });
+            }, {rootMargin: rootMargin});
+            observeContainers();
+        } else {
+            document.addEventListener('scroll', throttle(function() {
+                const height = document.documentElement.scrollHeight;
+                if (height - window.innerHeight -
+                    window.scrollY <= settings.paginateOnScrollMargin) {
+                    paginateOnScroll();
+                }
+            }, settings.paginateOnScrollThrottle), {passive: true});
+        }
+    }
+
+    if (settings.restorePages) {
+        restorePages();
+    }
+    prefetchNext();
+    return root;
+}
+
+export default endlessPaginate;
@@ -12,6 +12,10 @@
             moreSelector: 'a.endless_more',
             // Twitter-style pagination content wrapper selector.
             contentSelector: null,
+            // Twitter-style pagination previous page container selector.
+            previousContainerSelector: '.endless_previous_container',
+            // Twitter-style pagination previous page link selector.
+            previousSelector: 'a.endless_previous',
             // Digg-style pagination page template selector.
             pageSelector: '.endless_page_template',
             // Digg-style pagination link selector.
@@ -25,7 +29,45 @@
             // If paginate-on-scroll is on, this margin will be used.
             paginateOnScrollMargin : 1,
             // If paginate-on-scroll is on, it is possible to define chunks.
-            paginateOnScrollChunkSize: 0
+            paginateOnScrollChunkSize: 0,
+            // Set this to true to detect the end of the page watching the
+            // Twitter-style container with an IntersectionObserver.
+            // Browsers not supporting it use the scroll handler instead.
+            paginateOnScrollObserver: false,
+            // The IntersectionObserver root margin. If null, the bottom
+            // margin is set to paginateOnScrollMargin pixels.
+            paginateOnScrollRootMargin: null,
+            // Minimum delay (in milliseconds) between scroll checks.
+            paginateOnScrollThrottle: 100,
+            // Set this to true to prefetch the next page when the browser
+            // is idle, so that it is displayed without waiting for the
+            // network. Digg-style links are prefetched only if their
+            // rel attribute contains "next".
+            prefetch: false,
+            // Maximum number of fragments kept in memory when prefetch is on.
+            prefetchCacheSize: 10,
+            // Set this to true to detach Twitter-style pages scrolled far
+            // out of view, replacing them with placeholders of the same
+            // height. Pages are restored when they get close to the viewport.
+            virtualize: false,
+            // Distance (in pixels) from the viewport beyond which pages
+            // are detached.
+            virtualizeMargin: 2000,
+            // If set, new pages are inserted in chunks, spending at most
+            // this number of milliseconds per animation frame.
+            insertBudget: 0,
+            // Set this to true to load again the Twitter-style pages, and
+            // to restore the scroll position, when the user comes back to
+            // the page using the browser history.
+            restorePages: false,
+            // Maximum number of pages restored with a single request.
+            // It must not exceed EL_PAGINATION_MAX_PAGE_SPAN.
+            maxPageSpan: 20,
+            // Set this to true to combine the requests for pages of
+            // different paginations sent at the same time (e.g. when pages
+            // are restored or prefetched) in a single request. The view
+            // must be decorated with page_templates.
+            batchRequests: false
         },
             settings = $.extend(defaults, options);
 
@@ -36,9 +78,425 @@
             };
         };
 
+        var escapeRegExp = function(text) {
+            return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+        };
+
+        // Return the [first, last] page numbers requested by the context,
+        // or null if its URL does not include a page number.
+        var getPageSpan = function(context) {
+            var match = new RegExp(
+                '[?&]' + escapeRegExp(context.key) + '=(\\d+)(?:-(\\d+))?(?:&|#|$)'
+            ).exec(context.url);
+            if (!match) {
+                return null;
+            }
+            return [parseInt(match[1], 10), parseInt(match[2] || match[1], 10)];
+        };
+
+        // Return the URL requesting the pages from first to last.
+        var setPageSpan = function(url, key, first, last) {
+            var value = last > first ? first + '-' + last : first;
+            return url.replace(
+                new RegExp('([?&]' + escapeRegExp(key) + '=)\\d+(-\\d+)?'), '$1' + value);
+        };
+
+        // Store the given data in the current browser history entry.
+        var updateHistory = function(data) {
+            window.history.replaceState($.extend({}, window.history.state, data), '');
+        };
+
+        var requestIdle = window.requestIdleCallback || function(callback) {
+            return setTimeout(callback, 1);
+        };
+
+        // Requests sent while prefetch is on, from the least recently used.
+        var cache = new Map(),
+            // Requests in progress.
+            pending = new Map();
+
+        var getCacheKey = function(context) {
+            return context.key + ' ' + context.url;
+        };
+
+        // Requests waiting to be sent when batchRequests is on.
+        var batch = [];
+
+        // Return the name of the given querystring parameter.
+        var getParamName = function(param) {
+            return decodeURIComponent(param.split('=')[0]);
+        };
+
+        // Send the given batched requests for the same path, using the
+        // page_templates batch protocol if there are several of them.
+        var sendBatch = function(path, items) {
+            var xhr,
+                params = {},
+                names = [],
+                keys = $.map(items, function(item) {
+                    return item.context.key;
+                });
+            // Each pagination uses the page number of its own URL.
+            $.each(items, function(index, item) {
+                $.each(item.params, function(i, param) {
+                    var name = getParamName(param);
+                    if ($.inArray(name, names) === -1) {
+                        names.push(name);
+                        params[name] = param;
+                    } else if (name === item.context.key) {
+                        params[name] = param;
+                    }
+                });
+            });
+            var query = $.map(names, function(name) {
+                return params[name];
+            });
+            if (items.length === 1) {
+                query.push('querystring_key=' + encodeURIComponent(keys[0]));
+                xhr = $.get(path + '?' + query.join('&'));
+            } else {
+                $.each(keys, function(index, key) {
+                    query.push('querystring_key=' + encodeURIComponent(key));
+                });
+                xhr = $.getJSON(path + '?' + query.join('&'));
+            }
+            $.each(items, function(index, item) {
+                item.xhr = xhr;
+                item.siblings = items;
+            });
+            xhr.done(function(data) {
+                $.each(items, function(index, item) {
+                    if (items.length === 1) {
+                        item.deferred.resolve(data);
+                    } else if (typeof data[item.context.key] === 'string') {
+                        item.deferred.resolve(data[item.context.key]);
+                    } else {
+                        item.deferred.reject(xhr, 'error', 'Missing fragment');
+                    }
+                });
+            }).fail(function(jqXHR, textStatus, error) {
+                $.each(items, function(index, item) {
+                    item.deferred.reject(jqXHR, textStatus, error);
+                });
+            });
+        };
+
+        // Send the requests waiting in the batch, combining the ones for
+        // different paginations of the same path.
+        var flushBatch = function() {
+            var groups = [];
+            $.each(batch, function(index, item) {
+                if (item.deferred.state() !== 'pending') {
+                    return;
+                }
+                var group = null;
+                $.each(groups, function(i, candidate) {
+                    if (candidate.path === item.path && !candidate.keys[item.context.key]) {
+                        group = candidate;
+                        return false;
+                    }
+                });
+                if (!group) {
+                    group = {path: item.path, keys: {}, items: []};
+                    groups.push(group);
+                }
+                group.keys[item.context.key] = true;
+                group.items.push(item);
+            });
+            batch = [];
+            $.each(groups, function(index, group) {
+                sendBatch(group.path, group.items);
+            });
+        };
+
+        // Return a promise resolved with the fragment of the given context,
+        // requested with the others queued in the same event loop turn.
+        // The promise can be aborted, like a jQuery request.
+        var queueRequest = function(context) {
+            var url = context.url.split('#')[0].split('?'),
+                item = {
+                    context: context,
+                    path: url[0],
+                    params: url[1] ? url[1].split('&') : [],
+                    deferred: $.Deferred()
+                };
+            if (!batch.length) {
+                setTimeout(flushBatch, 0);
+            }
+            batch.push(item);
+            return item.deferred.promise({
+                abort: function() {
+                    item.deferred.reject(item.xhr, 'abort');
+                    // The shared request is aborted if no one needs it.
+                    var needed = $.grep(item.siblings || [], function(sibling) {
+                        return sibling.deferred.state() === 'pending';
+                    });
+                    if (item.xhr && !needed.length) {
+                        item.xhr.abort();
+                    }
+                }
+            });
+        };
+
+        // Return a promise resolved with the fragment of the given context.
+        // Requests for the same fragment are shared while in progress.
+        var getFragment = function(context) {
+            var cacheKey = getCacheKey(context),
+                request = cache.get(cacheKey);
+            if (request) {
+                cache.delete(cacheKey);
+                cache.set(cacheKey, request);
+                return request;
+            }
+            request = pending.get(cacheKey);
+            if (request) {
+                return request;
+            }
+            if (settings.batchRequests) {
+                request = queueRequest(context);
+            } else {
+                request = $.get(context.url, 'querystring_key=' + context.key);
+            }
+            request.cacheKey = cacheKey;
+            pending.set(cacheKey, request);
+            request.always(function() {
+                pending.delete(cacheKey);
+            });
+            if (settings.prefetch) {
+                cache.set(cacheKey, request);
+                if (cache.size > settings.prefetchCacheSize) {
+                    cache.delete(cache.keys().next().value);
+                }
+                // Do not keep failed requests.
+                request.fail(function() {
+                    if (cache.get(cacheKey) === request) {
+                        cache.delete(cacheKey);
+                    }
+                });
+            }
+            return request;
+        };
+
+        // Abort a superseded request, unless its response is kept in cache.
+        var cancel = function(request) {
+            if (request && request.state() === 'pending' &&
+                cache.get(request.cacheKey) !== request) {
+                request.abort();
+            }
+        };
+
+        // Insert the nodes calling insert() with chunks of them, within
+        // settings.insertBudget milliseconds per animation frame.
+        // Insertion stops if isActive() returns false. Call done() when
+        // all the nodes are inserted.
+        var insertNodes = function(nodes, insert, isActive, done) {
+            if (!settings.insertBudget) {
+                insert(nodes);
+                done();
+                return;
+            }
+            var index = 0;
+            var step = function() {
+                if (!isActive()) {
+                    return;
+                }
+                var start = performance.now();
+                while (index < nodes.length &&
+                       performance.now() - start < settings.insertBudget) {
+                    insert(nodes.slice(index, index + 1));
+                    index += 1;
+                }
+                if (index < nodes.length) {
+                    window.requestAnimationFrame(step);
+                } else {
+                    done();
+                }
+            };
+            step();
+        };
+
+        // Call func(), which inserts content before the anchor element,
+        // keeping the anchor at the same position in the viewport.
+        var keepAnchor = function(anchor, func) {
+            var node = anchor.get(0);
+            if (!node) {
+                func();
+                return;
+            }
+            var top = node.getBoundingClientRect().top;
+            func();
+            window.scrollBy(0, node.getBoundingClientRect().top - top);
+        };
+
+        // Return the HTML of the given nodes, e.g. to keep the pages
+        // detached by the virtualize option as strings.
+        var serializeNodes = function(nodes) {
+            var holder = document.createElement('div');
+            nodes.each(function() {
+                holder.appendChild(this.cloneNode(true));
+            });
+            return holder.innerHTML;
+        };
+
+        var throttle = function(func, wait) {
+            var timeout = null,
+                previous = 0;
+            return function() {
+                var now = Date.now(),
+                    remaining = wait - (now - previous);
+                if (remaining <= 0) {
+                    clearTimeout(timeout);
+                    timeout = null;
+                    previous = now;
+                    func();
+                } else if (!timeout) {
+                    // Make sure the last scroll position is always checked.
+                    timeout = setTimeout(function() {
+                        timeout = null;
+                        previous = Date.now();
+                        func();
+                    }, remaining);
+                }
+            };
+        };
+
         return this.each(function() {
             var element = $(this),
-                loadedPages = 1;
+                win = $(window),
+                loadedPages = 1,
+                observer = null,
+                // URLs of the pages being restored.
+                restoring = [],
+                // Pages loaded when virtualization is on.
+                pages = [];
+
+            // Watch the current Twitter-style containers, if the
+            // IntersectionObserver is used. Observing a container again
+            // also checks its visibility right away.
+            var observeContainers = function() {
+                if (observer) {
+                    observer.disconnect();
+                    element.find(settings.containerSelector).each(function() {
+                        observer.observe(this);
+                    });
+                }
+            };
+
+            // Remove the pages far from the viewport and restore the ones
+            // getting close to it. All the positions are read before the
+            // DOM is changed, so that the layout is only computed once:
+            // placeholders have the height of the pages they replace, and
+            // so the positions do not change in the meantime.
+            var virtualizePages = function() {
+                var scrollTop = win.scrollTop(),
+                    top = scrollTop - settings.virtualizeMargin,
+                    bottom = scrollTop + win.height() + settings.virtualizeMargin,
+                    changes = [];
+                $.each(pages, function(index, page) {
+                    if (page.placeholder) {
+                        var offset = page.placeholder.offset().top;
+                        if (offset + page.placeholder.outerHeight() >= top && offset <= bottom) {
+                            changes.push({page: page});
+                        }
+                        return;
+                    }
+                    var elements = page.nodes.filter('*');
+                    if (!elements.length) {
+                        return;
+                    }
+                    var first = elements.first(),
+                        last = elements.last(),
+                        pageTop = first.offset().top,
+                        pageBottom = last.offset().top + last.outerHeight(true);
+                    if (pageBottom < top || pageTop > bottom) {
+                        changes.push({
+                            page: page,
+                            tagName: first.prop('tagName'),
+                            height: pageBottom - pageTop
+                        });
+                    }
+                });
+                $.each(changes, function(index, change) {
+                    var page = change.page;
+                    if (page.placeholder) {
+                        // Scripts are not run again.
+                        page.nodes = $($.parseHTML(page.html, document));
+                        page.html = null;
+                        page.placeholder.replaceWith(page.nodes);
+                        page.placeholder = null;
+                        return;
+                    }
+                    // Use the same tag name so that table rows and list
+                    // items can be replaced too.
+                    page.placeholder = $(document.createElement(change.tagName))
+                        .addClass('endless_placeholder')
+                        .css('height', change.height);
+                    page.nodes.first().before(page.placeholder);
+                    // Detached pages are kept as HTML, which takes far less
+                    // memory than DOM nodes.
+                    page.html = serializeNodes(page.nodes);
+                    page.nodes.remove();
+                    page.nodes = null;
+                });
+            };
+
+            if (settings.virtualize) {
+                win.on('scroll resize', throttle(virtualizePages, settings.paginateOnScrollThrottle));
+            }
+
+            // Scroll back to the position saved in the browser history once
+            // all the pages are restored.
+            var restorePosition = function(url) {
+                var index = $.inArray(url, restoring);
+                if (index !== -1) {
+                    restoring.splice(index, 1);
+                    var position = window.history.state.elPaginationScroll;
+                    if (!restoring.length && position !== undefined) {
+                        win.scrollTop(position);
+                    }
+                }
+            };
+
+            // Load again, with a single request for each pagination, the
+            // pages displayed before leaving the page.
+            var restorePages = function() {
+                var saved = (window.history.state || {}).elPaginationPages || {},
+                    links = [];
+                if ('scrollRestoration' in window.history) {
+                    window.history.scrollRestoration = 'manual';
+                }
+                win.on('pagehide', function() {
+                    updateHistory({elPaginationScroll: win.scrollTop()});
+                });
+                element.find(settings.moreSelector).each(function() {
+                    var link = $(this),
+                        context = getContext(link),
+                        span = getPageSpan(context),
+                        last = saved[context.key];
+                    if (span && last >= span[0]) {
+                        last = Math.min(last, span[0] + settings.maxPageSpan - 1);
+                        link.attr('href', setPageSpan(context.url, context.key, span[0], last));
+                        restoring.push(link.attr('href'));
+                        links.push(link);
+                    }
+                });
+                $.each(links, function(index, link) {
+                    link.trigger('click');
+                });
+            };
+
+            // Fetch the next pages in advance, if prefetch is on.
+            var prefetchNext = function() {
+                if (settings.prefetch) {
+                    requestIdle(function() {
+                        var links = element.find(settings.moreSelector).add(
+                            element.find(settings.pagesSelector).filter('[rel~="next"]'));
+                        links.each(function() {
+                            getFragment(getContext($(this)));
+                        });
+                    });
+                }
+            };
 
             // Twitter-style pagination.
             element.on('click', settings.moreSelector, function() {
@@ -48,7 +506,7 @@
                     container = link.closest(settings.containerSelector),
                     loading = container.find(settings.loadingSelector);
                 // Avoid multiple Ajax calls.
-                if (loading.is(':visible')) {
+                if (loading.is(':visible') || container.data('el-request')) {
                     return false;
                 }
                 link.hide();
@@ -56,31 +514,155 @@
                 var context = getContext(link);
                 // Fire onClick callback.
                 if (settings.onClick.apply(html_link, [context]) !== false) {
-                    var data = 'querystring_key=' + context.key;
                     // Send the Ajax request.
-                    $.get(context.url, data, function (fragment) {
+                    var request = getFragment(context);
+                    container.data('el-request', request);
+                    request.always(function() {
+                        container.removeData('el-request');
+                    }).done(function (fragment) {
                         // Increase the number of loaded pages.
-                        loadedPages += 1;
+                        var span = getPageSpan(context);
+                        loadedPages += span ? span[1] - span[0] + 1 : 1;
 
-                        if (!content_wrapper.length) {
-                            // Replace pagination container (the default behavior)
-                            container.before(fragment);
-                            container.remove();
-                        } else {
-                            // Insert the content in the specified wrapper and increment link
-                            content_wrapper.append(fragment);
-                            var nextPage = 'page=' + (loadedPages + 1);
-                            link.attr('href', link.attr('href').replace(/page=\d+/, nextPage));
-                            link.show();
-                            loading.hide();
+                        var nodes = fragment;
+                        if (settings.virtualize || settings.insertBudget) {
+                            nodes = $($.parseHTML(fragment, document, true));
                         }
+                        if (settings.virtualize) {
+                            // Keep track of the page nodes, but not of the
+                            // container of the next page.
+                            pages.push({
+                                nodes: nodes.not(settings.containerSelector),
+                                html: null,
+                                placeholder: null
+                            });
+                        }
+
+                        var insert = function(chunk) {
+                            if (!content_wrapper.length) {
+                                container.before(chunk);
+                            } else {
+                                content_wrapper.append(chunk);
+                            }
+                        };
+                        var isActive = function() {
+                            return true;
+                        };
+                        insertNodes(nodes, insert, isActive, function() {
+                            if (!content_wrapper.length) {
+                                // Replace pagination container (the default behavior)
+                                container.remove();
+                            } else {
+                                // Increment link
+                                var nextPage = 'page=' + (loadedPages + 1);
+                                link.attr('href', link.attr('href').replace(/page=\d+(-\d+)?/, nextPage));
+                                link.show();
+                                loading.hide();
+                            }
+                            observeContainers();
+                            prefetchNext();
+                            if (settings.virtualize) {
+                                virtualizePages();
+                            }
+                            if (settings.restorePages && span) {
+                                var savedPages = $.extend({}, (window.history.state || {}).elPaginationPages);
+                                savedPages[context.key] = span[1];
+                                updateHistory({elPaginationPages: savedPages});
+                                restorePosition(context.url);
+                            }
 
-                        // Fire onCompleted callback.
-                        settings.onCompleted.apply(
-                            html_link, [context, $.trim(fragment)]);
+                            // Fire onCompleted callback.
+                            settings.onCompleted.apply(
+                                html_link, [context, $.trim(fragment)]);
+                        });
                     }).fail(function (xhr, textStatus, error) {
                         // Remove the container left if any
-                        container.remove();
+                        if (textStatus !== 'abort') {
+                            container.remove();
+                        }
+                    });
+                }
+                return false;
+            });
+
+            // Twitter-style pagination, loading the previous page.
+            element.on('click', settings.previousSelector, function() {
+                var link = $(this),
+                    html_link = link.get(0),
+                    content_wrapper = element.find(settings.contentSelector),
+                    container = link.closest(settings.previousContainerSelector),
+                    loading = container.find(settings.loadingSelector);
+                // Avoid multiple Ajax calls.
+                if (loading.is(':visible') || container.data('el-request')) {
+                    return false;
+                }
+                link.hide();
+                loading.show();
+                var context = getContext(link);
+                // Fire onClick callback.
+                if (settings.onClick.apply(html_link, [context]) !== false) {
+                    // Send the Ajax request.
+                    var request = getFragment(context);
+                    container.data('el-request', request);
+                    request.always(function() {
+                        container.removeData('el-request');
+                    }).done(function(fragment) {
+                        // The link to the next page is already displayed.
+                        var nodes = $($.parseHTML(fragment, document, true)).not(
+                            settings.containerSelector);
+                        if (settings.virtualize) {
+                            pages.unshift({
+                                nodes: nodes.not(settings.previousContainerSelector),
+                                html: null,
+                                placeholder: null
+                            });
+                        }
+
+                        // New content is inserted before the first displayed
+                        // element, which is kept still in the viewport.
+                        var anchor = content_wrapper.length ?
+                            content_wrapper.children().first() : container.nextAll().first();
+                        var insert = function(chunk) {
+                            keepAnchor(anchor, function() {
+                                if (!content_wrapper.length) {
+                                    container.before(chunk);
+                                } else if (anchor.length) {
+                                    anchor.before(chunk);
+                                } else {
+                                    content_wrapper.append(chunk);
+                                }
+                            });
+                        };
+                        var isActive = function() {
+                            return true;
+                        };
+                        insertNodes(nodes, insert, isActive, function() {
+                            var span = getPageSpan(context);
+                            if (content_wrapper.length && span && span[0] > 1) {
+                                // Decrement link
+                                link.attr('href', setPageSpan(
+                                    context.url, context.key, span[0] - 1, span[0] - 1));
+                                link.show();
+                                loading.hide();
+                            } else {
+                                // Replace pagination container (the default behavior)
+                                keepAnchor(anchor, function() {
+                                    container.remove();
+                                });
+                            }
+                            if (settings.virtualize) {
+                                virtualizePages();
+                            }
+
+                            // Fire onCompleted callback.
+                            settings.onCompleted.apply(
+                                html_link, [context, $.trim(fragment)]);
+                        });
+                    }).fail(function(xhr, textStatus) {
+                        // Remove the container left if any
+                        if (textStatus !== 'abort') {
+                            container.remove();
+                        }
                     });
                 }
                 return false;
@@ -88,41 +670,97 @@
 
             // On scroll pagination.
             if (settings.paginateOnScroll) {
-                var win = $(window),
-                    doc = $(document);
-                doc.on('scroll', function () {
-                    if (doc.height() - win.height() -
-                        win.scrollTop() <= settings.paginateOnScrollMargin) {
-                        // Do not paginate on scroll if chunks are used and
-                        // the current chunk is complete.
-                        var chunckSize = settings.paginateOnScrollChunkSize;
-                        if (!chunckSize || loadedPages % chunckSize) {
-                            element.find(settings.moreSelector).trigger('click');
-                        } else {
-                            element.find(settings.moreSelector).addClass('endless_chunk_complete');
-                        }
+                var paginateOnScroll = function() {
+                    // Do not paginate on scroll if chunks are used and
+                    // the current chunk is complete.
+                    var chunckSize = settings.paginateOnScrollChunkSize;
+                    if (!chunckSize || loadedPages % chunckSize) {
+                        element.find(settings.moreSelector).trigger('click');
+                    } else {
+                        element.find(settings.moreSelector).addClass('endless_chunk_complete');
                     }
-                });
+                };
+                if (settings.paginateOnScrollObserver && 'IntersectionObserver' in window) {
+                    var rootMargin = settings.paginateOnScrollRootMargin;
+                    if (rootMargin === null) {
+                        rootMargin = '0px 0px ' + settings.paginateOnScrollMargin + 'px 0px';
+                    }
+                    observer = new IntersectionObserver(function(entries) {
+                        $.each(entries, function(index, entry) {
+                            if (entry.isIntersecting) {
+                                paginateOnScroll();
+                            }
+                        });
+                    }, {rootMargin: rootMargin});
+                    observeContainers();
+                } else {
+                    var doc = $(document);
+                    doc.on('scroll', throttle(function() {
+                        if (doc.height() - win.height() -
+                            win.scrollTop() <= settings.paginateOnScrollMargin) {
+                            paginateOnScroll();
+                        }
+                    }, settings.paginateOnScrollThrottle));
+                }
             }
 
             // Digg-style pagination.
             element.on('click', settings.pagesSelector, function() {
                 var link = $(this),
                     html_link = link.get(0),
-                    context = getContext(link);
+                    context = getContext(link),
+                    page_template = link.closest(settings.pageSelector),
+                    current = page_template.data('el-request');
+                // Ignore clicks on a page that is already being loaded.
+                if (current && current.cacheKey === getCacheKey(context)) {
+                    return false;
+                }
                 // Fire onClick callback.
                 if (settings.onClick.apply(html_link, [context]) !== false) {
-                    var page_template = link.closest(settings.pageSelector),
-                        data = 'querystring_key=' + context.key;
+                    // Cancel the request for the previously clicked page.
+                    cancel(current);
                     // Send the Ajax request.
-                    page_template.load(context.url, data, function(fragment) {
-                        // Fire onCompleted callback.
-                        settings.onCompleted.apply(
-                            html_link, [context, $.trim(fragment)]);
+                    var request = getFragment(context);
+                    page_template.data('el-request', request);
+                    request.done(function(fragment) {
+                        // Discard responses of superseded requests.
+                        if (page_template.data('el-request') !== request) {
+                            return;
+                        }
+                        var insert = function(chunk) {
+                            page_template.append(chunk);
+                        };
+                        // Stop inserting if another page is requested.
+                        var isActive = function() {
+                            var current = page_template.data('el-request');
+                            return (!current || current === request) &&
+                                page_template.data('el-inserting') === request;
+                        };
+                        var nodes = fragment;
+                        if (settings.insertBudget) {
+                            nodes = $($.parseHTML(fragment, document, true));
+                        }
+                        page_template.data('el-inserting', request);
+                        page_template.empty();
+                        insertNodes(nodes, insert, isActive, function() {
+                            prefetchNext();
+                            // Fire onCompleted callback.
+                            settings.onCompleted.apply(
+                                html_link, [context, $.trim(fragment)]);
+                        });
+                    }).always(function() {
+                        if (page_template.data('el-request') === request) {
+                            page_template.removeData('el-request');
+                        }
                     });
                 }
                 return false;
             });
+
+            if (settings.restorePages) {
+                restorePages();
+            }
+            prefetchNext();
         });
     };
 
@@ -3,11 +3,14 @@
 import re
 
 from django import template
-from django.http import Http404
 from django.utils.encoding import force_str, iri_to_uri
 
 from el_pagination import models, settings, utils
-from el_pagination.paginators import DefaultPaginator, EmptyPage, LazyPaginator
+from el_pagination.paginators import (
+    DefaultPaginator,
+    LazyPaginator,
+    SnapshotPaginator,
+)
 
 register = template.Library()
 
@@ -17,9 +20,14 @@ PAGINATE_EXPRESSION = re.compile(
     r"""
     ^   # Beginning of line.
     (((?P<first_page>\w+)\,)?(?P<per_page>\w+(\.\w+)?)\s+)?  # First page, per page.
-    (?P<objects>[\.\w]+)  # Objects / queryset.
+    (?P<objects>(?!count(\s|$))[\.\w]+)  # Objects / queryset.
+    (?P<count_clause>\s+count  # Count source and database.
+        (\s+(?!on\s)(?P<count>[\.\w]+))?
+        (\s+on\s+(?P<count_database>[\"\'\-\w]+))?
+    )?
     (\s+starting\s+from\s+page\s+(?P<number>[\-]?\d+|\w+))?  # Page start.
     (\s+using\s+(?P<key>[\"\'\-\w]+))?  # Querystring key.
+    (\s+with\s+paginator\s+(?P<paginator>[\"\'\.\w]+))?  # Paginator class.
     (\s+with\s+(?P<override_path>[\"\'\/\w]+))?  # Override path.
     (\s+as\s+(?P<var_name>\w+))?  # Context variable name.
     $   # End of line.
@@ -140,6 +148,33 @@ def paginate(parser, token, paginator_class=None):
 
         {% paginate 20 entries with "/mypage/" %}
 
+    The paginator class is taken from settings, but you can override it
+    locally, passing the dotted path to a class (see
+    *el_pagination.paginators.BasePaginator* for the methods required), e.g.:
+
+    .. code-block:: html+django
+
+        {% paginate 20 entries with paginator "myapp.paginators.MyPaginator" %}
+
+    The paginator can also be a context variable, holding a dotted path or a
+    class (with a true *do_not_call_in_templates* attribute). If both the
+    paginator and the path are passed, the paginator comes first.
+
+    The number of entries can be retrieved from another source, e.g. a
+    lighter queryset without the annotations and joins only needed to
+    display the entries, or a precomputed number:
+
+    .. code-block:: html+django
+
+        {% paginate entries count entries_count %}
+
+    The entries can also be counted using another database, e.g. a read
+    replica, while the entries of the page are retrieved as usual:
+
+    .. code-block:: html+django
+
+        {% paginate entries count on "replica" %}
+
     If you want the first page to contain a different number of items than
     subsequent pages, you can separate the two values with a comma, e.g. if
     you want 3 items on the first page and 10 on other pages:
@@ -148,6 +183,10 @@ def paginate(parser, token, paginator_class=None):
 
     {% paginate 3,10 entries %}
 
+    A range of pages can be requested in the querystring, e.g.
+    ``?page=3-7``: in this case the objects of all the pages are retrieved
+    with a single query, and the ``show_more`` link points to page 8.
+
     You must use this tag before calling the {% show_more %} one.
     """
     # Validate arguments.
@@ -180,6 +219,11 @@ def paginate(parser, token, paginator_class=None):
         ) % {'tag': tag_name, 'objects': objects}
         raise template.TemplateSyntaxError(msg)
 
+    # The count argument requires a count source or a database.
+    if kwargs.pop('count_clause') and not (kwargs['count'] or kwargs['count_database']):
+        msg = f'{tag_name!r} tag requires a count source or a database after `count`'
+        raise template.TemplateSyntaxError(msg)
+
     # Call the node.
     return PaginateNode(paginator_class, objects, **kwargs)
 
@@ -196,6 +240,19 @@ def lazy_paginate(parser, token):
     return paginate(parser, token, paginator_class=LazyPaginator)
 
 
+@register.tag
+def snapshot_paginate(parser, token):
+    """Paginate a snapshot of the objects.
+
+    The ordered primary keys of the objects are retrieved once and stored
+    in the cache, so that the objects are not sorted again for each page.
+
+    Use this the same way as *paginate* tag when sorting the objects is
+    expensive, e.g. for search results.
+    """
+    return paginate(parser, token, paginator_class=SnapshotPaginator)
+
+
 class PaginateNode(template.Node):
     """Add to context the objects of the current page.
 
@@ -212,9 +269,40 @@ class PaginateNode(template.Node):
         number=None,
         key=None,
         override_path=None,
+        paginator=None,
+        count=None,
+        count_database=None,
     ):
-        self.paginator = paginator_class or DefaultPaginator
+        # The paginator passed to the tag takes precedence over the class
+        # given by the tag function, which takes precedence over settings.
+        self.paginator_variable = None
+        if paginator is None:
+            self.paginator = utils.get_paginator_class(paginator_class)
+        elif paginator[0] in ('"', "'") and paginator[-1] == paginator[0]:
+            self.paginator = utils.get_paginator_class(paginator[1:-1])
+        else:
+            self.paginator_variable = template.Variable(paginator)
         self.objects = template.Variable(objects)
+        self.count = None if count is None else template.Variable(count)
+
+        # Only the default paginator and its subclasses accept count arguments.
+        if (count is not None or count_database is not None) and not (
+            self.paginator_variable is not None
+            or issubclass(self.paginator, DefaultPaginator)
+        ):
+            msg = f'{self.paginator.__name__} does not support the `count` argument'
+            raise template.TemplateSyntaxError(msg)
+
+        # Set the database alias used to count the objects.
+        self.count_database_variable = None
+        if count_database is None:
+            self.count_database = None
+        elif (
+            count_database[0] in ('"', "'") and count_database[-1] == count_database[0]
+        ):
+            self.count_database = count_database[1:-1]
+        else:
+            self.count_database_variable = template.Variable(count_database)
 
         # If *var_name* is not passed, then the queryset name will be used.
         self.var_name = objects if var_name is None else var_name
@@ -301,30 +389,48 @@ class PaginateNode(template.Node):
         else:
             override_path = self.override_path_variable.resolve(context)
 
-        # Retrieve the queryset and create the paginator object.
-        objects = self.objects.resolve(context)
-        paginator = self.paginator(
-            objects, per_page, first_page=first_page, orphans=settings.ORPHANS
-        )
-
-        # Normalize the default page number if a negative one is provided.
-        if default_number < 0:
-            default_number = utils.normalize_page_number(
-                default_number, paginator.page_range
+        # Retrieve the paginator class if passed as a context variable.
+        if self.paginator_variable is None:
+            paginator_class = self.paginator
+        else:
+            paginator_class = utils.get_paginator_class(
+                self.paginator_variable.resolve(context)
             )
 
-        # The current request is used to get the requested page number.
-        page_number = utils.get_page_number_from_request(
-            context['request'], querystring_key, default=default_number
+        # Retrieve the queryset and the page, unless it was already
+        # evaluated before rendering (see *PaginationPlan*).
+        objects = self.objects.resolve(context)
+        request = context['request']
+        prepared = utils.get_prepared_page(
+            request,
+            objects,
+            paginator_class,
+            per_page,
+            first_page,
+            querystring_key=querystring_key,
+            default_number=default_number,
         )
-
-        # Get the page.
-        try:
-            page = paginator.page(page_number)
-        except EmptyPage:
-            page = paginator.page(1)
-            if settings.PAGE_OUT_OF_RANGE_404:
-                raise Http404('Page out of range')  # pylint: disable=raise-missing-from
+        if prepared is None:
+            kwargs = {'first_page': first_page, 'orphans': settings.ORPHANS}
+            # Only paginators supporting them are passed count arguments.
+            if self.count is not None:
+                kwargs['count'] = self.count.resolve(context)
+            if self.count_database_variable is not None:
+                kwargs['count_database'] = self.count_database_variable.resolve(context)
+            elif self.count_database is not None:
+                kwargs['count_database'] = self.count_database
+            if issubclass(paginator_class, SnapshotPaginator):
+                kwargs['snapshot'] = utils.get_snapshot_token(request, querystring_key)
+            paginator = paginator_class(objects, per_page, **kwargs)
+            page, default_number = utils.get_page_from_request(
+                request, paginator, querystring_key, default_number=default_number
+            )
+        else:
+            page, default_number = prepared
+        # Links to other pages carry the snapshot token, if any.
+        if isinstance(page.paginator, SnapshotPaginator) and page.paginator.snapshot:
+            state = utils.get_pagination_state(request)
+            state.snapshots[querystring_key] = page.paginator.snapshot
 
         # Populate the context with required data.
         data = {
@@ -334,6 +440,7 @@ class PaginateNode(template.Node):
             'querystring_key': querystring_key,
         }
         context.update({'endless': data, self.var_name: page.object_list})
+        utils.add_pagination_to_request(context['request'], data)
         return ''
 
 
@@ -377,6 +484,9 @@ def show_more(context, label=None, loading=settings.LOADING, class_name=None):
             'loading': loading,
             'class_name': class_name,
             'path': iri_to_uri(data['override_path'] or request.path),
+            # The page template is only requested using its own URL if
+            # fragments are selected by URL, rather than by headers.
+            'prefetch': settings.PREFETCH_HINTS and settings.FRAGMENTS_BY_URL,
             'querystring': querystring,
             'querystring_key': querystring_key,
             'request': request,
@@ -402,6 +512,50 @@ def show_more_table(context, label=None, loading=settings.LOADING):
     return show_more(context, label, loading)
 
 
+@register.inclusion_tag('el_pagination/show_previous.html', takes_context=True)
+def show_previous(context, label=None, loading=settings.LOADING, class_name=None):
+    """Show the link to get the previous page in a Twitter-like pagination.
+
+    Usage::
+
+        {% show_previous %}
+
+    This is useful when the pagination is entered at a page other than the
+    first one, e.g. following a deep link: earlier pages can then be loaded
+    on demand, and are prepended to the current one by the JavaScript.
+    The label, the loading text and the extra CSS style class name can be
+    overridden, as in ``{% show_more %}``::
+
+        {% show_previous "newer" "working" "class_name" %}
+
+    Must be called after ``{% paginate objects %}``.
+    """
+    # This template tag could raise a PaginationError: you have to call
+    # *paginate* or *lazy_paginate* before including the template.
+    data = utils.get_data_from_context(context)
+    page = data['page']
+    # Show the template only if there is a previous page.
+    if page.has_previous():
+        request = context['request']
+        page_number = page.previous_page_number()
+        # Generate the querystring.
+        querystring_key = data['querystring_key']
+        querystring = utils.get_querystring_for_page(
+            request, page_number, querystring_key, default_number=data['default_number']
+        )
+        return {
+            'label': label,
+            'loading': loading,
+            'class_name': class_name,
+            'path': iri_to_uri(data['override_path'] or request.path),
+            'querystring': querystring,
+            'querystring_key': querystring_key,
+            'request': request,
+        }
+    # No previous page, nothing to see.
+    return {}
+
+
 @register.tag
 def get_pages(parser, token):
     """Add to context the list of page links.
@@ -717,7 +871,8 @@ class ShowCurrentNumberNode(template.Node):
             querystring_key = self.querystring_key_variable.resolve(context)
 
         # The request object is used to retrieve the current page number.
-        page_number = utils.get_page_number_from_request(
+        # If a range of pages is requested, the last one is used.
+        _, page_number = utils.get_page_span_from_request(
             context['request'], querystring_key, default=default_number
         )
 
@@ -145,6 +145,11 @@ class SeleniumTestCase(StaticLiveServerTestCase):
         link.click()
         return link
 
+    def click_links_at_once(self, *links):
+        """Click the given *links*, without waiting for the pages to load."""
+        script = 'for (var i = 0; i < arguments.length; i++) arguments[i].click();'
+        self.selenium.execute_script(script, *links)
+
     def scroll_down(self):
         """Scroll down to the bottom of the page."""
         script = 'window.scrollTo(0, document.body.scrollHeight);'
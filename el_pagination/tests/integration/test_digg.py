@@ -41,6 +41,15 @@ class DiggPaginationTest(SeleniumTestCase):
             with self.assertNewElements('object', range(11, 16)):
                 self.click_link(self.PREVIOUS)
 
+    def test_fast_clicks(self):
+        # Ensure only the last clicked page is displayed when a link is
+        # clicked before the previous page is loaded.
+        self.get()
+        find = self.selenium.find_elements_by_link_text
+        with self.assertSameURL():
+            with self.assertNewElements('object', range(11, 16)):
+                self.click_links_at_once(find('2')[0], find('3')[0])
+
     def test_no_previous_link_in_first_page(self):
         # Ensure there is no previous link on the first page.
         self.get()
@@ -0,0 +1,10 @@
+"""ES module Twitter-style pagination integration tests."""
+
+
+
+from el_pagination.tests.integration import test_twitter
+
+
+class EsmPaginationTest(test_twitter.TwitterPaginationTest):
+
+    view_name = 'esm'
@@ -0,0 +1,10 @@
+"""Twitter-style pagination with an insert budget integration tests."""
+
+
+
+from el_pagination.tests.integration import test_twitter
+
+
+class InsertBudgetPaginationTest(test_twitter.TwitterPaginationTest):
+
+    view_name = 'insert-budget'
@@ -0,0 +1,10 @@
+"""On scroll pagination using an IntersectionObserver integration tests."""
+
+
+
+from el_pagination.tests.integration import test_onscroll
+
+
+class ObserverPaginationTest(test_onscroll.OnScrollPaginationTest):
+
+    view_name = 'observer'
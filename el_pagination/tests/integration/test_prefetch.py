@@ -0,0 +1,31 @@
+"""Prefetch of the next page integration tests."""
+
+
+
+from el_pagination.tests.integration import test_twitter
+
+
+class PrefetchPaginationTest(test_twitter.TwitterPaginationTest):
+
+    view_name = 'prefetch'
+
+    def get_requests(self, page):
+        """Return the number of Ajax requests sent for the given *page*."""
+        script = """
+            var query = arguments[0];
+            return performance.getEntriesByType('resource').filter(
+                function(entry) {
+                    return entry.name.indexOf(query) !== -1;
+                }).length;
+        """
+        return self.selenium.execute_script(
+            script, f'page={page}&querystring_key=')
+
+    def test_next_page_prefetched(self):
+        # Ensure the next page is requested before the link is clicked, and
+        # is displayed without requesting it again.
+        self.get()
+        self.wait.until(lambda driver: self.get_requests(2) == 1)
+        with self.assertNewElements('object', range(1, 11)):
+            self.click_link(self.MORE)
+        self.assertEqual(1, self.get_requests(2))
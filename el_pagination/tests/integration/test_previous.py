@@ -0,0 +1,39 @@
+"""Show previous pagination integration tests."""
+
+
+
+from el_pagination.tests.integration import SeleniumTestCase
+
+
+class PreviousPaginationTest(SeleniumTestCase):
+
+    view_name = 'previous'
+    PREVIOUS = 'Previous results'
+
+    def test_previous_elements_loaded(self):
+        # Ensure the previous page is loaded on click.
+        self.get(page=3)
+        self.assertElements('object', range(11, 16))
+        with self.assertNewElements('object', range(6, 16)):
+            self.click_link(self.PREVIOUS)
+
+    def test_url_not_changed(self):
+        # Ensure the request is done using Ajax (the page does not refresh).
+        self.get(page=3)
+        with self.assertSameURL():
+            self.click_link(self.PREVIOUS)
+
+    def test_both_directions(self):
+        # Ensure previous and next pages can be loaded in any order.
+        self.get(page=3)
+        with self.assertNewElements('object', range(11, 21)):
+            self.click_link(self.MORE)
+        with self.assertNewElements('object', range(6, 21)):
+            self.click_link(self.PREVIOUS)
+
+    def test_no_previous_link_in_first_page(self):
+        # Ensure there is no previous link once the first page is loaded.
+        self.get(page=2)
+        with self.assertNewElements('object', range(1, 11)):
+            self.click_link(self.PREVIOUS)
+        self.asserLinksEqual(0, self.PREVIOUS)
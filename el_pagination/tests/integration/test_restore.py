@@ -0,0 +1,49 @@
+"""Restoration of Twitter-style pages integration tests."""
+
+
+
+from el_pagination.tests.integration import SeleniumTestCase
+
+
+class RestorePaginationTest(SeleniumTestCase):
+
+    view_name = 'restore'
+
+    def test_pages_restored(self):
+        # Ensure the pages loaded are displayed again after a reload.
+        self.get()
+        with self.assertNewElements('object', range(1, 16)):
+            self.click_link(self.MORE)
+            self.wait_ajax()
+            self.click_link(self.MORE)
+        with self.assertNewElements('object', range(1, 16)):
+            self.selenium.refresh()
+
+    def test_pages_restored_on_back(self):
+        # Ensure the pages loaded are displayed again when coming back
+        # using the browser history.
+        self.get()
+        with self.assertNewElements('object', range(1, 11)):
+            self.click_link(self.MORE)
+        self.get(self.live_server_url)
+        with self.assertNewElements('object', range(1, 11)):
+            self.selenium.back()
+
+    def test_next_page_after_restore(self):
+        # Ensure the pages following the restored ones can be loaded.
+        self.get()
+        with self.assertNewElements('object', range(1, 11)):
+            self.click_link(self.MORE)
+        self.selenium.refresh()
+        with self.assertNewElements('object', range(1, 16)):
+            self.wait_ajax()
+            self.click_link(self.MORE)
+
+    def test_pages_not_restored(self):
+        # Ensure only the first page is displayed when the page is visited
+        # again without using the browser history.
+        self.get()
+        with self.assertNewElements('object', range(1, 11)):
+            self.click_link(self.MORE)
+        with self.assertNewElements('object', range(1, 6)):
+            self.get()
@@ -42,6 +42,15 @@ class TwitterPaginationTest(SeleniumTestCase):
                 with self.assertNewElements('object', expected_range):
                     self.click_link(self.MORE)
 
+    def test_repeated_clicks(self):
+        # Ensure the next page is loaded once when the link is clicked again
+        # before the page is loaded.
+        self.get()
+        link = self.selenium.find_elements_by_link_text(self.MORE)[0]
+        with self.assertSameURL():
+            with self.assertNewElements('object', range(1, 11)):
+                self.click_links_at_once(link, link)
+
     def test_no_more_link_in_last_page(self):
         # Ensure there is no more link on the last page.
         self.get(page=10)
@@ -0,0 +1,56 @@
+"""Virtualization of Twitter-style pages integration tests."""
+
+
+
+from el_pagination.tests.integration import SeleniumTestCase
+
+
+class VirtualizePaginationTest(SeleniumTestCase):
+
+    view_name = 'virtualize'
+
+    def count_placeholders(self):
+        """Return the number of pages replaced by placeholders."""
+        selector = '.endless_placeholder'
+        return len(self.selenium.find_elements_by_css_selector(selector))
+
+    def scroll_up(self):
+        """Scroll up to the top of the page."""
+        self.selenium.execute_script('window.scrollTo(0, 0);')
+
+    def load_pages(self, first, last):
+        """Click the more link to display the pages *first* to *last*.
+
+        Pages may be detached in the meantime, so only the last object is
+        checked.
+        """
+        for page in range(first, last + 1):
+            self.click_link(self.MORE)
+            self.wait.until(
+                lambda driver, page=page:
+                self.get_current_elements('object')[-1] == 5 * page)
+
+    def test_pages_detached_and_restored(self):
+        # Ensure the pages far from the viewport are replaced by placeholders,
+        # and displayed again when scrolling back to them.
+        self.get()
+        self.load_pages(2, 8)
+        self.scroll_down()
+        self.wait.until(lambda driver: self.count_placeholders())
+        self.assertNotIn(6, self.get_current_elements('object'))
+        self.scroll_up()
+        self.wait.until(lambda driver: not self.count_placeholders())
+        self.assertElements('object', range(1, 41))
+
+    def test_next_page_after_restore(self):
+        # Ensure new pages are loaded after detached pages are restored.
+        self.get()
+        self.load_pages(2, 8)
+        self.scroll_down()
+        self.wait.until(lambda driver: self.count_placeholders())
+        self.scroll_up()
+        self.wait.until(lambda driver: not self.count_placeholders())
+        self.load_pages(9, 9)
+        self.scroll_up()
+        self.wait.until(lambda driver: not self.count_placeholders())
+        self.assertElements('object', range(1, 46))
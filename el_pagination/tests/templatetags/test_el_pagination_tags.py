@@ -7,6 +7,7 @@ import sys
 import unittest
 import xml.etree.ElementTree as etree
 
+from django.core.cache import caches
 from django.http import Http404
 from django.template import Context, Template, TemplateSyntaxError
 from django.template.context import make_context
@@ -16,6 +17,7 @@ from django.test.client import RequestFactory
 from el_pagination import settings
 from el_pagination.exceptions import PaginationError
 from el_pagination.models import PageList
+from el_pagination.paginators import LazyPaginator
 from project.models import make_model_instances
 
 skip_if_old_etree = unittest.skipIf(
@@ -189,6 +191,36 @@ class PaginateTestMixin(TemplateTagsTestMixin):
             self.request(), template, entries=range(47), path=path)
         self.assertEqual(path, context['endless']['override_path'])
 
+    def test_paginator_argument(self):
+        # Ensure the given paginator class is used.
+        template = (
+            '{% $tagname 10 objects '
+            'with paginator "el_pagination.paginators.LazyPaginator" %}')
+        _, context = self.render(self.request(), template)
+        paginator = context['endless']['page'].paginator
+        self.assertIsInstance(paginator, LazyPaginator)
+
+    def test_paginator_argument_as_variable(self):
+        # Ensure the paginator class can be provided as context variable.
+        template = '{% $tagname 10 objects with paginator paginator %}'
+        _, context = self.render(
+            self.request(), template, objects=range(47),
+            paginator=LazyPaginator)
+        paginator = context['endless']['page'].paginator
+        self.assertIsInstance(paginator, LazyPaginator)
+
+    def test_paginator_and_with_arguments(self):
+        # Ensure the paginator class and the override path can be combined.
+        template = (
+            '{% $tagname 10 objects with paginator paginator '
+            'with "/mypath/" %}')
+        _, context = self.render(
+            self.request(), template, objects=range(47),
+            paginator=LazyPaginator)
+        self.assertEqual('/mypath/', context['endless']['override_path'])
+        paginator = context['endless']['page'].paginator
+        self.assertIsInstance(paginator, LazyPaginator)
+
     def test_as_argument(self):
         # Ensure it is possible to change the resulting context variable.
         template = '{% $tagname 20 objects as object_list %}'
@@ -255,6 +287,19 @@ class PaginateTestMixin(TemplateTagsTestMixin):
             self.render(self.request(), template, manager=manager)
         self.assertIn('manager.all', str(cm.exception))
 
+    def test_page_span(self):
+        # Ensure a range of pages can be requested.
+        template = '{% $tagname 5 objects %}'
+        _, context = self.render(self.request(page='2-4'), template)
+        self.assertRangeEqual(range(5, 20), context['objects'])
+
+    def test_invalid_page_span(self):
+        # The default page is displayed if an invalid range is provided.
+        template = '{% $tagname 5 objects %}'
+        for page in ('4-2', '1-', '1-100', 'a-b'):
+            _, context = self.render(self.request(page=page), template)
+            self.assertRangeEqual(range(5), context['objects'])
+
     def test_multiple_pagination(self):
         # Ensure multiple pagination works correctly.
         letters = string.ascii_letters
@@ -275,8 +320,59 @@ class PaginateTestMixin(TemplateTagsTestMixin):
 
 class PaginateTest(PaginateTestMixin, TestCase):
 
+    databases = {'default', 'replica'}
     tagname = 'paginate'
 
+    def test_paginator_setting(self):
+        # Ensure the paginator class can be changed in settings.
+        path = 'el_pagination.paginators.LazyPaginator'
+        template = '{% $tagname 10 objects %}'
+        settings.PAGINATOR_CLASS = path
+        try:
+            _, context = self.render(self.request(), template)
+        finally:
+            settings.PAGINATOR_CLASS = None
+        paginator = context['endless']['page'].paginator
+        self.assertIsInstance(paginator, LazyPaginator)
+
+    def test_count_argument(self):
+        # Ensure the number of objects can be provided separately.
+        template = '{% $tagname 10 objects count objects_count %}'
+        _, context = self.render(
+            self.request(), template, objects=range(47), objects_count=100)
+        self.assertEqual(100, context['endless']['page'].paginator.count)
+
+    def test_count_database_argument(self):
+        # Ensure the objects can be counted using another database.
+        template = '{% $tagname 10 objects count on "replica" %}'
+        queryset = make_model_instances(5)
+        _, context = self.render(self.request(), template, objects=queryset)
+        self.assertEqual(0, context['endless']['page'].paginator.count)
+
+    def test_count_and_count_database_arguments(self):
+        # Ensure the count source can be counted using another database.
+        template = '{% $tagname 10 objects count counted on database %}'
+        queryset = make_model_instances(5)
+        _, context = self.render(
+            self.request(), template, objects=queryset, counted=queryset,
+            database='replica')
+        self.assertEqual(0, context['endless']['page'].paginator.count)
+
+    def test_missing_count_argument(self):
+        # Ensure an error is raised if the count source is missing.
+        for template in (
+            '{% $tagname objects count %}',
+            '{% $tagname 10 objects count as page_objects %}',
+        ):
+            with self.assertRaises(TemplateSyntaxError):
+                self.render(self.request(), template)
+
+    def test_num_queries_count_argument(self):
+        # Ensure a precomputed number of objects avoids the count query.
+        template = '{% $tagname 10 objects count 47 %}'
+        objects = self.assertPaginationNumQueries(1, template)
+        self.assertEqual(10, len(objects))
+
     def test_starting_from_last_page_argument(self):
         # Ensure the queryset reflects the given ``starting_from_page``
         # argument when the last page is requested.
@@ -321,6 +417,15 @@ class PaginateTest(PaginateTestMixin, TestCase):
         template = '{% $tagname 10 objects starting from page 3 %}'
         self.assertPaginationNumQueries(2, template)
 
+    def test_num_queries_page_span(self):
+        # Ensure a range of pages is retrieved using a single query.
+        queryset = make_model_instances(47)
+        with self.assertNumQueries(2):
+            _, context = self.render(
+                self.request(page='2-4'), '{% $tagname 10 objects %}',
+                objects=queryset)
+            self.assertEqual(30, len(context['objects']))
+
     def test_num_queries_starting_from_last_page(self):
         # Ensure paginating objects hits the database for the correct number
         # of times if pagination is performed starting from last page.
@@ -332,6 +437,16 @@ class LazyPaginateTest(PaginateTestMixin, TestCase):
 
     tagname = 'lazy_paginate'
 
+    def test_count_argument_raises_error(self):
+        # A *TemplateSyntaxError* is raised if the ``count`` argument is
+        # given to ``lazy_paginate``.
+        for template in (
+            '{% $tagname objects count 47 %}',
+            '{% $tagname objects count on "replica" %}',
+        ):
+            with self.assertRaises(TemplateSyntaxError):
+                self.render(self.request(), template)
+
     def test_starting_from_negative_page_raises_error(self):
         # A *NotImplementedError* is raised if a negative value is given to
         # the ``starting_from_page`` argument of ``lazy_paginate``.
@@ -353,6 +468,15 @@ class LazyPaginateTest(PaginateTestMixin, TestCase):
         template = '{% $tagname 10 objects starting from page 3 %}'
         self.assertPaginationNumQueries(1, template)
 
+    def test_num_queries_page_span(self):
+        # Ensure a range of pages is retrieved using a single query.
+        queryset = make_model_instances(47)
+        with self.assertNumQueries(1):
+            _, context = self.render(
+                self.request(page='2-4'), '{% $tagname 10 objects %}',
+                objects=queryset)
+            self.assertEqual(30, len(context['objects']))
+
 
 @skip_if_old_etree
 class ShowMoreTest(EtreeTemplateTagsTestMixin, TestCase):
@@ -380,6 +504,14 @@ class ShowMoreTest(EtreeTemplateTagsTestMixin, TestCase):
         expected = '/?{0}={1}'.format(settings.PAGE_LABEL, 4)
         self.assertEqual(expected, link.attrib['href'])
 
+    def test_page_span_next_url(self):
+        # Ensure the link points to the page following a range of pages.
+        template = '{% paginate objects %}{% $tagname %}'
+        tree = self.render(self.request(page='2-3'), template)
+        link = tree.find('.//a[@class="endless_more"]')
+        expected = '/?{0}={1}'.format(settings.PAGE_LABEL, 4)
+        self.assertEqual(expected, link.attrib['href'])
+
     def test_last_page(self):
         # Ensure the output for the last page is empty.
         template = '{% paginate 40 objects %}{% $tagname %}'
@@ -407,6 +539,186 @@ class ShowMoreTableTest(ShowMoreTest):
     tagname = 'show_more_table'
 
 
+@skip_if_old_etree
+class ShowPreviousTest(EtreeTemplateTagsTestMixin, TestCase):
+
+    def test_first_page(self):
+        # Ensure the output for the first page is empty.
+        template = '{% paginate objects %}{% show_previous %}'
+        tree = self.render(self.request(), template)
+        self.assertIsNone(tree)
+
+    def test_page_previous_url(self):
+        # Ensure the link to the previous page is correctly generated.
+        template = '{% paginate objects %}{% show_previous %}'
+        tree = self.render(self.request(page=3), template)
+        link = tree.find('.//a[@class="endless_previous"]')
+        expected = '/?{0}={1}'.format(settings.PAGE_LABEL, 2)
+        self.assertEqual(expected, link.attrib['href'])
+
+    def test_second_page_previous_url(self):
+        # Ensure the link to the default page does not include the page.
+        template = '{% paginate objects %}{% show_previous %}'
+        tree = self.render(self.request(page=2), template)
+        link = tree.find('.//a[@class="endless_previous"]')
+        self.assertEqual('/', link.attrib['href'])
+
+    def test_page_span_previous_url(self):
+        # Ensure the link points to the page preceding a range of pages.
+        template = '{% paginate objects %}{% show_previous %}'
+        tree = self.render(self.request(page='3-4'), template)
+        link = tree.find('.//a[@class="endless_previous"]')
+        expected = '/?{0}={1}'.format(settings.PAGE_LABEL, 2)
+        self.assertEqual(expected, link.attrib['href'])
+
+    def test_lazy_pagination(self):
+        # Ensure the link is generated when the objects are lazy paginated.
+        template = '{% lazy_paginate objects %}{% show_previous %}'
+        tree = self.render(self.request(page=4), template)
+        link = tree.find('.//a[@class="endless_previous"]')
+        expected = '/?{0}={1}'.format(settings.PAGE_LABEL, 3)
+        self.assertEqual(expected, link.attrib['href'])
+
+    def test_customized_label(self):
+        # Ensure the label of the link can be customized.
+        template = '{% paginate objects %}{% show_previous "newer" %}'
+        tree = self.render(self.request(page=2), template)
+        link = tree.find('.//a[@class="endless_previous"]')
+        self.assertEqual('newer', link.text)
+
+    def test_customized_loading(self):
+        # Ensure the loading text can be customized.
+        template = '{% paginate objects %}{% show_previous "newer" "working" %}'
+        tree = self.render(self.request(page=2), template)
+        loading = tree.find('.//*[@class="endless_loading"]')
+        self.assertEqual('working', loading.text)
+
+
+class SnapshotPaginateTest(PaginateTestMixin, TestCase):
+
+    tagname = 'snapshot_paginate'
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+
+    def tearDown(self):
+        caches['default'].clear()
+
+    def test_num_queries(self):
+        # Ensure the primary keys are retrieved for requests without a token.
+        template = '{% $tagname 10 objects %}'
+        queryset = make_model_instances(47)
+        objects = self.assertPaginationNumQueries(2, template, queryset.all())
+        self.assertSequenceEqual(queryset[:10], objects)
+        objects = self.assertPaginationNumQueries(2, template, queryset.all())
+        self.assertSequenceEqual(queryset[:10], objects)
+
+    def test_snapshot_token(self):
+        # Ensure the links to other pages carry the snapshot token, and the
+        # snapshot is retrieved using the requested token.
+        queryset = make_model_instances(20)
+        items = list(queryset)
+        template = '{% $tagname 5 objects %}{% show_more %}'
+        html, context = self.render(
+            self.request(), template, objects=queryset.all())
+        token = context['endless']['page'].paginator.snapshot
+        self.assertIn(f'?page=2&amp;page-snapshot={token}"', html)
+        make_model_instances(5)
+        request = self.request(page=2, data={'page-snapshot': token})
+        html, context = self.render(request, template, objects=queryset.all())
+        self.assertEqual(token, context['endless']['page'].paginator.snapshot)
+        self.assertSequenceEqual(items[5:10], context['objects'])
+        self.assertIn(f'?page-snapshot={token}&amp;page=3"', html)
+
+    def test_invalid_snapshot_token(self):
+        # Ensure invalid tokens are ignored.
+        queryset = make_model_instances(20)
+        request = self.request(page=2, data={'page-snapshot': 'invalid'})
+        _, context = self.render(
+            request, '{% $tagname 5 objects %}', objects=queryset.all())
+        self.assertNotEqual(
+            'invalid', context['endless']['page'].paginator.snapshot)
+
+    def test_max_size(self):
+        # Ensure large querysets are paginated without a snapshot.
+        queryset = make_model_instances(20)
+        template = '{% $tagname 5 objects %}{% show_more %}'
+        settings.SNAPSHOT_MAX_SIZE = 10
+        try:
+            html, context = self.render(
+                self.request(page=2), template, objects=queryset.all())
+        finally:
+            settings.SNAPSHOT_MAX_SIZE = 10000
+        self.assertSequenceEqual(list(queryset[5:10]), context['objects'])
+        self.assertIsNone(context['endless']['page'].paginator.snapshot)
+        self.assertIn('?page=3"', html)
+
+
+class PrefetchHintsTest(TemplateTagsTestMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        settings.PREFETCH_HINTS = True
+
+    def tearDown(self):
+        settings.PREFETCH_HINTS = False
+
+    def test_show_more(self):
+        # Ensure the page template of the next page is hinted by the show
+        # more link, when it is selected by URL.
+        settings.FRAGMENTS_BY_URL = True
+        try:
+            template = '{% paginate objects %}{% show_more %}'
+            html, _ = self.render(self.request(page=2), template)
+        finally:
+            settings.FRAGMENTS_BY_URL = False
+        self.assertIn(
+            '<link rel="prefetch" href="/?page=3&amp;querystring_key=page">',
+            html)
+
+    def test_show_more_headers(self):
+        # Ensure the show more link is not hinted when the page template is
+        # selected by request headers.
+        template = '{% paginate objects %}{% show_more %}'
+        html, _ = self.render(self.request(page=2), template)
+        self.assertNotIn('rel="prefetch"', html)
+
+    def test_show_pages(self):
+        # Ensure only the page template of the next page link is hinted in
+        # Digg-style pagination.
+        settings.FRAGMENTS_BY_URL = True
+        try:
+            template = '{% paginate objects %}{% show_pages %}'
+            html, _ = self.render(self.request(page=2), template)
+        finally:
+            settings.FRAGMENTS_BY_URL = False
+        self.assertEqual(1, html.count('rel="prefetch"'))
+        self.assertIn(
+            '<link rel="prefetch" href="/?page=3&amp;querystring_key=page">',
+            html)
+
+    def test_show_pages_headers(self):
+        # Ensure the next page link is not hinted when the page template is
+        # selected by request headers.
+        template = '{% paginate objects %}{% show_pages %}'
+        html, _ = self.render(self.request(page=2), template)
+        self.assertNotIn('rel="prefetch"', html)
+
+    def test_last_page(self):
+        # Ensure nothing is hinted in the last page.
+        template = '{% paginate objects %}{% show_more %}{% show_pages %}'
+        html, _ = self.render(self.request(page=5), template)
+        self.assertNotIn('rel="prefetch"', html)
+
+    def test_disabled(self):
+        # Ensure no hints are added by default.
+        settings.PREFETCH_HINTS = False
+        template = '{% paginate objects %}{% show_more %}{% show_pages %}'
+        html, _ = self.render(self.request(page=2), template)
+        self.assertNotIn('rel="prefetch"', html)
+
+
 class GetPagesTest(TemplateTagsTestMixin, TestCase):
 
     def test_page_list(self):
@@ -434,6 +746,19 @@ class GetPagesTest(TemplateTagsTestMixin, TestCase):
             page = context['pages'].current()
             self.assertEqual(page_number, page.number)
 
+    def test_page_span(self):
+        # Ensure all the pages in a requested range are marked as current.
+        template = '{% paginate 5 objects %}{% get_pages %}'
+        _, context = self.render(self.request(page='2-4'), template)
+        pages = context['pages']
+        self.assertEqual(4, pages.current().number)
+        self.assertEqual(1, pages.previous().number)
+        self.assertEqual(5, pages.next().number)
+        self.assertEqual(6, pages.current_start_index())
+        self.assertEqual(20, pages.current_end_index())
+        current = [page.number for page in pages if page.is_current]
+        self.assertEqual([2, 3, 4], current)
+
     def test_without_paginate_tag(self):
         # An error is raised if this tag is used before the paginate one.
         template = '{% get_pages %}'
@@ -511,6 +836,12 @@ class ShowCurrentNumberTest(TemplateTagsTestMixin, TestCase):
             html, _ = self.render(self.request(page=page_number), template)
             self.assertEqual(page_number, int(html))
 
+    def test_page_span(self):
+        # Ensure the last page is returned if a range of pages is requested.
+        template = '{% show_current_number %}'
+        html, _ = self.render(self.request(page='2-4'), template)
+        self.assertEqual(4, int(html))
+
     def test_starting_from_page_argument(self):
         # Ensure the number reflects the given ``starting_from_page`` arg.
         template = '{% show_current_number starting from page 3 %}'
@@ -0,0 +1,163 @@
+"""Listing counters tests."""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from el_pagination.counters import listings
+from el_pagination.counters.models import ListingCount
+from el_pagination.paginators import DefaultPaginator
+from project.models import TestItem, TestModel
+
+
+class ListingCountersTest(TestCase):
+
+    def setUp(self):
+        self.categories = [TestModel.objects.create() for _ in range(2)]
+        listings.register(
+            'items', TestItem, field='category', filters={'published': True})
+        listings.register('all_items', TestItem)
+        listings.register('tagged', TestItem, field='tags')
+        for _ in range(3):
+            TestItem.objects.create(category=self.categories[0])
+        TestItem.objects.create(category=self.categories[1], published=False)
+
+    def tearDown(self):
+        for name in ('items', 'all_items', 'tagged'):
+            listings.unregister(name)
+
+    def assertCount(self, expected, name, value=None):
+        """Assert the stored count equals *expected* and the actual count."""
+        self.assertEqual(expected, listings.get_count(name, value))
+        listings.rebuild_counts(name)
+        self.assertEqual(expected, listings.get_count(name, value))
+
+    def test_count(self):
+        # Ensure the objects are counted the first time.
+        self.assertEqual(3, listings.get_count('items', self.categories[0].pk))
+        self.assertEqual(0, listings.get_count('items', self.categories[1].pk))
+        self.assertEqual(4, listings.get_count('all_items'))
+
+    def test_stored_count(self):
+        # Ensure stored counts are retrieved with a single query.
+        listings.get_count('items', self.categories[0].pk)
+        with CaptureQueriesContext(connection) as queries:
+            listings.get_count('items', self.categories[0].pk)
+        self.assertEqual(1, len(queries))
+        self.assertIn('el_pagination_counters', queries[0]['sql'])
+
+    def test_saved_while_counting(self):
+        # Ensure objects saved while the listing is counted are counted once.
+        listing = listings._listings['all_items']
+        get_queryset = listing.get_queryset
+
+        def save_and_get_queryset():
+            TestItem.objects.create(category=self.categories[0])
+            return get_queryset()
+
+        listing.get_queryset = save_and_get_queryset
+        self.assertEqual(5, listings.get_count('all_items'))
+        listing.get_queryset = get_queryset
+        self.assertCount(5, 'all_items')
+
+    def test_create(self):
+        # Ensure created objects are counted.
+        listings.get_count('items', self.categories[0].pk)
+        listings.get_count('all_items')
+        TestItem.objects.create(category=self.categories[0])
+        self.assertCount(4, 'items', self.categories[0].pk)
+        self.assertCount(5, 'all_items')
+
+    def test_update(self):
+        # Ensure objects moved to another group are counted in that group.
+        first, second = [category.pk for category in self.categories]
+        listings.get_count('items', first)
+        listings.get_count('items', second)
+        item = TestItem.objects.filter(category=first).first()
+        item.category_id = second
+        item.save()
+        self.assertCount(2, 'items', first)
+        self.assertCount(1, 'items', second)
+
+    def test_filters(self):
+        # Ensure objects not matching the filters anymore are not counted.
+        category = self.categories[0].pk
+        listings.get_count('items', category)
+        item = TestItem.objects.filter(category=category).first()
+        item.published = False
+        item.save()
+        self.assertCount(2, 'items', category)
+        item.published = True
+        item.save()
+        self.assertCount(3, 'items', category)
+
+    def test_deferred_fields(self):
+        # Ensure objects loaded with deferred fields are counted.
+        first, second = [category.pk for category in self.categories]
+        listings.get_count('items', first)
+        listings.get_count('items', second)
+        listings.get_count('all_items')
+        item = TestItem.objects.filter(category=first).only('pk').first()
+        item.category_id = second
+        item.save()
+        self.assertCount(2, 'items', first)
+        self.assertCount(1, 'items', second)
+        TestItem.objects.only('category').get(pk=item.pk).delete()
+        self.assertCount(0, 'items', second)
+        self.assertCount(3, 'all_items')
+
+    def test_delete(self):
+        # Ensure deleted objects are not counted.
+        category = self.categories[0].pk
+        listings.get_count('items', category)
+        listings.get_count('all_items')
+        TestItem.objects.filter(category=category).first().delete()
+        self.assertCount(2, 'items', category)
+        self.assertCount(3, 'all_items')
+
+    def test_many_to_many(self):
+        # Ensure objects are counted for each related object.
+        tag = self.categories[0]
+        listings.get_count('tagged', tag.pk)
+        items = list(TestItem.objects.all())
+        items[0].tags.add(tag)
+        items[1].tags.add(tag)
+        self.assertCount(2, 'tagged', tag.pk)
+        items[0].tags.remove(tag)
+        self.assertCount(1, 'tagged', tag.pk)
+        tag.tagged_items.add(items[2], items[3])
+        self.assertCount(3, 'tagged', tag.pk)
+        items[1].tags.clear()
+        self.assertCount(2, 'tagged', tag.pk)
+        tag.tagged_items.clear()
+        self.assertCount(0, 'tagged', tag.pk)
+
+    def test_many_to_many_delete(self):
+        # Ensure deleted objects are not counted for their related objects.
+        tag = self.categories[0]
+        listings.get_count('tagged', tag.pk)
+        item = TestItem.objects.first()
+        item.tags.add(tag)
+        item.delete()
+        self.assertCount(0, 'tagged', tag.pk)
+
+    def test_paginator(self):
+        # Ensure the paginator can use the stored count.
+        category = self.categories[0].pk
+        listings.get_count('items', category)
+        paginator = DefaultPaginator(
+            TestItem.objects.filter(category=category, published=True), 2,
+            count=lambda: listings.get_count('items', category))
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(2, paginator.num_pages)
+        self.assertNotIn('COUNT', queries[0]['sql'])
+
+    def test_rebuild_counts(self):
+        # Ensure counts are fixed after changes not sending signals.
+        category = self.categories[0].pk
+        listings.get_count('items', category)
+        TestItem.objects.filter(category=category).update(published=False)
+        self.assertEqual(3, listings.get_count('items', category))
+        listings.rebuild_counts('items')
+        self.assertEqual(0, listings.get_count('items', category))
+        self.assertFalse(ListingCount.objects.filter(key='items:None').exists())
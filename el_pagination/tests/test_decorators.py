@@ -1,11 +1,16 @@
 """Decorator tests."""
 
 
+import json
 
+from django.template.response import TemplateResponse
 from django.test import TestCase
 from django.test.client import RequestFactory
 
-from el_pagination import decorators
+from el_pagination import decorators, settings
+from el_pagination.checks import check_page_templates
+from el_pagination.settings import PAGE_LABEL
+from project.views import generic
 
 
 class DecoratorsTestMixin(object):
@@ -136,3 +141,191 @@ class PageTemplatesTest(DecoratorsTestMixin, TestCase):
 class PageTemplatesWithTupleTest(PageTemplatesTest):
 
     arg = (('page.html', None), ('mypage.html', 'mypage'))
+
+
+class CheckPageTemplatesTest(TestCase):
+
+    def tearDown(self):
+        decorators.registered_templates.discard('missing/page.html')
+
+    def get_error_templates(self):
+        return [error.obj for error in check_page_templates()]
+
+    def test_existing(self):
+        # Ensure no error is reported for existing page templates.
+        decorators.page_templates({'twitter/page.html': None})(generic)
+        self.assertNotIn('twitter/page.html', self.get_error_templates())
+
+    def test_missing(self):
+        # Ensure an error is reported for missing page templates.
+        decorators.page_templates({
+            'twitter/page.html': None,
+            'missing/page.html': 'other-page',
+        })(generic)
+        errors = [
+            error for error in check_page_templates()
+            if error.obj == 'missing/page.html']
+        self.assertEqual(['el_pagination.E001'], [e.id for e in errors])
+
+    def test_url_views(self):
+        # Ensure the templates of the views in the URL configuration are
+        # checked.
+        check_page_templates()
+        self.assertIn('digg/page.html', decorators.registered_templates)
+
+
+class GetTemplateIndexTest(TestCase):
+
+    def test_index(self):
+        # Ensure templates are indexed by querystring key.
+        index, default = decorators._get_template_index(
+            {'page.html': None, 'mypage.html': 'mypage'})
+        self.assertEqual('page.html', default)
+        self.assertEqual('page.html', index[PAGE_LABEL])
+        self.assertEqual('mypage.html', index['mypage'])
+
+    def test_first_template_wins(self):
+        # If a key is repeated, the first template is used.
+        index, _ = decorators._get_template_index(
+            (('first.html', 'mypage'), ('second.html', 'mypage')))
+        self.assertEqual('first.html', index['mypage'])
+
+    def test_no_default(self):
+        # The default template is None if no None key is provided.
+        _, default = decorators._get_template_index({'page.html': 'mypage'})
+        self.assertIsNone(default)
+
+    def test_read_only(self):
+        # The index cannot be altered after decoration.
+        index, _ = decorators._get_template_index({'page.html': None})
+        with self.assertRaises(TypeError):
+            index['mypage'] = 'mypage.html'
+
+
+class PageTemplatesBatchTest(TestCase):
+
+    mapping = {
+        'multiple/objects_page.html': 'objects-page',
+        'multiple/items_page.html': 'items-page',
+        'multiple/entries_page.html': 'entries-page',
+    }
+    url = (
+        '/?querystring_key=objects-page&objects-page=2'
+        '&querystring_key=items-page&querystring_key=unknown'
+    )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.ajax_headers = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+    def get_fragments(self, view, url=None):
+        """Return the decoded fragments returned by the decorated *view*."""
+        decorated = decorators.page_templates(self.mapping)(view)
+        request = self.factory.get(url or self.url, **self.ajax_headers)
+        response = decorated(request, template='multiple/index.html', number=21)
+        self.assertEqual('application/json', response['Content-Type'])
+        return json.loads(response.content)
+
+    def test_render(self):
+        # Ensure all the requested fragments are returned.
+        fragments = self.get_fragments(generic)
+        self.assertListEqual(['objects-page', 'items-page'], list(fragments))
+        self.assertIn('Object 4', fragments['objects-page'])
+        self.assertNotIn('Object 1<', fragments['objects-page'])
+        self.assertIn('Item 1', fragments['items-page'])
+
+    def test_template_response(self):
+        # Ensure views returning a template response are called only once.
+        calls = []
+
+        def view(request, extra_context=None, template=None, number=None):
+            calls.append(template)
+            context = {'objects': range(10), 'items': range(10)}
+            context.update(extra_context or {})
+            return TemplateResponse(request, template, context)
+
+        fragments = self.get_fragments(view)
+        self.assertEqual(1, len(calls))
+        self.assertListEqual(['objects-page', 'items-page'], list(fragments))
+
+    def test_single_key(self):
+        # A single querystring key still switches the template.
+        decorated = decorators.page_templates(self.mapping)(generic)
+        request = self.factory.get(
+            '/?querystring_key=items-page', **self.ajax_headers)
+        response = decorated(request, template='multiple/index.html')
+        self.assertEqual('text/html; charset=utf-8', response['Content-Type'])
+
+    def test_not_ajax(self):
+        # The batch protocol is only used by Ajax requests.
+        decorated = decorators.page_templates(self.mapping)(generic)
+        request = self.factory.get(self.url)
+        response = decorated(request, template='multiple/index.html')
+        self.assertIn(b'endless_page_template', response.content)
+
+
+class PageLinkHeaderTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_link_header(self):
+        # Ensure the header links to the next page of each pagination.
+        view = decorators.page_link_header(generic)
+        request = self.factory.get('/?objects-page=2&entries-page=3')
+        response = view(request, template='multiple/index.html', number=21)
+        expected = (
+            '</?objects-page=3&entries-page=3>; rel="next", '
+            '</?objects-page=2&entries-page=3&items-page=2>; rel="next", '
+            '</?objects-page=2&entries-page=4>; rel="next"'
+        )
+        self.assertEqual(expected, response['Link'])
+
+    def test_last_page(self):
+        # Ensure paginations without a next page are not linked.
+        view = decorators.page_link_header(generic)
+        request = self.factory.get('/?objects-page=2')
+        response = view(request, template='multiple/objects_page.html', number=6)
+        self.assertFalse(response.has_header('Link'))
+
+    def test_template_response(self):
+        # Ensure the header is added once a template response is rendered.
+        def view(request):
+            return TemplateResponse(
+                request, 'multiple/objects_page.html', {'objects': range(10)}
+            )
+
+        response = decorators.page_link_header(view)(self.factory.get('/'))
+        self.assertFalse(response.has_header('Link'))
+        response.render()
+        self.assertEqual('</?objects-page=2>; rel="next"', response['Link'])
+
+
+class FragmentHeadersTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        decorator = decorators.page_template(
+            'multiple/objects_page.html', 'objects-page')
+        self.view = decorator(generic)
+
+    def tearDown(self):
+        settings.FRAGMENTS_BY_URL = False
+
+    def test_vary_header(self):
+        # Ensure both the full page and the fragment vary on the header.
+        for headers in ({}, {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}):
+            request = self.factory.get('/?querystring_key=objects-page', **headers)
+            response = self.view(request, template='multiple/index.html')
+            self.assertEqual('X-Requested-With', response['Vary'])
+
+    def test_fragments_by_url(self):
+        # Ensure the fragment is selected by URL if ``FRAGMENTS_BY_URL``
+        # is True, without varying on headers.
+        settings.FRAGMENTS_BY_URL = True
+        request = self.factory.get('/?querystring_key=objects-page')
+        response = self.view(request, template='multiple/index.html')
+        self.assertFalse(response.has_header('Vary'))
+        self.assertNotIn(b'Item 1', response.content)
+        response = self.view(self.factory.get('/'), template='multiple/index.html')
+        self.assertIn(b'Item 1', response.content)
@@ -0,0 +1,174 @@
+"""Page boundaries index tests."""
+
+import io
+import re
+
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from el_pagination import settings
+from el_pagination.indexes.boundaries import index_seek_map, track_changes
+from el_pagination.indexes.models import SeekIndex
+from el_pagination.paginators import DefaultPaginator
+from project.models import TestModel, make_model_instances
+
+
+def get_indexed_queryset():
+    return TestModel.objects.order_by('pk')
+
+
+def get_descending_queryset():
+    return TestModel.objects.order_by('-pk')
+
+
+def get_unordered_queryset():
+    return TestModel.objects.all()
+
+
+def get_scan_sql(queries):
+    """Return the SQL of the last query retrieving the indexed objects."""
+    table = TestModel._meta.db_table
+    return [
+        query['sql'] for query in queries
+        if f'FROM "{table}"' in query['sql']][-1]
+
+
+def get_offset(sql):
+    """Return the number of rows skipped by the given query."""
+    match = re.search(r'OFFSET (\d+)', sql)
+    return int(match.group(1)) if match else 0
+
+
+class SeekIndexTest(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.items = list(make_model_instances(30))
+        settings.SEEK_INDEXES = {
+            'items': __name__ + '.get_indexed_queryset',
+        }
+        track_changes()
+
+    def tearDown(self):
+        settings.SEEK_INDEXES = {}
+        uid = 'el_pagination_indexes:' + TestModel._meta.label
+        post_save.disconnect(sender=TestModel, dispatch_uid=uid)
+        post_delete.disconnect(sender=TestModel, dispatch_uid=uid)
+        caches['default'].clear()
+
+    def get_page_sql(self, number, queryset=None):
+        if queryset is None:
+            queryset = get_indexed_queryset()
+        paginator = DefaultPaginator(queryset, 7, seek_map=True)
+        paginator.count
+        with CaptureQueriesContext(connection) as queries:
+            objects = list(paginator.page(number).object_list)
+        return objects, get_scan_sql(queries)
+
+    def test_index(self):
+        # Ensure any page can be reached using the indexed boundaries.
+        stdout = io.StringIO()
+        call_command('el_pagination_index', '--step', '7', stdout=stdout)
+        self.assertIn('items: 4 boundaries stored.', stdout.getvalue())
+        index = SeekIndex.objects.get()
+        self.assertEqual(30, index.count)
+        self.assertEqual(
+            [self.items[i].pk for i in (7, 14, 21, 28)],
+            list(index.boundaries.order_by('rank').values_list(
+                'value', flat=True)))
+        objects, sql = self.get_page_sql(4)
+        self.assertSequenceEqual(self.items[21:28], objects)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_added(self):
+        # Ensure the boundaries are still used once objects are added after
+        # the indexed ones.
+        index_seek_map(get_indexed_queryset(), 7)
+        make_model_instances(1)
+        objects, sql = self.get_page_sql(4)
+        self.assertSequenceEqual(self.items[21:28], objects)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_outdated(self):
+        # Ensure the boundaries are not used once objects are removed.
+        index_seek_map(get_indexed_queryset(), 7)
+        TestModel.objects.filter(pk=self.items[0].pk)._raw_delete('default')
+        objects, sql = self.get_page_sql(4)
+        self.assertSequenceEqual(self.items[22:29], objects)
+        self.assertIn('OFFSET', sql)
+
+    def test_same_count(self):
+        # Ensure the boundaries are not used once objects are replaced.
+        index_seek_map(get_indexed_queryset(), 7)
+        self.items[0].delete()
+        self.items = list(make_model_instances(1))
+        self.assertTrue(SeekIndex.objects.get().stale)
+        objects, sql = self.get_page_sql(4)
+        self.assertSequenceEqual(self.items[21:28], objects)
+        self.assertIn('OFFSET', sql)
+
+    def test_descending(self):
+        # Ensure the boundaries are used for descending orders, also once
+        # objects are added at the start.
+        queryset = get_descending_queryset()
+        index_seek_map(queryset, 7)
+        self.items = list(make_model_instances(3))[::-1]
+        objects, sql = self.get_page_sql(4, queryset=queryset)
+        self.assertSequenceEqual(self.items[21:28], objects)
+        self.assertLess(get_offset(sql), 7)
+
+    def test_incremental(self):
+        # Ensure only the objects added after the indexed ones are scanned.
+        queryset = get_indexed_queryset()
+        index_seek_map(queryset, 7)
+        self.items = list(make_model_instances(8))
+        with CaptureQueriesContext(connection) as queries:
+            number = index_seek_map(queryset, 7, incremental=True)
+        self.assertEqual(5, number)
+        self.assertIn('>', get_scan_sql(queries))
+        objects, sql = self.get_page_sql(5)
+        self.assertSequenceEqual(self.items[28:35], objects)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_incremental_descending(self):
+        # Ensure only the objects added first are scanned for descending
+        # orders.
+        queryset = get_descending_queryset()
+        index_seek_map(queryset, 7)
+        self.items = list(make_model_instances(8))[::-1]
+        with CaptureQueriesContext(connection) as queries:
+            number = index_seek_map(queryset, 7, incremental=True)
+        self.assertEqual(5, number)
+        self.assertIn('>', get_scan_sql(queries))
+        for number in (2, 5):
+            objects, sql = self.get_page_sql(number, queryset=queryset)
+            start = (number - 1) * 7
+            self.assertSequenceEqual(self.items[start:start + 7], objects)
+            self.assertLess(get_offset(sql), 7)
+
+    def test_incremental_changed(self):
+        # Ensure the index is rebuilt if objects are removed before the end.
+        queryset = get_indexed_queryset()
+        index_seek_map(queryset, 7)
+        self.items[0].delete()
+        self.items = list(queryset)
+        with CaptureQueriesContext(connection) as queries:
+            index_seek_map(queryset, 7, incremental=True)
+        self.assertNotIn('>', get_scan_sql(queries))
+        objects, _ = self.get_page_sql(3)
+        self.assertSequenceEqual(self.items[14:21], objects)
+
+    def test_unknown_listing(self):
+        # Ensure an error is raised for listings not configured.
+        with self.assertRaises(CommandError):
+            call_command('el_pagination_index', 'unknown')
+
+    def test_not_indexable(self):
+        # Ensure an error is raised for querysets not sorted by a unique field.
+        settings.SEEK_INDEXES = {'items': __name__ + '.get_unordered_queryset'}
+        with self.assertRaises(CommandError):
+            call_command('el_pagination_index', '--step', '7')
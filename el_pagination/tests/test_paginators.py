@@ -2,9 +2,18 @@
 
 
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.core.cache import caches
+from django.db import NotSupportedError, connection, connections
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-from el_pagination import paginators
+from el_pagination import paginators, settings
+from project.models import TestItem, TestModel, make_model_instances
 
 
 class PaginatorTestMixin(object):
@@ -37,6 +46,22 @@ class PaginatorTestMixin(object):
         object_list = paginator.page(2).object_list
         self.assertEqual(3, len(object_list))
 
+    def test_page_span(self):
+        # Ensure the paginator returns objects for a range of pages.
+        first_page = self.paginator.first_page
+        expected = self.items[first_page:first_page + self.per_page * 2]
+        page = self.paginator.page_span(2, 3)
+        self.assertSequenceEqual(expected, page.object_list)
+        self.assertEqual(3, page.number)
+        self.assertEqual(2, page.first_number)
+        self.assertEqual(1, page.previous_page_number())
+        self.assertEqual(first_page + 1, page.start_index())
+
+    def test_invalid_page_span(self):
+        # An error is raised if the range of pages is empty.
+        with self.assertRaises(paginators.EmptyPage):
+            self.paginator.page_span(3, 2)
+
     def test_empty_page(self):
         # En error if raised if the requested page does not exist.
         with self.assertRaises(paginators.EmptyPage):
@@ -71,6 +96,17 @@ class DifferentFirstPagePaginatorTestMixin(PaginatorTestMixin):
         self.assertEqual(3, len(object_list))
 
 
+class BasePaginatorTest(TestCase):
+
+    def test_subclass(self):
+        # Ensure subclasses not implementing page spans can retrieve pages.
+        class Paginator(paginators.BasePaginator):
+            pass
+
+        page = Paginator(list(range(30)), 7).page(2)
+        self.assertSequenceEqual(list(range(7, 14)), page.object_list)
+
+
 class DefaultPaginatorTest(PaginatorTestMixin, TestCase):
 
     paginator_class = paginators.DefaultPaginator
@@ -128,6 +164,443 @@ class LazyPaginatorTest(PaginatorTestMixin, TestCase):
             self.paginator.page_range
 
 
+def _share_connection(conn):
+    """Use the given database connection in a worker thread.
+
+    The in-memory test database cannot be reached by other connections.
+    """
+    connections['default'] = conn
+
+
+class ConcurrentCountPaginatorTest(PaginatorTestMixin, TestCase):
+
+    paginator_class = partial(paginators.DefaultPaginator, concurrent_count=True)
+
+    def setUp(self):
+        connection.inc_thread_sharing()
+        paginators._executor = ThreadPoolExecutor(
+            max_workers=1,
+            initializer=_share_connection,
+            initargs=(connections['default'],),
+        )
+        queryset = make_model_instances(30)
+        self.items = list(queryset)
+        self.per_page = 7
+        self.paginator = self.paginator_class(
+            queryset.all(), self.per_page, orphans=2)
+
+    def tearDown(self):
+        paginators._executor.shutdown()
+        paginators._executor = None
+        connection.dec_thread_sharing()
+
+    def test_count(self):
+        # Ensure the count is available once the page is retrieved.
+        with CaptureQueriesContext(connection) as queries:
+            self.paginator.page(2)
+            self.assertEqual(30, self.paginator.count)
+        self.assertEqual(2, len(queries))
+
+    def test_page_span_last_page(self):
+        # Ensure a range of pages ending with the last page includes orphans.
+        page = self.paginator.page_span(3, 4)
+        self.assertSequenceEqual(self.items[14:], page.object_list)
+
+    def test_errors(self):
+        # Ensure errors retrieving the objects are not hidden by errors
+        # counting them.
+        # The objects query fails before reaching the database, so that it
+        # does not run at the same time as the count on the shared connection.
+        paginator = self.paginator_class(
+            TestModel.objects.distinct('pk'), 7,
+            count=TestModel.objects.extra(where=['missing_count = 1']))
+        with self.assertRaises(NotSupportedError):
+            paginator.page(2)
+
+
+class WindowCountPaginatorTest(PaginatorTestMixin, TestCase):
+
+    paginator_class = partial(paginators.DefaultPaginator, window_count=True)
+
+    def setUp(self):
+        self.queryset = make_model_instances(30)
+        self.items = list(self.queryset)
+        self.per_page = 7
+        self.paginator = self.paginator_class(
+            self.queryset.all(), self.per_page, orphans=2)
+
+    def test_single_query(self):
+        # Ensure the objects and their number are retrieved in one query.
+        with CaptureQueriesContext(connection) as queries:
+            page = self.paginator.page(2)
+            self.assertEqual(30, self.paginator.count)
+            self.assertEqual(14, page.end_index())
+        self.assertEqual(1, len(queries))
+        self.assertIn('OVER', queries[0]['sql'])
+        self.assertNotIn('el_pagination_count', vars(page.object_list[0]))
+
+    def test_values(self):
+        # Ensure querysets of dicts are supported.
+        paginator = self.paginator_class(self.queryset.values('pk'), 7)
+        page = paginator.page(2)
+        self.assertEqual(30, paginator.count)
+        self.assertEqual([{'pk': item.pk} for item in self.items[7:14]],
+                         page.object_list)
+
+    def test_distinct(self):
+        # Ensure distinct querysets are counted separately.
+        paginator = self.paginator_class(self.queryset.distinct(), 7)
+        with CaptureQueriesContext(connection) as queries:
+            list(paginator.page(2).object_list)
+        self.assertEqual(2, len(queries))
+        self.assertNotIn('OVER', queries[0]['sql'])
+
+    def test_no_objects(self):
+        # Ensure the first page is empty if there are no objects.
+        paginator = self.paginator_class(self.queryset.none(), 7)
+        self.assertSequenceEqual([], paginator.page(1).object_list)
+        self.assertEqual(0, paginator.count)
+
+
+class CountSourcePaginatorTest(TestCase):
+
+    def setUp(self):
+        self.queryset = make_model_instances(30)
+        self.items = list(self.queryset)
+
+    def test_number(self):
+        # Ensure a precomputed number of objects is used without a query.
+        paginator = paginators.DefaultPaginator(self.queryset.all(), 7, count=30)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(30, paginator.count)
+        self.assertEqual(0, len(queries))
+
+    def test_queryset(self):
+        # Ensure the objects are counted using the given queryset.
+        queryset = TestModel.objects.filter(pk__gt=0)
+        paginator = paginators.DefaultPaginator(
+            self.queryset.all(), 7, count=queryset)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(30, paginator.count)
+        self.assertIn('WHERE', queries[0]['sql'])
+
+    def test_callable(self):
+        # Ensure callables returning the count source are called.
+        paginator = paginators.DefaultPaginator(
+            self.queryset.all(), 7, count=lambda: 30)
+        self.assertEqual(30, paginator.count)
+        self.assertEqual(5, paginator.num_pages)
+
+    def test_window_count(self):
+        # Ensure the objects are not counted using a window function.
+        paginator = paginators.DefaultPaginator(
+            self.queryset.all(), 7, count=self.queryset.all(),
+            window_count=True)
+        with CaptureQueriesContext(connection) as queries:
+            objects = list(paginator.page(2).object_list)
+        self.assertSequenceEqual(self.items[7:14], objects)
+        self.assertNotIn('OVER', queries[-1]['sql'])
+
+
+class CountDatabasePaginatorTest(TestCase):
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.queryset = make_model_instances(30)
+        self.items = list(self.queryset)
+        for _ in range(40):
+            TestModel.objects.using('replica').create()
+
+    def tearDown(self):
+        settings.COUNT_DATABASE = None
+
+    def test_count_database(self):
+        # Ensure the objects are counted using the given database, while
+        # the objects of the page are retrieved from the default one.
+        paginator = paginators.DefaultPaginator(
+            self.queryset.all(), 7, count_database='replica')
+        self.assertEqual(40, paginator.count)
+        objects = list(paginator.page(2).object_list)
+        self.assertSequenceEqual(self.items[7:14], objects)
+
+    def test_count_source(self):
+        # Ensure the count source is counted using the given database.
+        paginator = paginators.DefaultPaginator(
+            self.queryset.all(), 7, count=self.queryset.filter(pk__gt=0),
+            count_database='replica')
+        self.assertEqual(40, paginator.count)
+
+    def test_setting(self):
+        # Ensure the database alias can be set in settings.
+        settings.COUNT_DATABASE = 'replica'
+        paginator = paginators.DefaultPaginator(self.queryset.all(), 7)
+        self.assertEqual(40, paginator.count)
+
+
+class CountCachePaginatorTest(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        connection.inc_thread_sharing()
+        paginators._executor = ThreadPoolExecutor(
+            max_workers=1,
+            initializer=_share_connection,
+            initargs=(connections['default'],),
+        )
+        self.queryset = make_model_instances(30)
+
+    def tearDown(self):
+        paginators._executor.shutdown()
+        paginators._executor = None
+        connection.dec_thread_sharing()
+        caches['default'].clear()
+
+    def get_count(self):
+        paginator = paginators.DefaultPaginator(
+            self.queryset.all(), 7, count_timeout=60)
+        with CaptureQueriesContext(connection) as queries:
+            count = paginator.count
+        return count, len(queries)
+
+    def expire(self):
+        fingerprint = paginators.get_fingerprint(self.queryset.all())
+        key = f'el_pagination:count:default:{fingerprint}'
+        count, _ = caches['default'].get(key)
+        caches['default'].set(key, (count, time.time() - 1))
+        return key
+
+    def test_cached(self):
+        # Ensure the objects are only counted once.
+        self.assertEqual((30, 1), self.get_count())
+        make_model_instances(1)
+        self.assertEqual((30, 0), self.get_count())
+
+    def test_stale(self):
+        # Ensure an expired count is returned while it is refreshed.
+        self.get_count()
+        self.expire()
+        make_model_instances(1)
+        # Hold the worker, so that the refresh is not run while the queries
+        # of the current thread are captured.
+        released = threading.Event()
+        paginators._executor.submit(released.wait)
+        self.assertEqual((30, 0), self.get_count())
+        released.set()
+        paginators._executor.shutdown()
+        self.assertEqual((31, 0), self.get_count())
+
+    def test_miss_locked(self):
+        # Ensure a missing count being computed elsewhere is waited for.
+        fingerprint = paginators.get_fingerprint(self.queryset.all())
+        key = f'el_pagination:count:default:{fingerprint}'
+        caches['default'].add(f'{key}:lock', True)
+        timer = threading.Timer(
+            0.1, caches['default'].set, (key, (42, time.time() + 60)))
+        timer.start()
+        try:
+            self.assertEqual((42, 0), self.get_count())
+        finally:
+            timer.join()
+
+    def test_miss_locked_timeout(self):
+        # Ensure the objects are counted, without caching the result, if
+        # the count computed elsewhere takes too long.
+        fingerprint = paginators.get_fingerprint(self.queryset.all())
+        key = f'el_pagination:count:default:{fingerprint}'
+        caches['default'].add(f'{key}:lock', True)
+        settings.COUNT_LOCK_WAIT = 0
+        try:
+            self.assertEqual((30, 1), self.get_count())
+        finally:
+            settings.COUNT_LOCK_WAIT = 1
+        self.assertIsNone(caches['default'].get(key))
+
+    def test_lock(self):
+        # Ensure an expired count is not refreshed if the lock is taken.
+        self.get_count()
+        key = self.expire()
+        caches['default'].add(f'{key}:lock', True)
+        make_model_instances(1)
+        self.get_count()
+        paginators._executor.shutdown()
+        self.assertEqual((30, 0), self.get_count())
+
+
+class SeekMapPaginatorTest(PaginatorTestMixin, TestCase):
+
+    paginator_class = partial(paginators.DefaultPaginator, seek_map=True)
+
+    def setUp(self):
+        caches['default'].clear()
+        self.queryset = make_model_instances(30)
+        self.items = list(self.queryset)
+        self.per_page = 7
+        self.paginator = self.paginator_class(
+            self.queryset.all(), self.per_page, orphans=2)
+
+    def tearDown(self):
+        caches['default'].clear()
+
+    def get_page_sql(self, queryset, number):
+        paginator = self.paginator_class(queryset, 7)
+        paginator.count
+        with CaptureQueriesContext(connection) as queries:
+            objects = list(paginator.page(number).object_list)
+        self.assertEqual(1, len(queries))
+        return objects, queries[0]['sql']
+
+    def test_seek(self):
+        # Ensure the recorded sort key of a page replaces the offset.
+        self.get_page_sql(self.queryset.all(), 2)
+        objects, sql = self.get_page_sql(self.queryset.all(), 3)
+        self.assertSequenceEqual(self.items[14:21], objects)
+        self.assertNotIn('OFFSET', sql)
+        self.assertIn('>=', sql)
+
+    def test_seek_following_page(self):
+        # Ensure pages after the recorded ones use the nearest sort key.
+        self.get_page_sql(self.queryset.all(), 2)
+        objects, sql = self.get_page_sql(self.queryset.all(), 4)
+        self.assertSequenceEqual(self.items[21:28], objects)
+        self.assertIn('>=', sql)
+
+    def test_descending(self):
+        # Ensure querysets sorted in descending order are supported.
+        queryset = self.queryset.order_by('-pk')
+        items = list(reversed(self.items))
+        self.get_page_sql(queryset, 2)
+        objects, sql = self.get_page_sql(queryset, 3)
+        self.assertSequenceEqual(items[14:21], objects)
+        self.assertIn('<=', sql)
+
+    def test_changed_count(self):
+        # Ensure recorded sort keys are not used once objects are added.
+        self.get_page_sql(self.queryset.all(), 2)
+        make_model_instances(1)
+        objects, sql = self.get_page_sql(self.queryset.all(), 3)
+        self.assertSequenceEqual(self.items[14:21], objects)
+        self.assertIn('OFFSET', sql)
+
+    def test_same_count(self):
+        # Ensure recorded sort keys are not used once objects are deleted
+        # and added, even if the number of objects does not change.
+        self.get_page_sql(self.queryset.all(), 2)
+        self.get_page_sql(self.queryset.all(), 3)
+        self.items.pop(3).delete()
+        self.items.extend(make_model_instances(1))
+        objects, sql = self.get_page_sql(self.queryset.all(), 3)
+        self.assertSequenceEqual(self.items[14:21], objects)
+        self.assertIn('OFFSET', sql)
+
+    def test_saved_object(self):
+        # Ensure recorded sort keys are not used once objects are saved.
+        self.get_page_sql(self.queryset.all(), 2)
+        self.items[0].save()
+        _, sql = self.get_page_sql(self.queryset.all(), 3)
+        self.assertIn('OFFSET', sql)
+
+    def test_nullable_ordering(self):
+        # Ensure querysets sorted by a nullable field use offsets.
+        self.assertIsNotNone(
+            paginators.get_seek_field(TestItem.objects.order_by('-pk')))
+        self.assertIsNone(
+            paginators.get_seek_field(TestItem.objects.order_by('code')))
+
+    def test_not_unique_ordering(self):
+        # Ensure querysets not sorted by a unique field use offsets.
+        queryset = self.queryset.order_by('pk', 'id')
+        self.get_page_sql(queryset, 2)
+        objects, sql = self.get_page_sql(queryset, 3)
+        self.assertSequenceEqual(self.items[14:21], objects)
+        self.assertIn('OFFSET', sql)
+
+
+class SnapshotPaginatorTest(PaginatorTestMixin, TestCase):
+
+    paginator_class = paginators.SnapshotPaginator
+
+    def setUp(self):
+        caches['default'].clear()
+        self.queryset = make_model_instances(30)
+        self.items = list(self.queryset)
+        self.per_page = 7
+        self.paginator = self.paginator_class(
+            self.queryset.all(), self.per_page, orphans=2)
+
+    def tearDown(self):
+        caches['default'].clear()
+
+    def test_snapshot(self):
+        # Ensure the primary keys are only retrieved for the first page.
+        self.paginator.page(1)
+        paginator = self.paginator_class(
+            self.queryset.all(), 7, snapshot=self.paginator.snapshot)
+        with CaptureQueriesContext(connection) as queries:
+            objects = list(paginator.page(2).object_list)
+        self.assertSequenceEqual(self.items[7:14], objects)
+        self.assertEqual(1, len(queries))
+        self.assertNotIn('ORDER BY', queries[0]['sql'])
+        self.assertEqual(self.paginator.snapshot, paginator.snapshot)
+
+    def test_concurrent_changes(self):
+        # Ensure pages are consistent when objects are added or removed.
+        self.paginator.page(1)
+        make_model_instances(5)
+        self.items[8].delete()
+        paginator = self.paginator_class(
+            self.queryset.all(), 7, snapshot=self.paginator.snapshot)
+        self.assertEqual(30, paginator.count)
+        expected = self.items[7:8] + self.items[9:14]
+        self.assertSequenceEqual(expected, paginator.page(2).object_list)
+
+    def test_expired_snapshot(self):
+        # Ensure a new snapshot is taken if the cached one is not found.
+        self.paginator.page(1)
+        caches['default'].clear()
+        make_model_instances(5)
+        paginator = self.paginator_class(
+            self.queryset.all(), 7, snapshot=self.paginator.snapshot)
+        self.assertEqual(35, paginator.count)
+        self.assertNotEqual(self.paginator.snapshot, paginator.snapshot)
+
+    def test_new_snapshot(self):
+        # Ensure a new snapshot is taken if no token is given.
+        self.paginator.page(1)
+        make_model_instances(5)
+        paginator = self.paginator_class(self.queryset.all(), 7)
+        self.assertEqual(35, paginator.count)
+        self.assertNotEqual(self.paginator.snapshot, paginator.snapshot)
+
+    def test_values(self):
+        # Ensure querysets of dicts are paginated without a snapshot.
+        paginator = self.paginator_class(self.queryset.values('pk'), 7)
+        expected = [{'pk': item.pk} for item in self.items[7:14]]
+        self.assertSequenceEqual(expected, paginator.page(2).object_list)
+        self.assertIsNone(paginator.snapshot)
+
+    def test_sliced(self):
+        # Ensure sliced querysets are paginated without a snapshot.
+        paginator = self.paginator_class(self.queryset.all()[:20], 7)
+        self.assertEqual(20, paginator.count)
+        self.assertSequenceEqual(self.items[7:14], paginator.page(2).object_list)
+        self.assertIsNone(paginator.snapshot)
+
+    def test_max_size(self):
+        # Ensure querysets larger than the maximum size are paginated
+        # without a snapshot, and their primary keys retrieved only once.
+        paginator = self.paginator_class(
+            self.queryset.all(), 7, snapshot_max_size=20)
+        self.assertSequenceEqual(self.items[7:14], paginator.page(2).object_list)
+        self.assertIsNone(paginator.snapshot)
+        paginator = self.paginator_class(
+            self.queryset.all(), 7, snapshot_max_size=20)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(30, paginator.count)
+        self.assertEqual(1, len(queries))
+        self.assertIn('COUNT', queries[0]['sql'])
+
+
 class DifferentFirstPageDefaultPaginatorTest(
         DifferentFirstPagePaginatorTestMixin, TestCase):
 
@@ -0,0 +1,108 @@
+"""Concurrent pagination tests."""
+
+
+
+from django.db import connection, connections
+from django.http import Http404
+from django.template import Context, Template
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from el_pagination import settings, utils
+from el_pagination.parallel import PaginationPlan
+from project.models import make_model_instances
+
+
+class SharedConnectionPlan(PaginationPlan):
+    """A plan sharing the test database connection with worker threads.
+
+    The in-memory test database cannot be reached by other connections.
+    """
+
+    def __init__(self, request):
+        super().__init__(request)
+        self.connection = connections['default']
+
+    def _evaluate(self, pagination):
+        connections['default'] = self.connection
+        return super()._evaluate(pagination)
+
+
+class PaginationPlanTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.objects = make_model_instances(30)
+        connection.inc_thread_sharing()
+
+    def tearDown(self):
+        connection.dec_thread_sharing()
+
+    def render(self, request, contents, **kwargs):
+        """Render *contents* using the given *request* and context data."""
+        template = Template('{% load el_pagination_tags %}' + contents)
+        context = Context(dict(kwargs, request=request))
+        return template.render(context), context
+
+    def test_prepared_pages(self):
+        # Ensure the template tags use the pages evaluated in advance,
+        # without hitting the database.
+        request = self.factory.get('/?page=2&items=3')
+        items = range(47)
+        plan = SharedConnectionPlan(request)
+        plan.add(self.objects, per_page=5)
+        plan.add(items, querystring_key='items', lazy=True)
+        plan.execute()
+        template = (
+            '{% lazy_paginate items using "items" %}{% paginate 5 objects %}'
+            '{% get_pages %}{{ pages.total_count }}'
+        )
+        with CaptureQueriesContext(connection) as queries:
+            html, context = self.render(
+                request, template, objects=self.objects, items=items)
+        self.assertEqual(0, len(queries))
+        self.assertEqual('30', html)
+        self.assertSequenceEqual(list(self.objects[5:10]), context['objects'])
+        self.assertSequenceEqual(range(20, 30), context['items'])
+
+    def test_different_arguments(self):
+        # Ensure pages prepared with other arguments are not used.
+        request = self.factory.get('/?page=2')
+        plan = SharedConnectionPlan(request)
+        plan.add(self.objects, per_page=10)
+        plan.execute()
+        template = '{% paginate 5 objects %}'
+        with CaptureQueriesContext(connection) as queries:
+            _, context = self.render(request, template, objects=self.objects)
+            objects = list(context['objects'])
+        self.assertEqual(2, len(queries))
+        self.assertSequenceEqual(list(self.objects[5:10]), objects)
+
+    def test_other_objects(self):
+        # Ensure pages prepared for other objects sharing the same key,
+        # e.g. because their id was reused, are not used.
+        request = self.factory.get('/?page=2')
+        plan = SharedConnectionPlan(request)
+        plan.add(self.objects)
+        plan.execute()
+        prepared_pages = utils.get_pagination_state(request).prepared_pages
+        (key, prepared), = prepared_pages.items()
+        self.assertIs(self.objects, prepared[0])
+        objects = self.objects.all()
+        prepared_pages[(id(objects),) + key[1:]] = prepared
+        _, context = self.render(
+            request, '{% paginate 5 objects %}', objects=objects)
+        self.assertSequenceEqual(list(self.objects[5:10]), context['objects'])
+
+    def test_out_of_range(self):
+        # Ensure errors are propagated when the plan is executed.
+        request = self.factory.get('/?page=10')
+        plan = SharedConnectionPlan(request)
+        plan.add(self.objects)
+        settings.PAGE_OUT_OF_RANGE_404 = True
+        try:
+            with self.assertRaises(Http404):
+                plan.execute()
+        finally:
+            settings.PAGE_OUT_OF_RANGE_404 = False
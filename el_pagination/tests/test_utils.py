@@ -2,12 +2,18 @@
 
 
 
+from django.core.paginator import Paginator
 from django.test import TestCase
 from django.test.client import RequestFactory
 
-from el_pagination import utils
+from el_pagination import settings, utils
 from el_pagination.exceptions import PaginationError
-from el_pagination.settings import PAGE_LABEL
+from el_pagination.paginators import (
+    BasePaginator,
+    DefaultPaginator,
+    LazyPaginator,
+)
+from el_pagination.settings import MAX_PAGE_SPAN, PAGE_LABEL
 
 
 class GetDataFromContextTest(TestCase):
@@ -23,6 +29,35 @@ class GetDataFromContextTest(TestCase):
         self.assertRaises(PaginationError, utils.get_data_from_context, {})
 
 
+class IsFragmentRequestTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.ajax_headers = {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}
+
+    def tearDown(self):
+        settings.FRAGMENTS_BY_URL = False
+
+    def test_ajax_request(self):
+        # By default, Ajax requests ask for the page template.
+        request = self.factory.get('/', **self.ajax_headers)
+        self.assertTrue(utils.is_fragment_request(request))
+
+    def test_querystring_key(self):
+        # By default, the querystring key alone does not select the fragment.
+        request = self.factory.get('/?querystring_key=page')
+        self.assertFalse(utils.is_fragment_request(request))
+
+    def test_fragments_by_url(self):
+        # Ensure the querystring key selects the fragment if
+        # ``FRAGMENTS_BY_URL`` is True, whatever the request headers.
+        settings.FRAGMENTS_BY_URL = True
+        request = self.factory.get('/?querystring_key=page')
+        self.assertTrue(utils.is_fragment_request(request))
+        request = self.factory.get('/', **self.ajax_headers)
+        self.assertFalse(utils.is_fragment_request(request))
+
+
 class GetPageNumberFromRequestTest(TestCase):
 
     def setUp(self):
@@ -60,6 +95,89 @@ class GetPageNumberFromRequestTest(TestCase):
         self.assertEqual(5, utils.get_page_number_from_request(request))
 
 
+class PaginationStateTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_shared_state(self):
+        # Ensure the same state is returned for the same request.
+        request = self.factory.get('/')
+        state = utils.get_pagination_state(request)
+        self.assertIs(state, utils.get_pagination_state(request))
+
+    def test_parsed_once(self):
+        # Ensure page numbers are parsed only once.
+        request = self.factory.get('?{0}=2'.format(PAGE_LABEL))
+        self.assertEqual(2, utils.get_page_number_from_request(request))
+        state = utils.get_pagination_state(request)
+        state._numbers[PAGE_LABEL] = 3, (3, 3)
+        self.assertEqual(3, utils.get_page_number_from_request(request))
+        self.assertEqual((3, 3), utils.get_page_span_from_request(request))
+
+    def test_post_data_not_parsed(self):
+        # Ensure the body of non-POST requests is not parsed.
+        request = self.factory.get('/')
+        utils.get_page_number_from_request(request)
+        self.assertEqual([], utils.get_pagination_state(request).getlist('page'))
+        self.assertNotIn('_post', request.__dict__)
+
+    def test_querystring_priority(self):
+        # Ensure the querystring takes precedence over POST data.
+        request = self.factory.post(
+            '/?querystring_key=mypage', {'querystring_key': 'other'})
+        state = utils.get_pagination_state(request)
+        self.assertEqual('mypage', state.get('querystring_key'))
+        self.assertEqual('default', state.get('missing', 'default'))
+
+    def test_replaced_querystring(self):
+        # Ensure a new state is created if the querystring is replaced.
+        request = self.factory.get('?{0}=2'.format(PAGE_LABEL))
+        utils.get_page_number_from_request(request)
+        request.GET = request.GET.copy()
+        request.GET[PAGE_LABEL] = '1'
+        self.assertEqual(1, utils.get_page_number_from_request(request))
+
+
+class GetPageSpanFromRequestTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_single_page(self):
+        # Ensure a single page is returned as a range of one page.
+        request = self.factory.get('?{0}=3'.format(PAGE_LABEL))
+        self.assertEqual((3, 3), utils.get_page_span_from_request(request))
+
+    def test_no_querystring_key(self):
+        # Ensure the default page is returned if page info cannot be
+        # retrieved from the querystring.
+        request = self.factory.get('/')
+        span = utils.get_page_span_from_request(request, default=2)
+        self.assertEqual((2, 2), span)
+
+    def test_page_span(self):
+        # Ensure a range of pages is correctly retrieved.
+        request = self.factory.get('?mypage=3-7')
+        span = utils.get_page_span_from_request(
+            request, querystring_key='mypage')
+        self.assertEqual((3, 7), span)
+
+    def test_invalid_page_span(self):
+        # Ensure the default page is returned if the range is not valid.
+        for value in ('7-3', '0-2', '3-', '-', 'a-b', '1-{0}'.format(
+                MAX_PAGE_SPAN + 1)):
+            request = self.factory.get('/', {PAGE_LABEL: value})
+            span = utils.get_page_span_from_request(request, default=2)
+            self.assertEqual((2, 2), span)
+
+    def test_max_page_span(self):
+        # Ensure the maximum number of pages can be requested.
+        request = self.factory.get('?{0}=1-{1}'.format(PAGE_LABEL, MAX_PAGE_SPAN))
+        span = utils.get_page_span_from_request(request)
+        self.assertEqual((1, MAX_PAGE_SPAN), span)
+
+
 class GetPageNumbersTest(TestCase):
 
     def test_defaults(self):
@@ -409,6 +527,64 @@ class GetQuerystringForPageTest(TestCase):
         self.assertEqual('?mypage=5', querystring)
 
 
+class GetPaginatorClassTest(TestCase):
+
+    def tearDown(self):
+        settings.PAGINATOR_CLASS = None
+
+    def test_default(self):
+        # Ensure the default paginator is returned if none is configured.
+        self.assertIs(DefaultPaginator, utils.get_paginator_class())
+
+    def test_setting(self):
+        # Ensure the paginator class can be configured as a dotted path.
+        settings.PAGINATOR_CLASS = 'el_pagination.paginators.LazyPaginator'
+        self.assertIs(LazyPaginator, utils.get_paginator_class())
+
+    def test_argument(self):
+        # Ensure the given paginator class takes precedence over settings.
+        settings.PAGINATOR_CLASS = 'el_pagination.paginators.LazyPaginator'
+        self.assertIs(
+            DefaultPaginator, utils.get_paginator_class(DefaultPaginator))
+
+
+class GetPageFromRequestTest(TestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_page_span(self):
+        # Ensure ranges of pages are retrieved using *page_span*.
+        request = self.factory.get('/', {PAGE_LABEL: '2-3'})
+        paginator = DefaultPaginator(range(30), 5)
+        page, _ = utils.get_page_from_request(request, paginator, PAGE_LABEL)
+        self.assertSequenceEqual(range(5, 15), page.object_list)
+
+    def test_page_overridden(self):
+        # Ensure paginators only overriding *page* return the last page.
+
+        class Paginator(BasePaginator):
+            def page(self, number):
+                return DefaultPaginator(self.object_list, 5).page(number)
+
+        class SubPaginator(DefaultPaginator):
+            def page(self, number):
+                return super().page(number)
+
+        request = self.factory.get('/', {PAGE_LABEL: '2-3'})
+        for paginator_class in (Paginator, SubPaginator):
+            paginator = paginator_class(range(30), 5)
+            page, _ = utils.get_page_from_request(request, paginator, PAGE_LABEL)
+            self.assertSequenceEqual(range(10, 15), page.object_list)
+
+    def test_without_page_span(self):
+        # Ensure paginators not supporting ranges return the last page.
+        request = self.factory.get('/', {PAGE_LABEL: '2-3'})
+        paginator = Paginator(range(30), 5)
+        page, _ = utils.get_page_from_request(request, paginator, PAGE_LABEL)
+        self.assertSequenceEqual(range(10, 15), page.object_list)
+
+
 class NormalizePageNumberTest(TestCase):
 
     page_range = [1, 2, 3, 4]
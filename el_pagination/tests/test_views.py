@@ -7,7 +7,7 @@ from django.http import Http404
 from django.test import TestCase
 from django.test.client import RequestFactory
 
-from el_pagination import views
+from el_pagination import settings, views
 from project.models import TestModel, make_model_instances
 
 
@@ -60,6 +60,35 @@ class AjaxListViewTest(TestCase):
         response = view(self.ajax_request)
         self.check_response(response, self.page_template, range(30))
 
+    def test_vary_header(self):
+        # Ensure responses vary on the header used to switch templates.
+        view = self.make_view(
+            queryset=range(30),
+            template_name=self.template_name,
+            page_template=self.page_template,
+        )
+        for request in (self.request, self.ajax_request):
+            response = view(request)
+            self.assertEqual('X-Requested-With', response['Vary'])
+
+    def test_fragments_by_url(self):
+        # Ensure the templates are switched using the querystring key if
+        # ``FRAGMENTS_BY_URL`` is True, and no ``Vary`` header is added.
+        view = self.make_view(
+            queryset=range(30),
+            template_name=self.template_name,
+            page_template=self.page_template,
+        )
+        settings.FRAGMENTS_BY_URL = True
+        try:
+            response = view(RequestFactory().get(self.url + '&querystring_key=page'))
+            self.check_response(response, self.page_template, range(30))
+            self.assertFalse(response.has_header('Vary'))
+            response = view(self.ajax_request)
+            self.check_response(response, self.template_name, range(30))
+        finally:
+            settings.FRAGMENTS_BY_URL = False
+
     def test_queryset(self):
         # Ensure the view correctly adds the queryset to context.
         queryset = make_model_instances(30)
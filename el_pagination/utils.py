@@ -1,10 +1,18 @@
 """Django EL Pagination utility functions."""
 
-from el_pagination import exceptions
+import re
+
+from django.http import Http404, HttpResponseBase
+from django.utils.cache import patch_vary_headers
+from django.utils.encoding import iri_to_uri
+
+from el_pagination import exceptions, loaders, settings
+from el_pagination.paginators import DefaultPaginator, EmptyPage
 from el_pagination.settings import (
     DEFAULT_CALLABLE_AROUNDS,
     DEFAULT_CALLABLE_ARROWS,
     DEFAULT_CALLABLE_EXTREMES,
+    MAX_PAGE_SPAN,
     PAGE_LABEL,
 )
 
@@ -23,16 +31,247 @@ def get_data_from_context(context):
         ) from exc
 
 
+def is_fragment_request(request):
+    """Return True if *request* asks for the page template only.
+
+    By default this is the case for Ajax requests, having the
+    ``X-Requested-With`` header. If ``settings.FRAGMENTS_BY_URL`` is True,
+    requests including the *querystring_key* parameter in the querystring
+    ask for the page template, whatever their headers.
+    """
+    if settings.FRAGMENTS_BY_URL:
+        return 'querystring_key' in request.GET
+    return request.headers.get('x-requested-with') == 'XMLHttpRequest'
+
+
+def patch_fragment_vary_headers(response):
+    """Add to *response* the ``Vary`` header required to cache it.
+
+    The header is only needed when the page template is selected using the
+    ``X-Requested-With`` header: in this case the same URL returns either
+    the full page or the page template.
+    """
+    if isinstance(response, HttpResponseBase) and not settings.FRAGMENTS_BY_URL:
+        patch_vary_headers(response, ('X-Requested-With',))
+    return response
+
+
+class PaginationState:
+    """The pagination data of a request, parsed once.
+
+    Page numbers are parsed the first time they are requested, and then
+    shared by all the template tags, decorators and views handling the
+    request. *POST* data is only looked up for *POST* requests, so that
+    the body of other requests is never parsed.
+
+    Use *get_pagination_state* to retrieve the state of a request.
+    """
+
+    def __init__(self, request):
+        self._request = request
+        self.querydict = request.GET
+        # The data of the paginations rendered so far.
+        self.paginations = []
+        # The pages evaluated before rendering (see *PaginationPlan*), as
+        # *(objects, page, default_number)* tuples. The objects are kept,
+        # so that their id is not reused while the request is handled.
+        self.prepared_pages = {}
+        # The snapshot tokens of the paginations rendered so far, by
+        # querystring key (see *SnapshotPaginator*).
+        self.snapshots = {}
+        self._numbers = {}
+
+    def getlist(self, key):
+        """Return the list of values of *key* in *GET* or *POST* data."""
+        values = self.querydict.getlist(key)
+        if not values and self._request.method == 'POST':
+            values = self._request.POST.getlist(key)
+        return values
+
+    def get(self, key, default=None):
+        """Return the value of *key* in *GET* or *POST* data."""
+        values = self.getlist(key)
+        return values[-1] if values else default
+
+    def get_numbers(self, querystring_key):
+        """Return the ``(number, span)`` requested for *querystring_key*.
+
+        The *number* is None if the value is not an integer, while the
+        *span* is a ``(first, last)`` tuple, or None if the value is not
+        a valid page number or range of pages.
+        """
+        try:
+            return self._numbers[querystring_key]
+        except KeyError:
+            pass
+        number = span = None
+        value = self.get(querystring_key)
+        if value is not None:
+            try:
+                number = int(value)
+            except ValueError:
+                first, _, last = value.partition('-')
+                try:
+                    first, last = int(first), int(last)
+                except ValueError:
+                    pass
+                else:
+                    if 1 <= first <= last < first + MAX_PAGE_SPAN:
+                        span = first, last
+            else:
+                span = number, number
+        self._numbers[querystring_key] = number, span
+        return number, span
+
+
+def get_prepared_page_key(objects, paginator_class, per_page, first_page, **kwargs):
+    """Return the key identifying a page evaluated before rendering.
+
+    The key includes all the arguments used to paginate *objects*: a
+    prepared page is only used if the template paginates the same objects
+    in the same way.
+    """
+    return (id(objects), paginator_class, per_page, first_page) + tuple(
+        sorted(kwargs.items())
+    )
+
+
+def get_prepared_page(request, objects, *args, **kwargs):
+    """Return the ``(page, default_number)`` tuple evaluated before rendering
+    for *objects*, or None.
+
+    The arguments are the ones of *get_prepared_page_key*.
+    """
+    key = get_prepared_page_key(objects, *args, **kwargs)
+    prepared = get_pagination_state(request).prepared_pages.get(key)
+    if prepared is None or prepared[0] is not objects:
+        return None
+    return prepared[1:]
+
+
+def get_pagination_state(request):
+    """Return the *PaginationState* of *request*, creating it if needed."""
+    state = request.__dict__.get('_el_pagination_state')
+    # The querystring could have been replaced, e.g. by
+    # *InvalidPaginationListView*: in this case it must be parsed again.
+    if state is None or state.querydict is not request.GET:
+        state = request.__dict__['_el_pagination_state'] = PaginationState(request)
+    return state
+
+
 def get_page_number_from_request(request, querystring_key=PAGE_LABEL, default=1):
     """Retrieve the current page number from *GET* or *POST* data.
 
     If the page does not exists in *request*, or is not a number,
     then *default* number is returned.
     """
+    number, _ = get_pagination_state(request).get_numbers(querystring_key)
+    return default if number is None else number
+
+
+def get_page_span_from_request(request, querystring_key=PAGE_LABEL, default=1):
+    """Retrieve the range of pages requested in *GET* or *POST* data.
+
+    A range of pages is expressed as ``first-last``, e.g. ``?page=3-7``,
+    and can include at most ``settings.MAX_PAGE_SPAN`` pages.
+    Return a ``(first, last)`` tuple: a single page number is returned as
+    a range of one page. If the range is not valid, then the *default*
+    number is used.
+    """
+    _, span = get_pagination_state(request).get_numbers(querystring_key)
+    return (default, default) if span is None else span
+
+
+def get_page_from_request(request, paginator, querystring_key, default_number=1):
+    """Return the page of *paginator* requested by *request*.
+
+    A negative *default_number* is normalized, so that -1 refers to the
+    last page. If the requested page does not exist, the first page is
+    returned, or a 404 error is raised if ``settings.PAGE_OUT_OF_RANGE_404``
+    is True.
+
+    Return a ``(page, default_number)`` tuple.
+    """
+    # Normalize the default page number if a negative one is provided.
+    if default_number < 0:
+        default_number = normalize_page_number(default_number, paginator.page_range)
+
+    # The current request is used to get the requested page number,
+    # or range of pages.
+    first_number, page_number = get_page_span_from_request(
+        request, querystring_key, default=default_number
+    )
+
+    # Get the page. Paginators are not required to support ranges of pages.
     try:
-        return int(request.GET.get(querystring_key, request.POST.get(querystring_key)))
-    except (KeyError, TypeError, ValueError):
-        return default
+        if first_number == page_number or not supports_page_span(paginator):
+            page = paginator.page(page_number)
+        else:
+            page = paginator.page_span(first_number, page_number)
+    except EmptyPage:
+        page = paginator.page(1)
+        if settings.PAGE_OUT_OF_RANGE_404:
+            raise Http404('Page out of range')  # pylint: disable=raise-missing-from
+    return page, default_number
+
+
+def supports_page_span(paginator):
+    """Return True if *paginator* can retrieve a range of pages.
+
+    This is the case if it implements *page_span*, and *page* is not
+    overridden by a subclass of the class implementing *page_span*.
+    """
+
+    def get_owner(name):
+        return next((cls for cls in type(paginator).__mro__ if name in vars(cls)), None)
+
+    span_owner = get_owner('page_span')
+    return span_owner is not None and issubclass(span_owner, get_owner('page'))
+
+
+def get_paginator_class(paginator_class=None):
+    """Return the paginator class given as a class or as a dotted path.
+
+    If *paginator_class* is None, ``settings.PAGINATOR_CLASS`` is used, and
+    *DefaultPaginator* if that is None too.
+    """
+    if paginator_class is None:
+        paginator_class = settings.PAGINATOR_CLASS
+    if paginator_class is None:
+        return DefaultPaginator
+    if isinstance(paginator_class, str):
+        return loaders.load_object(paginator_class)
+    return paginator_class
+
+
+def add_pagination_to_request(request, data):
+    """Keep track of the pagination *data* rendered for *request*.
+
+    The *data* is the dict added to the template context by the *paginate*
+    and *lazy_paginate* template tags.
+    """
+    get_pagination_state(request).paginations.append(data)
+
+
+def get_next_page_paths(request):
+    """Return the paths of the next pages of the paginations in *request*.
+
+    Only the paginations rendered so far are taken into account, and the
+    ones without a next page are skipped.
+    """
+    paths = []
+    for data in get_pagination_state(request).paginations:
+        page = data['page']
+        if page.has_next():
+            querystring = get_querystring_for_page(
+                request,
+                page.next_page_number(),
+                data['querystring_key'],
+                default_number=data['default_number'],
+            )
+            path = iri_to_uri(data['override_path'] or request.path)
+            paths.append(path + querystring)
+    return paths
 
 
 def get_page_numbers(
@@ -146,13 +385,34 @@ def get_elastic_page_numbers(current_page, num_pages):
     return pages
 
 
+def get_snapshot_querystring_key(querystring_key):
+    """Return the querystring key of the snapshot token of a pagination."""
+    return f'{querystring_key}-snapshot'
+
+
+def get_snapshot_token(request, querystring_key):
+    """Return the snapshot token requested for *querystring_key*, or None."""
+    key = get_snapshot_querystring_key(querystring_key)
+    token = get_pagination_state(request).get(key)
+    if token is not None and re.fullmatch('[0-9a-f]{32}', token):
+        return token
+    return None
+
+
 def get_querystring_for_page(request, page_number, querystring_key, default_number=1):
-    """Return a querystring pointing to *page_number*."""
+    """Return a querystring pointing to *page_number*.
+
+    The snapshot token of the pagination, if any, is included so that all
+    the pages use the same snapshot.
+    """
     querydict = request.GET.copy()
     querydict[querystring_key] = page_number
     # For the default page number (usually 1) the querystring is not required.
     if page_number == default_number:
         del querydict[querystring_key]
+    token = get_pagination_state(request).snapshots.get(querystring_key)
+    if token is not None:
+        querydict[get_snapshot_querystring_key(querystring_key)] = token
     if 'querystring_key' in querydict:
         del querydict['querystring_key']
     if querydict:
@@ -7,6 +7,7 @@ from django.utils.translation import gettext as _
 from django.views.generic.base import View
 from django.views.generic.list import MultipleObjectTemplateResponseMixin
 
+from el_pagination import utils
 from el_pagination.settings import PAGE_LABEL
 
 
@@ -146,15 +147,17 @@ class AjaxMultipleObjectTemplateResponseMixin(MultipleObjectTemplateResponseMixi
     def get_template_names(self):
         """Switch the templates for Ajax requests."""
         request = self.request
-        key = 'querystring_key'
-        querystring_key = request.GET.get(key, request.POST.get(key, PAGE_LABEL))
-        if (
-            request.headers.get('x-requested-with') == 'XMLHttpRequest'
-            and querystring_key == self.key
-        ):
+        state = utils.get_pagination_state(request)
+        querystring_key = state.get('querystring_key', PAGE_LABEL)
+        if utils.is_fragment_request(request) and querystring_key == self.key:
             return [self.page_template or self.get_page_template()]
         return super().get_template_names()
 
+    def render_to_response(self, context, **response_kwargs):
+        """Add the ``Vary`` header required to cache the response."""
+        response = super().render_to_response(context, **response_kwargs)
+        return utils.patch_fragment_vary_headers(response)
+
 
 class AjaxListView(AjaxMultipleObjectTemplateResponseMixin, BaseListView):
     """Allows Ajax pagination of a list of objects.
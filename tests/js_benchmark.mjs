@@ -0,0 +1,58 @@
+// Report the size, gzipped size and parse time of the JavaScript library.
+//
+// Usage: node --experimental-vm-modules tests/js_benchmark.mjs [runs]
+//
+// The parse time is the median time taken by V8 to compile each file, over
+// the given number of runs (100 by default). A comment is appended to the
+// source on each run, so that the compilation cache is not used. Without
+// the --experimental-vm-modules flag, the ES module is only measured in size.
+
+import {readFileSync} from 'node:fs';
+import {performance} from 'node:perf_hooks';
+import vm from 'node:vm';
+import {gzipSync} from 'node:zlib';
+
+const directory = new URL('../el_pagination/static/el-pagination/js/', import.meta.url),
+    files = ['el-pagination.js', 'el-pagination.esm.js'],
+    runs = parseInt(process.argv[2] || '100', 10);
+
+const isModule = function(name) {
+    return name.endsWith('.esm.js');
+};
+
+// Return the median compile time of the given source, in milliseconds.
+const getParseTime = function(name, source) {
+    const times = [];
+    for (let run = 0; run < runs; run += 1) {
+        const code = source + '\n// ' + run + '\n',
+            start = performance.now();
+        if (isModule(name)) {
+            new vm.SourceTextModule(code, {identifier: name + run});
+        } else {
+            new vm.Script(code, {filename: name});
+        }
+        times.push(performance.now() - start);
+    }
+    times.sort(function(a, b) {
+        return a - b;
+    });
+    return times[Math.floor(times.length / 2)];
+};
+
+const formatSize = function(size) {
+    return (size / 1024).toFixed(1) + ' KB';
+};
+
+files.forEach(function(name) {
+    const source = readFileSync(new URL(name, directory), 'utf8'),
+        size = Buffer.byteLength(source),
+        gzipped = gzipSync(source, {level: 9}).length;
+    let parseTime = 'n/a (run with --experimental-vm-modules)';
+    if (!isModule(name) || vm.SourceTextModule) {
+        parseTime = getParseTime(name, source).toFixed(3) + ' ms';
+    }
+    console.log(name);
+    console.log('  size:       ' + formatSize(size));
+    console.log('  gzipped:    ' + formatSize(gzipped));
+    console.log('  parse time: ' + parseTime);
+});
@@ -13,6 +13,13 @@ VOICES = (
     ('digg', 'Digg-style'),
     ('twitter', 'Twitter-style'),
     ('onscroll', 'On scroll'),
+    ('observer', 'On scroll/observer'),
+    ('previous', 'Show previous'),
+    ('restore', 'Restore pages'),
+    ('prefetch', 'Prefetch'),
+    ('virtualize', 'Virtualize'),
+    ('esm', 'ES module'),
+    ('insert-budget', 'Insert budget'),
     ('feed-wrapper', 'Feed wrapper'),
     ('multiple', 'Multiple'),
     ('callbacks', 'Callbacks'),
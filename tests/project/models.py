@@ -16,3 +16,15 @@ class TestModel(models.Model):
 
     def __str__(self):
         return f'TestModel: {self.id}'
+
+
+class TestItem(models.Model):
+    """A model used to test counting grouped objects."""
+
+    category = models.ForeignKey(TestModel, models.CASCADE, null=True)
+    tags = models.ManyToManyField(TestModel, related_name='tagged_items')
+    published = models.BooleanField(default=True)
+    code = models.IntegerField(unique=True, null=True)
+
+    class Meta:
+        app_label = 'el_pagination'
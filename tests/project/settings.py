@@ -20,13 +20,20 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': ':memory:',
-    }
+    },
+    # Used to test counting objects in another database.
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    },
 }
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 INSTALLED_APPS = (
     'django.contrib.staticfiles',
     'el_pagination',
+    'el_pagination.counters',
+    'el_pagination.indexes',
     PROJECT_NAME,
 )
 gettext = lambda s: s
@@ -60,6 +60,48 @@ urlpatterns = [
         {'template': 'onscroll/table/index.html'},
         name='onscroll-table',
     ),
+    url(
+        r'^observer/$',
+        page_template('observer/page.html')(generic),
+        {'template': 'observer/index.html'},
+        name='observer',
+    ),
+    url(
+        r'^previous/$',
+        page_template('previous/page.html')(generic),
+        {'template': 'previous/index.html'},
+        name='previous',
+    ),
+    url(
+        r'^restore/$',
+        page_template('restore/page.html')(generic),
+        {'template': 'restore/index.html'},
+        name='restore',
+    ),
+    url(
+        r'^prefetch/$',
+        page_template('prefetch/page.html')(generic),
+        {'template': 'prefetch/index.html'},
+        name='prefetch',
+    ),
+    url(
+        r'^virtualize/$',
+        page_template('virtualize/page.html')(generic),
+        {'template': 'virtualize/index.html'},
+        name='virtualize',
+    ),
+    url(
+        r'^esm/$',
+        page_template('esm/page.html')(generic),
+        {'template': 'esm/index.html'},
+        name='esm',
+    ),
+    url(
+        r'^insert-budget/$',
+        page_template('insert_budget/page.html')(generic),
+        {'template': 'insert_budget/index.html'},
+        name='insert-budget',
+    ),
     url(
         r'^feed-wrapper/$',
         page_template('feed_wrapper/page.html')(generic),